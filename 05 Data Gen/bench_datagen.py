@@ -0,0 +1,54 @@
+"""
+Benchmark del generador de datos - ArteCryptoAuctions
+Mide filas/segundo de los motores vectorizados a distintas escalas.
+
+Uso:
+    python bench_datagen.py                 # 1M y 10M usuarios
+    python bench_datagen.py 100000 1000000  # escalas personalizadas
+"""
+
+import sys
+import time
+
+from datagen import DataGenerator, DataGenConfig
+
+# Métodos medidos, en orden de dependencia (cada uno usa lo generado antes)
+BENCH_METHODS = [
+    "generate_status_catalog",
+    "generate_roles",
+    "generate_auction_settings",
+    "generate_users",
+    "assign_user_roles",
+    "generate_user_emails",
+    "generate_nfts",
+    "generate_curation_reviews",
+    "generate_auctions",
+    "generate_bids",
+    "settle_auctions_and_finance",
+]
+
+
+def bench(n_users: int):
+    # Proporción por defecto de DataGenConfig: 3 NFTs por usuario
+    gen = DataGenerator(DataGenConfig(n_users=n_users, n_nfts=3 * n_users), verbose=False)
+    results = []
+    for m in BENCH_METHODS:
+        t0 = time.perf_counter()
+        df = getattr(gen, m)()
+        results.append((m, len(df), time.perf_counter() - t0))
+    return results
+
+
+def main(sizes):
+    print("=" * 80)
+    print("BENCHMARK - DataGenerator")
+    print("=" * 80)
+    print(f"{'usuarios':>12} {'método':<28} {'filas':>12} {'segundos':>10} {'filas/s':>14}")
+    for n in sizes:
+        for m, rows, elapsed in bench(n):
+            print(f"{n:>12,} {m:<28} {rows:>12,} {elapsed:>10.3f} {rows / max(elapsed, 1e-9):>14,.0f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000_000, 10_000_000]
+    main(sizes)
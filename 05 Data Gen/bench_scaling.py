@@ -0,0 +1,154 @@
+"""
+Benchmark de escalamiento - ArteCryptoAuctions
+Ejecuta cada método generador (fases 2-4 de datagen.py y datagen_2.py) y cada
+ruta de exportación (to_sql_inserts, write_sql_file, _df_to_insert_sql,
+write_separated_sql_files) a escalas crecientes de usuarios (NFTs
+proporcionales), registra tiempo y memoria, ajusta el exponente de
+escalamiento t ~ n^k y marca los pasos que escalan peor que O(n log n)
+(p.ej. una liquidación con un query() por subasta, que es cuadrática).
+
+Uso:
+    python bench_scaling.py                          # 1k, 100k y 1M usuarios
+    python bench_scaling.py 1000 10000 100000        # escalas personalizadas
+    python bench_scaling.py --json scaling.json --strict 1000 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+
+import numpy as np
+
+import datagen
+import datagen_2
+from datagen_pipeline import measure_step, traced_memory
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+GENERATOR_PHASES = (2, 3, 4)
+# Tiempos menores no entran al ajuste (dominan los costos fijos)
+MIN_FIT_SECONDS = 0.01
+# Margen sobre el exponente de n log n antes de marcar un paso
+EXPONENT_TOLERANCE = 0.2
+
+
+def _frames_rows(gen) -> int:
+    return sum(len(v) for k, v in vars(gen).items() if k.startswith("df_") and v is not None)
+
+
+def _generator_steps(module):
+    return [m for p in GENERATOR_PHASES for m in module.DataGenerator._PHASE_METHODS[p]]
+
+
+def bench(n_users: int, workdir: str):
+    """Registros de measure_step ('step', 'rows', 'wall_s', ...) de todos los pasos a una escala."""
+    records = []
+
+    def run(name, func, rows=None):
+        with measure_step(name) as record:
+            result = func()
+            record["rows"] = rows() if rows else len(result)
+        records.append(record)
+
+    for module in (datagen, datagen_2):
+        name = module.__name__
+        gen = module.DataGenerator(module.DataGenConfig(n_users=n_users, n_nfts=3 * n_users), verbose=False)
+        for m in _generator_steps(module):
+            run(f"{name}.{m}", getattr(gen, m))
+
+        if module is datagen:
+            run(f"{name}.to_sql_inserts", gen.to_sql_inserts, rows=lambda: _frames_rows(gen))
+            run(f"{name}.write_sql_file", lambda: gen.write_sql_file(f"{workdir}/bench.sql"),
+                rows=lambda: _frames_rows(gen))
+        else:
+            tables = [p for p in gen._sql_tables() if p[0] is not None]
+            run(f"{name}._df_to_insert_sql",
+                lambda: [len(gen._df_to_insert_sql(df, schema_table)) for df, schema_table in tables],
+                rows=lambda: sum(len(df) for df, _ in tables))
+            run(f"{name}.write_separated_sql_files",
+                lambda: gen.write_separated_sql_files(f"{workdir}/separated"),
+                rows=lambda: _frames_rows(gen))
+        del gen
+        gc.collect()
+    return records
+
+
+def scaling_exponent(points):
+    """Pendiente de log(t) vs log(n) para los puntos (n, segundos)."""
+    n, t = np.log([p[0] for p in points]), np.log([p[1] for p in points])
+    return float(np.polyfit(n, t, 1)[0])
+
+
+def nlogn_exponent(sizes):
+    """Exponente aparente de n log n en el mismo rango de escalas (algo mayor que 1)."""
+    n = np.asarray(sizes, dtype=np.float64)
+    return float(np.polyfit(np.log(n), np.log(n * np.log(n)), 1)[0])
+
+
+def fit(sizes, results):
+    """
+    Por paso: exponente ajustado (None si hay menos de dos tiempos medibles),
+    el límite de O(n log n) en esas escalas y si lo supera.
+    """
+    steps = list(dict.fromkeys(r["step"] for records in results for r in records))
+    fits = {}
+    for step in steps:
+        points = [(n, r["wall_s"]) for n, records in zip(sizes, results) for r in records
+                  if r["step"] == step and r["wall_s"] >= MIN_FIT_SECONDS]
+        k = limit = None
+        if len(points) >= 2:
+            k = scaling_exponent(points)
+            limit = nlogn_exponent([n for n, _ in points]) + EXPONENT_TOLERANCE
+        fits[step] = {
+            "exponent": None if k is None else round(k, 3),
+            "limit": None if limit is None else round(limit, 3),
+            "worse_than_nlogn": k is not None and k > limit,
+        }
+    return fits
+
+
+def main(sizes, json_path=None, strict=False, trace_memory=False):
+    print("=" * 100)
+    print("BENCHMARK - Escalamiento de generadores y exportadores")
+    print("=" * 100)
+    print(f"{'usuarios':>10} {'paso':<44} {'filas':>12} {'segundos':>10} {'filas/s':>13} {'RSS +MB':>9}")
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, traced_memory(trace_memory):
+        for n in sizes:
+            records = bench(n, workdir)
+            results.append(records)
+            for r in records:
+                rate = r["rows_per_s"] or 0
+                rss = "—" if r["peak_rss_delta_mb"] is None else f"{r['peak_rss_delta_mb']:.1f}"
+                print(f"{n:>10,} {r['step']:<44} {r['rows']:>12,} {r['wall_s']:>10.3f} {rate:>13,.0f} {rss:>9}")
+
+    fits = fit(sizes, results)
+    print()
+    print(f"{'paso':<44} {'exponente':>10}")
+    flagged = []
+    for step, f in fits.items():
+        k = "—" if f["exponent"] is None else f"{f['exponent']:.2f}"
+        mark = "  ⚠ peor que O(n log n)" if f["worse_than_nlogn"] else ""
+        print(f"{step:<44} {k:>10}{mark}")
+        if f["worse_than_nlogn"]:
+            flagged.append(step)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as fh:
+            json.dump({"sizes": sizes, "results": dict(zip(map(str, sizes), results)), "fits": fits},
+                      fh, ensure_ascii=False, indent=2)
+        print(f"\nResultados escritos: {json_path}")
+    if flagged:
+        print(f"\n{len(flagged)} paso(s) escalan peor que O(n log n): {', '.join(flagged)}")
+    return 1 if strict and flagged else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de escalamiento de DataGenerator")
+    parser.add_argument("sizes", nargs="*", type=int, help="usuarios por escala (por defecto 1k 100k 1M)")
+    parser.add_argument("--json", dest="json_path", help="escribir resultados y ajustes en JSON")
+    parser.add_argument("--strict", action="store_true", help="código de salida 1 si algún paso se marca")
+    parser.add_argument("--trace-memory", action="store_true", help="pico de tracemalloc por paso (más lento)")
+    args = parser.parse_args()
+    sys.exit(main(sorted(args.sizes) or DEFAULT_SIZES, args.json_path, args.strict, args.trace_memory))
@@ -0,0 +1,88 @@
+"""
+Benchmark del formateo de valores SQL - ArteCryptoAuctions
+Compara el formateo fila a fila con iterrows() (implementación anterior de
+_df_to_insert_sql / df_to_inserts) contra format_value_rows (columna a columna)
+y verifica que ambos produzcan exactamente las mismas tuplas VALUES.
+
+Uso:
+    python bench_sql_format.py               # 20,000 usuarios
+    python bench_sql_format.py 5000 50000    # escalas personalizadas
+"""
+
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from datagen_2 import DataGenerator, DataGenConfig
+from datagen_sql import format_value_rows
+
+
+def legacy_value_rows(df: pd.DataFrame, float_format=None, datetime_prefix="N"):
+    """Formateo anterior: iterrows() + pd.isna/isinstance/strftime por celda."""
+    rows = []
+    for _, row in df.iterrows():
+        vals = []
+        for val in row:
+            if pd.isna(val) or val is None:
+                vals.append("NULL")
+            elif isinstance(val, (datetime, pd.Timestamp)):
+                vals.append(f"{datetime_prefix}'{val.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}'")
+            elif isinstance(val, str):
+                vals.append("N'" + val.replace("'", "''") + "'")
+            elif isinstance(val, (float, np.floating)) and float_format:
+                vals.append(f"{val:{float_format}}")
+            else:
+                vals.append(str(val))
+        rows.append(f"({', '.join(vals)})")
+    return rows
+
+
+# (estilo, argumentos): datagen_2 (fechas N'..') y datagen (DECIMAL .8f, fechas '..')
+STYLES = [
+    ("datagen_2", {}),
+    ("datagen", {"float_format": ".8f", "datetime_prefix": ""}),
+]
+
+
+def bench(n_users: int):
+    gen = DataGenerator(DataGenConfig(n_users=n_users, n_nfts=3 * n_users), verbose=False)
+    gen.run_pipeline(phases=(2, 3, 4))
+    tables = [
+        ("core.User", gen.df_user),
+        ("core.UserEmail", gen.df_useremail),
+        ("nft.NFT", gen.df_nft),
+        ("auction.Auction", gen.df_auction),
+        ("auction.Bid", gen.df_bid),
+    ]
+    results = []
+    for style, kwargs in STYLES:
+        for name, df in tables:
+            t0 = time.perf_counter()
+            old = legacy_value_rows(df, **kwargs)
+            t_old = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            new = format_value_rows(df, **kwargs)
+            t_new = time.perf_counter() - t0
+            if old != new:
+                raise AssertionError(f"{style}/{name}: el formateo columnar difiere del anterior")
+            results.append((style, name, len(df), t_old, t_new))
+    return results
+
+
+def main(sizes):
+    print("=" * 80)
+    print("BENCHMARK - Formateo de valores SQL (iterrows vs columnar)")
+    print("=" * 80)
+    print(f"{'usuarios':>10} {'estilo':<10} {'tabla':<18} {'filas':>10} {'iterrows s':>11} {'columnar s':>11} {'x':>7}")
+    for n in sizes:
+        for style, name, rows, t_old, t_new in bench(n):
+            print(f"{n:>10,} {style:<10} {name:<18} {rows:>10,} {t_old:>11.3f} {t_new:>11.3f} "
+                  f"{t_old / max(t_new, 1e-9):>7.1f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [20_000]
+    main(sizes)
@@ -1,12 +1,25 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from typing import Any, cast
-import random
+from typing import Dict, Iterator, List, Tuple, Optional
 import numpy as np
 import pandas as pd
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from datagen_engines import (
+    auctions_frame, bids_frame, curation_frame, email_outbox_frame, nfts_frame,
+    settlement_frames, table_rng, user_emails_frame, user_roles_frame, users_frame,
+    winning_bids,
+)
+from datagen_pipeline import PipelineDriver
+from datagen_snapshot import SNAPSHOT_ROW_GROUP_ROWS, config_to_dict, write_parquet_snapshot
+from datagen_sql import (
+    aligned_chunk_rows, bcp_format_file, bulk_insert_statement, export_pool,
+    fast_load_epilogue, fast_load_prologue, format_delimited_rows, format_insert_batches,
+    format_value_rows, has_identity, insert_statement, iter_chunk_texts, open_async_output,
+    post_load_check_script,
+)
 
 # ===============================
 # FASE 1: Imports y Atributos
@@ -46,6 +59,26 @@ class DataGenConfig:
     min_bid_increment_pct: int = 5
     bids_per_auction_lambda: float = 6.0  # media Poisson
 
+    # run_pipeline: hilos para pasos independientes (1 = en serie)
+    pipeline_workers: int = 1
+    pipeline_trace_memory: bool = False  # pico de tracemalloc por paso en el reporte (más lento)
+    cache_max_mb: int = 1024  # límite del caché de run_pipeline(cache_directory=...), expulsión LRU
+    cache_verify: bool = False  # en cada acierto recalcular el SHA-256 (si no, tamaño y mtime)
+
+    # Exportación SQL: filas formateadas por bloque (memoria acotada)
+    sql_chunk_rows: int = 50_000
+    sql_rows_per_insert: int = 1000     # filas por INSERT (máx. 1000 en SQL Server)
+    sql_inserts_per_batch: int = 10     # INSERTs por lote GO
+    sql_batch_transaction: bool = False  # BEGIN/COMMIT TRANSACTION por lote
+    export_workers: int = 1              # procesos que formatean bloques (1 = en serie)
+    output_compression: Optional[str] = None    # None, "gzip" o "zstd" (requiere zstandard)
+    output_compression_level: Optional[int] = None  # None = nivel por defecto del códec
+    writer_queue_depth: int = 8          # bloques (~1 MB) en cola hacia el hilo escritor
+
+    # Carga masiva (write_bulk_load_files): filas por transacción de BULK INSERT
+    bulk_batch_size: int = 100_000
+    fast_load: bool = False  # índices no agrupados y triggers fuera durante la carga masiva
+
     status_catalog: Dict[str, List[str]] = field(default_factory=lambda: {
         "NFT": ["PENDING","APPROVED","REJECTED"],
         "AUCTION": ["ACTIVE","COMPLETED","CANCELLED"],
@@ -59,13 +92,9 @@ class DataGenConfig:
 # Utilidades mínimas
 # ===============================
 
-def _rng(seed: int):
-    random.seed(seed)
-    np.random.seed(seed)
-
-def _dt_between(start: datetime, end: datetime) -> datetime:
+def _dt_between(start: datetime, end: datetime, rng: np.random.Generator) -> datetime:
     delta = end - start
-    seconds = random.randrange(int(delta.total_seconds()))
+    seconds = int(rng.integers(max(1, int(delta.total_seconds()))))
     return start + timedelta(seconds=seconds)
 
 _FIRST_NAMES = [
@@ -95,9 +124,6 @@ _LAST_NAMES = [
     "Maldonado", "Velásquez", "Pacheco", "Mora", "Arias", "Cárdenas", "Valencia", "Ochoa"
 ]
 
-def _full_name() -> str:
-    return f"{random.choice(_FIRST_NAMES)} {random.choice(_LAST_NAMES)}"
-
 def _status_desc(domain: str, code: str) -> str:
     mapping = {
         ("NFT","PENDING"): "NFT en revisión",
@@ -124,11 +150,10 @@ def _status_desc(domain: str, code: str) -> str:
 # Clase principal
 # ===============================
 
-class DataGenerator:
+class DataGenerator(PipelineDriver):
     def __init__(self, cfg: Optional[DataGenConfig] = None, *, verbose: bool = True):
         self.cfg = cfg or DataGenConfig()
         self.verbose = verbose
-        _rng(self.cfg.seed)
 
         self.df_status: Optional[pd.DataFrame] = None
         self.df_role: Optional[pd.DataFrame] = None
@@ -148,6 +173,13 @@ class DataGenerator:
         self.df_ledger = None
         self.df_email_outbox = None
 
+        # Reporte, checkpoint y caché de run_pipeline (ver datagen_pipeline.PipelineDriver)
+        self._init_pipeline_state()
+
+    def _table_rng(self, table: str, shard: Optional[int] = None) -> np.random.Generator:
+        """Flujo aleatorio propio de la tabla (independiente del orden de generación)."""
+        return table_rng(self.cfg.seed, table, shard)
+
     # -------------------------------
     # Controlador del flujo/Pipeline
     # -------------------------------
@@ -173,46 +205,72 @@ class DataGenerator:
             "generate_email_outbox",
         ],
         5: [
-            "to_sql_inserts",
             "write_sql_file",
+            "write_bulk_load_files",
+            "write_parquet_snapshot",
         ],
     }
 
+    # df_* que lee y escribe cada paso: run_pipeline arma con esto el grafo de
+    # dependencias y, con cfg.pipeline_workers > 1, corre a la vez los pasos listos
+    _ALL_FRAMES = (
+        "df_status", "df_role", "df_user", "df_auction_settings", "df_nft_settings",
+        "df_userrole", "df_useremail", "df_wallet", "df_nft", "df_curation", "df_auction",
+        "df_bid", "df_reservation", "df_ledger", "df_email_outbox",
+    )
+    _STEP_IO = {
+        "generate_status_catalog": ((), ("df_status",)),
+        "generate_roles": ((), ("df_role",)),
+        "generate_users": ((), ("df_user",)),
+        "generate_auction_settings": ((), ("df_auction_settings",)),
+        "generate_nft_settings": ((), ("df_nft_settings",)),
+        "assign_user_roles": (("df_user", "df_role"), ("df_userrole",)),
+        "generate_user_emails": (("df_user", "df_status"), ("df_useremail",)),
+        "generate_wallets": (("df_user",), ("df_wallet",)),
+        "generate_nfts": (("df_user", "df_role", "df_userrole", "df_status"), ("df_nft",)),
+        "generate_curation_reviews": (("df_nft", "df_user", "df_role", "df_userrole"), ("df_curation",)),
+        "generate_auctions": (("df_nft", "df_auction_settings"), ("df_auction",)),
+        "generate_bids": (("df_auction", "df_nft", "df_user", "df_role", "df_userrole"), ("df_bid",)),
+        # actualiza líder/precio de df_auction y el dueño en df_nft
+        "settle_auctions_and_finance": (("df_auction", "df_bid", "df_nft"),
+                                        ("df_auction", "df_nft", "df_reservation", "df_ledger")),
+        "generate_email_outbox": (("df_auction", "df_curation", "df_nft", "df_useremail"), ("df_email_outbox",)),
+        "write_sql_file": (_ALL_FRAMES, ()),
+        "write_bulk_load_files": (_ALL_FRAMES, ()),
+        "write_parquet_snapshot": (_ALL_FRAMES, ()),
+    }
+
+    # Exportador -> argumento de run_pipeline con su destino
+    _EXPORT_TARGETS = {
+        "write_sql_file": "export_sql_path",
+        "write_bulk_load_files": "export_bulk_directory",
+        "write_parquet_snapshot": "export_parquet_directory",
+    }
+
     def run_pipeline(
         self,
         phases: Tuple[int, ...] = (2, 3, 4, 5),
         *,
         strict: bool = True,
-        export_sql_path: Optional[str] = None
+        export_sql_path: Optional[str] = None,
+        export_bulk_directory: Optional[str] = None,
+        export_parquet_directory: Optional[str] = None,
+        export_report_path: Optional[str] = None,
+        checkpoint_directory: Optional[str] = None,
+        cache_directory: Optional[str] = None
     ) -> "DataGenerator":
-        for phase in phases:
-            methods = self._PHASE_METHODS.get(phase, [])
-            if self.verbose:
-                print(f"[Pipeline] Fase {phase} — métodos: {', '.join(methods) or '—'}")
-
-            for m in methods:
-                if m == "write_sql_file" and not export_sql_path:
-                    if self.verbose:
-                        print("  - skip write_sql_file (sin export_sql_path)")
-                    continue
-
-                if not hasattr(self, m) or not callable(getattr(self, m)):
-                    if strict:
-                        raise NotImplementedError(
-                            f"El método requerido '{m}' para la fase {phase} aún no está implementado."
-                        )
-                    else:
-                        if self.verbose:
-                            print(f"  - omitiendo '{m}' (no implementado)")
-                        continue
-
-                if self.verbose:
-                    print(f"  ✓ ejecutando {m}()")
-                if m == "write_sql_file":
-                    getattr(self, m)(export_sql_path)
-                else:
-                    getattr(self, m)()
-
+        self._drive_pipeline(
+            phases,
+            strict=strict,
+            export_targets={
+                "write_sql_file": export_sql_path,
+                "write_bulk_load_files": export_bulk_directory,
+                "write_parquet_snapshot": export_parquet_directory,
+            },
+            export_report_path=export_report_path,
+            checkpoint_directory=checkpoint_directory,
+            cache_directory=cache_directory,
+        )
         return self
 
     # ==========================
@@ -242,11 +300,15 @@ class DataGenerator:
         return df
 
     def generate_users(self) -> pd.DataFrame:
-        n = self.cfg.n_users
-        rows = []
-        for uid in range(1, n+1):
-            rows.append((uid, _full_name(), _dt_between(self.cfg.start_date, self.cfg.end_date)))
-        df = pd.DataFrame(rows, columns=["UserId","FullName","CreatedAtUtc"])
+        """
+        Genera usuarios en bloque (motor vectorizado): nombres y CreatedAtUtc
+        se muestrean como arreglos completos. CreatedAtUtc es datetime64[ms].
+        """
+        rng = self._table_rng("core.User")
+        df = users_frame(
+            rng, self.cfg.n_users, self.cfg.start_date, self.cfg.end_date,
+            _FIRST_NAMES, _LAST_NAMES
+        )
         self.df_user = df
         if self.verbose:
             print(f"  - core.[User]: {len(df)} usuarios")
@@ -286,7 +348,7 @@ class DataGenerator:
         ])
         self.df_nft_settings = df
         if self.verbose:
-            print(f"  - dbo.NFTSettings: 1 fila")
+            print(f"  - nft.NFTSettings: 1 fila")
         return df
 
     # ==========================
@@ -296,49 +358,27 @@ class DataGenerator:
     def assign_user_roles(self) -> pd.DataFrame:
         """
         Asigna 1–3 roles por usuario respetando self.cfg.role_probs y evita duplicados (PK compuesta).
+        Todos los usuarios se muestrean en una sola operación matricial (Gumbel top-k).
         AsignacionUtc se distribuye entre CreatedAtUtc del usuario y end_date.
         Requiere: self.df_user, self.df_role.
         """
         assert self.df_user is not None and self.df_role is not None, "Faltan users/roles"
 
-        rng = np.random.default_rng(self.cfg.seed + 301)
-        role_names = list(self.cfg.role_probs.keys())
-        role_probs = np.array([self.cfg.role_probs[r] for r in role_names], dtype=float)
-        role_probs = role_probs / role_probs.sum()
-
-        # Mapa RoleName -> RoleId
+        rng = self._table_rng("core.UserRole")
+        # Mapa RoleName -> RoleId (columnas en orden alfabético de rol)
         role_id_by_name = dict(self.df_role[["Name","RoleId"]].values)
-
-        rows = []
-        for uid, created_at in self.df_user[["UserId","CreatedAtUtc"]].itertuples(index=False):
-            k_min, k_max = self.cfg.roles_per_user_range
-            k = rng.integers(k_min, k_max+1)
-
-            # muestreo ponderado sin reemplazo
-            chosen = []
-            available = role_names.copy()
-            probs = role_probs.copy()
-            for _ in range(k):
-                probs = probs / probs.sum()
-                pick_idx = rng.choice(len(available), p=probs)
-                chosen.append(available[pick_idx])
-                # quitar escogido
-                del available[pick_idx]
-                probs = np.delete(probs, pick_idx)
-                if len(available) == 0:
-                    break
-
-            # con cierta probabilidad, permitir multirol; si no, forzar 1
-            if rng.random() > self.cfg.multi_role_prob:
-                chosen = chosen[:1]
-
-            # construir filas (UserId, RoleId, AsignacionUtc)
-            for name in sorted(set(chosen)):
-                rid = role_id_by_name[name]
-                asign_at = _dt_between(created_at, self.cfg.end_date)
-                rows.append((uid, rid, asign_at))
-
-        df = pd.DataFrame(rows, columns=["UserId","RoleId","AsignacionUtc"]).drop_duplicates(["UserId","RoleId"])
+        role_names = sorted(self.cfg.role_probs.keys())
+
+        df = user_roles_frame(
+            rng,
+            self.df_user["UserId"].to_numpy(),
+            self.df_user["CreatedAtUtc"],
+            self.cfg.end_date,
+            [role_id_by_name[r] for r in role_names],
+            [self.cfg.role_probs[r] for r in role_names],
+            self.cfg.roles_per_user_range,
+            self.cfg.multi_role_prob,
+        )
         self.df_userrole = df
         if self.verbose:
             by_user = df.groupby("UserId").size().mean()
@@ -347,60 +387,30 @@ class DataGenerator:
 
     def generate_user_emails(self) -> pd.DataFrame:
         """
-        Genera 1–2 emails por usuario (configurable), único globalmente.
+        Genera 1–2 emails por usuario (configurable), único globalmente por construcción
+        (contador por slug nombre.apellido, sin reintentos).
         Uno y solo uno IsPrimary=1 por usuario. VerifiedAtUtc ~85% si ACTIVE.
         Requiere: self.df_user, self.df_status (para dominios/estados).
         """
         assert self.df_user is not None and self.df_status is not None, "Faltan users/status"
 
-        rng = np.random.default_rng(self.cfg.seed + 302)
-        domains = self.cfg.email_domains
+        rng = self._table_rng("core.UserEmail")
         status_codes = [c for c in self.cfg.status_catalog["USER_EMAIL"]]
         # Proporción razonable
         status_p = np.array([0.90 if c=="ACTIVE" else 0.10 for c in status_codes], dtype=float)
         status_p /= status_p.sum()
 
-        def make_email(fullname: str, tag: int) -> str:
-            parts = fullname.lower().replace("á","a").replace("é","e").replace("í","i").replace("ó","o").replace("ú","u")
-            parts = re.sub(r"[^a-z\s]", "", parts)
-            first, *rest = parts.split()
-            last = rest[-1] if rest else "user"
-            return f"{first}.{last}{tag}@{rng.choice(domains)}"
-
-        rows = []
-        used = set()
-        email_id = 1
-        for uid, fullname, created_at in self.df_user[["UserId","FullName","CreatedAtUtc"]].itertuples(index=False):
-            nmin, nmax = self.cfg.emails_per_user_range
-            n = int(rng.integers(nmin, nmax+1))
-            prim_index = int(rng.integers(0, n))
-
-            for i in range(n):
-                # generar único
-                for attempt in range(100):
-                    email = make_email(fullname, tag=int(rng.integers(0, 10000)))
-                    if email not in used:
-                        used.add(email)
-                        break
-
-                added_at = _dt_between(created_at, self.cfg.end_date)
-                status = rng.choice(status_codes, p=status_p)
-                is_primary = 1 if i == prim_index else 0
-                verified_at = None
-                if status == "ACTIVE":
-                    # 85% verificados; si primario, ligeramente más probable
-                    p_verify = 0.85 + (0.08 if is_primary else 0.0)
-                    if rng.random() < min(p_verify, 0.98):
-                        verified_at = _dt_between(added_at, self.cfg.end_date)
-
-                rows.append((
-                    email_id, uid, email, is_primary, added_at, verified_at, status
-                ))
-                email_id += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "EmailId","UserId","Email","IsPrimary","AddedAtUtc","VerifiedAtUtc","StatusCode"
-        ])
+        df = user_emails_frame(
+            rng,
+            self.df_user["UserId"].to_numpy(),
+            self.df_user["FullName"],
+            self.df_user["CreatedAtUtc"],
+            self.cfg.end_date,
+            self.cfg.emails_per_user_range,
+            self.cfg.email_domains,
+            status_codes,
+            status_p,
+        )
         self.df_useremail = df
         if self.verbose:
             active_ratio = df["StatusCode"].eq("ACTIVE").mean()
@@ -414,7 +424,7 @@ class DataGenerator:
         """
         assert self.df_user is not None, "Faltan users"
 
-        rng = np.random.default_rng(self.cfg.seed + 303)
+        rng = self._table_rng("core.Wallet")
         rows = []
         wid = 1
         b_lo, b_hi = self.cfg.balance_eth_range
@@ -424,7 +434,7 @@ class DataGenerator:
             balance = float(rng.uniform(b_lo, b_hi))
             reserved_cap = min(balance, r_hi)
             reserved = float(rng.uniform(r_lo, reserved_cap))
-            updated_at = _dt_between(created_at, self.cfg.end_date)
+            updated_at = _dt_between(created_at, self.cfg.end_date, rng)
 
             rows.append((wid, uid, round(balance, 8), round(reserved, 8), updated_at))
             wid += 1
@@ -437,24 +447,26 @@ class DataGenerator:
 
     def generate_nfts(self) -> pd.DataFrame:
         """
-        Genera NFTs. ArtistId prioriza usuarios con rol ARTIST. CurrentOwnerId=ArtistId al crear.
+        Genera NFTs en bloque (motor columnar, shards sembrados de NFT_CHUNK_ROWS filas;
+        df_nft queda completo en memoria).
+        ArtistId prioriza usuarios con rol ARTIST. CurrentOwnerId=ArtistId al crear.
         StatusCode ~ {APPROVED,PENDING,REJECTED}. ApprovedAtUtc sólo si APPROVED.
+        HashCode: 64 hex desde un buffer aleatorio único; UNIQUE verificado sin set por fila.
         Requiere: self.df_user, self.df_userrole, self.df_role, self.df_status.
         """
         assert self.df_user is not None and self.df_status is not None, "Faltan users/status"
         assert self.df_userrole is not None and self.df_role is not None, "Faltan roles"
 
-        rng = np.random.default_rng(self.cfg.seed + 304)
-
         # pool de artistas
         role_artist_id = int(self.df_role.query("Name=='ARTIST'")["RoleId"].iloc[0]) if "ARTIST" in set(self.df_role["Name"]) else None
-        artist_users = set(self.df_userrole.query("RoleId==@role_artist_id")["UserId"].tolist()) if role_artist_id else set()
+        artist_users = self.df_userrole.loc[self.df_userrole["RoleId"] == role_artist_id, "UserId"].unique() if role_artist_id else np.array([], dtype=np.int64)
 
-        if not artist_users:
+        if len(artist_users) == 0:
             # fallback: todos los usuarios
-            artist_users = set(self.df_user["UserId"].tolist())
+            artist_users = self.df_user["UserId"].to_numpy()
 
-        users_df = self.df_user.set_index("UserId")
+        artist_users = np.sort(artist_users)
+        artist_created = self.df_user.set_index("UserId")["CreatedAtUtc"].reindex(artist_users)
 
         # estados válidos para NFT
         nft_statuses = [c for c in self.cfg.status_catalog["NFT"] if c in {"PENDING","APPROVED","REJECTED"}]
@@ -462,52 +474,17 @@ class DataGenerator:
         status_p = np.array([p_map[c] for c in nft_statuses], dtype=float)
         status_p /= status_p.sum()
 
-        def rand_hash64():
-            return "".join(rng.choice(list("0123456789abcdef"), size=64))
-
-        rows = []
-        nid = 1
-        for _ in range(self.cfg.n_nfts):
-            artist_id = int(rng.choice(list(artist_users)))
-            created_at = _dt_between(users_df.loc[artist_id, "CreatedAtUtc"], self.cfg.end_date)
-
-            name = f"Obra #{nid:04d}"
-            descr = f"Obra generada para dataset ArteCrypto (ID {nid})."
-            ctype = rng.choice(self.cfg.content_types)
-            hcode = rand_hash64()
-            fsize = int(rng.integers(60_000, 8_000_000))  # 60KB–8MB
-            w = int(rng.integers(512, 4096))
-            h = int(rng.integers(512, 4096))
-            sugg = float(rng.uniform(*self.cfg.suggested_price_eth_range))
-
-            status = rng.choice(nft_statuses, p=status_p)
-            approved_at = _dt_between(created_at, self.cfg.end_date) if status == "APPROVED" else None
-
-            row = (
-                int(nid),
-                int(artist_id),
-                1,  # SettingsID
-                int(artist_id),  # CurrentOwnerId
-                str(name),
-                str(descr),
-                str(ctype),
-                str(hcode),
-                int(fsize),
-                int(w),
-                int(h),
-                float(sugg),
-                str(status),
-                created_at,
-                approved_at
-            )
-            rows.append(cast(tuple[Any, ...], row))
-            nid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "NFTId","ArtistId","SettingsID","CurrentOwnerId","Name","Description","ContentType",
-            "HashCode","FileSizeBytes","WidthPx","HeightPx","SuggestedPriceETH",
-            "StatusCode","CreatedAtUtc","ApprovedAtUtc"
-        ])
+        df = nfts_frame(
+            lambda shard: self._table_rng("nft.NFT", shard),
+            self.cfg.n_nfts,
+            artist_users,
+            artist_created,
+            self.cfg.end_date,
+            self.cfg.content_types,
+            self.cfg.suggested_price_eth_range,
+            nft_statuses,
+            status_p,
+        )
         self.df_nft = df
         if self.verbose:
             dist = df["StatusCode"].value_counts(normalize=True).to_dict()
@@ -521,99 +498,61 @@ class DataGenerator:
     def generate_curation_reviews(self) -> pd.DataFrame:
         """
         Genera decisiones de curación para NFTs.
+        El curador se asigna round-robin como en nft.tr_NFT_InsertFlow
+        (curadores por UserId, NFTs por CreatedAtUtc), de forma vectorizada.
         Requiere: self.df_nft, self.df_role, self.df_user, self.df_userrole
         Salida: self.df_curation
         """
         assert self.df_nft is not None and self.df_role is not None and self.df_user is not None, "Faltan nft/role/user"
 
-        rng = np.random.default_rng(self.cfg.seed + 400)
+        rng = self._table_rng("admin.CurationReview")
         # curadores disponibles
         role_curator_id = int(self.df_role.query("Name=='CURATOR'")["RoleId"].iloc[0]) if "CURATOR" in set(self.df_role["Name"]) else None
-        curators = set()
+        curators = np.array([], dtype=np.int64)
         if role_curator_id is not None and self.df_userrole is not None:
-            curators = set(self.df_userrole.query("RoleId==@role_curator_id")["UserId"].tolist())
-        if not curators:
-            curators = set(self.df_user["UserId"].tolist())
-
-        curation_codes = ["PENDING", "APPROVED", "REJECTED"]
-        # Probabilidad: PENDING (20%), APPROVED (60%), REJECTED (20%)
-        p = np.array([0.20, 0.60, 0.20])
-
-        rows = []
-        rid = 1
-        # Crear reviews para todos los NFTs
-        for nft_id, created_at, status in self.df_nft[["NFTId","CreatedAtUtc","StatusCode"]].itertuples(index=False):
-            curator = int(rng.choice(list(curators)))
-            started_at = _dt_between(created_at, self.cfg.end_date)
-            
-            # Decisión basada en el estado del NFT
-            if status == "APPROVED":
-                decision = "APPROVED"
-                reviewed_at = _dt_between(started_at, self.cfg.end_date)
-            elif status == "REJECTED":
-                decision = "REJECTED"
-                reviewed_at = _dt_between(started_at, self.cfg.end_date)
-            else:  # PENDING
-                decision = str(rng.choice(curation_codes, p=p/p.sum()))
-                reviewed_at = _dt_between(started_at, self.cfg.end_date) if decision != "PENDING" else None
-            
-            comment = f"Revisión automática - Decisión: {decision}"
-            rows.append((rid, int(nft_id), curator, decision, comment, started_at, reviewed_at))
-            rid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "ReviewId","NFTId","CuratorId","DecisionCode","Comment","StartedAtUtc","ReviewedAtUtc"
-        ])
+            curators = self.df_userrole.loc[self.df_userrole["RoleId"] == role_curator_id, "UserId"].unique()
+        if len(curators) == 0:
+            curators = self.df_user["UserId"].to_numpy()
+
+        # PENDING sortea decisión: PENDING (20%), APPROVED (60%), REJECTED (20%)
+        df = curation_frame(
+            rng,
+            self.df_nft["NFTId"].to_numpy(),
+            self.df_nft["CreatedAtUtc"],
+            self.df_nft["StatusCode"].to_numpy(dtype=object),
+            curators,
+            self.cfg.end_date,
+            pending_decision_p=(0.20, 0.60, 0.20),
+        )
         self.df_curation = df
         if self.verbose:
-            print(f"  - admin.CurationReview: {len(df)} filas")
+            load = df["CuratorId"].value_counts()
+            print(f"  - admin.CurationReview: {len(df)} filas ({len(load)} curadores, carga {load.min()}–{load.max()})")
         return df
 
     def generate_auctions(self) -> pd.DataFrame:
         """
-        Crea subastas para una fracción de NFTs aprobados.
+        Crea subastas para una fracción de NFTs aprobados (sin iterar por NFT).
         Requiere: self.df_nft, self.df_auction_settings
         Salida: self.df_auction
         """
         assert self.df_nft is not None and self.df_auction_settings is not None, "Faltan nft/auction_settings"
 
-        rng = np.random.default_rng(self.cfg.seed + 410)
-        # escoger NFTs elegibles (APPROVED)
-        nft_pool = self.df_nft.query("StatusCode=='APPROVED'").copy()
-        n_to_auction = int(round(len(nft_pool) * self.cfg.pct_nfts_in_auction))
-        chosen = rng.choice(nft_pool["NFTId"].to_numpy(), size=max(0, n_to_auction), replace=False) if n_to_auction > 0 else np.array([], dtype=int)
-
-        rows = []
-        aid = 1
+        rng = self._table_rng("auction.Auction")
         settings = self.df_auction_settings.iloc[0]
-        default_hours = int(settings["DefaultAuctionHours"])
 
-        nft_idx = self.df_nft.set_index("NFTId")
-
-        for nft_id in chosen:
-            nft_row = nft_idx.loc[int(nft_id)]
-            start = _dt_between(nft_row["ApprovedAtUtc"] or nft_row["CreatedAtUtc"], self.cfg.end_date)
-            end = start + timedelta(hours=default_hours)
-            
-            # Determinar estado
-            if end > self.cfg.end_date:
-                status = "ACTIVE"
-            else:
-                status = rng.choice(["ACTIVE","COMPLETED","CANCELLED"], p=[0.10, 0.80, 0.10])
-
-            # precio inicial
-            base_price = float(nft_row["SuggestedPriceETH"])
-            start_price = round(base_price * float(rng.uniform(0.8, 1.2)), 8)
-            current_price = start_price
-
-            rows.append((
-                aid, 1, int(nft_id), start, end, float(start_price), float(current_price), None, status
-            ))
-            aid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "AuctionId","SettingsID","NFTId","StartAtUtc","EndAtUtc","StartingPriceETH","CurrentPriceETH","CurrentLeaderId","StatusCode"
-        ])
+        df = auctions_frame(
+            rng,
+            self.df_nft["NFTId"].to_numpy(),
+            self.df_nft["StatusCode"].to_numpy(dtype=object),
+            self.df_nft["CreatedAtUtc"],
+            self.df_nft["ApprovedAtUtc"],
+            self.df_nft["SuggestedPriceETH"].to_numpy(),
+            self.cfg.pct_nfts_in_auction,
+            self.cfg.end_date,
+            int(settings["DefaultAuctionHours"]),
+            settings_id=int(settings["SettingsID"]),
+        )
         self.df_auction = df
         if self.verbose:
             print(f"  - auction.Auction: {len(df)} filas")
@@ -621,72 +560,38 @@ class DataGenerator:
 
     def generate_bids(self) -> pd.DataFrame:
         """
-        Genera pujas para cada subasta basada en una Poisson(lambda).
+        Genera pujas para cada subasta basada en una Poisson(lambda), con un motor
+        de arreglos segmentados (sin bucles por subasta ni por puja).
         Requiere: self.df_auction, self.df_user, self.df_userrole
         Salida: self.df_bid
         """
         assert self.df_auction is not None and self.df_user is not None, "Faltan auction/user"
 
-        rng = np.random.default_rng(self.cfg.seed + 420)
         # bidders preferidos
-        bidders = None
-        if self.df_role is not None and self.df_userrole is not None:
-            try:
-                role_bidder_id = int(self.df_role.query("Name=='BIDDER'")["RoleId"].iloc[0])
-                bidders = list(self.df_userrole.query("RoleId==@role_bidder_id")["UserId"].unique())
-            except Exception:
-                bidders = None
-        if not bidders:
-            bidders = list(self.df_user["UserId"].tolist())
-
-        rows = []
-        bid_id = 1
-        
-        nft_idx = self.df_nft.set_index("NFTId")
-
-        for auction_id, settings_id, nft_id, start_at, end_at, start_price, current_price, current_leader, status in self.df_auction[[
-            "AuctionId","SettingsID","NFTId","StartAtUtc","EndAtUtc","StartingPriceETH","CurrentPriceETH","CurrentLeaderId","StatusCode"
-        ]].itertuples(index=False):
-            # si estado CANCELLED -> 0 pujas
-            if status == "CANCELLED":
-                continue
-
-            # obtener artista del NFT
-            artist_id = int(nft_idx.loc[int(nft_id)]["ArtistId"])
-
-            # número de pujas Poisson
-            lam = float(self.cfg.bids_per_auction_lambda)
-            n_bids = int(rng.poisson(lam))
-            if n_bids == 0 and status == "ACTIVE":
-                if rng.random() < 0.05:
-                    n_bids = 1
-
-            price = float(start_price)
-            # generar tiempos ordenados
-            if n_bids > 0:
-                times = sorted([start_at + timedelta(seconds=int(rng.integers(0, max(1, int((end_at - start_at).total_seconds()))))) for _ in range(n_bids)])
-                for t in times:
-                    # elegir bidder distinto al artista
-                    candidate = int(rng.choice(bidders))
-                    attempts = 0
-                    while candidate == artist_id and attempts < 10:
-                        candidate = int(rng.choice(bidders))
-                        attempts += 1
-
-                    # incremento
-                    min_inc = max(0.00000001, price * 0.05)
-                    increment = float(rng.uniform(1.0, 3.0)) * min_inc
-                    bid_amount = round(price + increment, 8)
-
-                    rows.append((
-                        bid_id, int(auction_id), candidate, bid_amount, t
-                    ))
-                    bid_id += 1
-                    price = bid_amount
-
-        df = pd.DataFrame(rows, columns=[
-            "BidId","AuctionId","BidderId","AmountETH","PlacedAtUtc"
-        ])
+        bidders = np.array([], dtype=np.int64)
+        if self.df_role is not None and self.df_userrole is not None and "BIDDER" in set(self.df_role["Name"]):
+            role_bidder_id = int(self.df_role.query("Name=='BIDDER'")["RoleId"].iloc[0])
+            bidders = self.df_userrole.loc[self.df_userrole["RoleId"] == role_bidder_id, "UserId"].unique()
+        if len(bidders) == 0:
+            bidders = self.df_user["UserId"].to_numpy()
+
+        # si estado CANCELLED -> 0 pujas
+        auctions = self.df_auction[self.df_auction["StatusCode"] != "CANCELLED"]
+        nft_pos = pd.Index(self.df_nft["NFTId"]).get_indexer(auctions["NFTId"])
+        artist_ids = self.df_nft["ArtistId"].to_numpy()[nft_pos]
+
+        df = bids_frame(
+            lambda shard: self._table_rng("auction.Bid", shard),
+            auctions["AuctionId"].to_numpy(),
+            artist_ids,
+            auctions["StartAtUtc"],
+            auctions["EndAtUtc"],
+            auctions["StartingPriceETH"].to_numpy(dtype=np.float64),
+            (auctions["StatusCode"] == "ACTIVE").to_numpy(),
+            np.sort(bidders),
+            float(self.cfg.bids_per_auction_lambda),
+            self.cfg.min_bid_increment_pct / 100.0,
+        )
         self.df_bid = df
         if self.verbose:
             print(f"  - auction.Bid: {len(df)} filas")
@@ -694,70 +599,45 @@ class DataGenerator:
 
     def settle_auctions_and_finance(self) -> pd.DataFrame:
         """
-        Resuelve subastas completadas: determina ganador, crea reservas y ledger
+        Resuelve subastas completadas: determina ganador, crea reservas y ledger.
+        El ganador de cada subasta se obtiene en una sola pasada sobre df_bid y las
+        actualizaciones (líder/precio, dueño del NFT) son una asignación indexada por tabla.
         Requiere: self.df_auction, self.df_bid, self.df_wallet, self.df_nft
         Salida: self.df_reservation y self.df_ledger
         """
         assert self.df_auction is not None and self.df_nft is not None, "Faltan auction/nft"
-        
-        bids_df = self.df_bid if self.df_bid is not None else pd.DataFrame(columns=["BidId","AuctionId","BidderId","AmountETH","PlacedAtUtc"])
-
-        rng = np.random.default_rng(self.cfg.seed + 430)
-        rows_res = []
-        rows_ledger = []
-        res_id = 1
-        ledger_id = 1
 
-        auction_idx = self.df_auction.set_index("AuctionId")
-        nft_idx = self.df_nft.set_index("NFTId")
+        winners = winning_bids(self.df_bid)
+        auc_pos = pd.Index(self.df_auction["AuctionId"]).get_indexer(winners["AuctionId"])
 
         # Actualizar CurrentLeaderId y CurrentPriceETH en auctions
-        for aid in self.df_auction["AuctionId"]:
-            bids_for = bids_df.query("AuctionId==@aid")
-            if not bids_for.empty:
-                # último bid (mayor precio)
-                bids_sorted = bids_for.sort_values(["AmountETH","PlacedAtUtc"], ascending=[False, True])
-                winner_row = bids_sorted.iloc[0]
-                self.df_auction.loc[self.df_auction.AuctionId==aid, "CurrentLeaderId"] = int(winner_row["BidderId"])
-                self.df_auction.loc[self.df_auction.AuctionId==aid, "CurrentPriceETH"] = float(winner_row["AmountETH"])
-
-        # Procesar subastas completadas
-        completed_auctions = self.df_auction.query("StatusCode=='COMPLETED'").copy()
-
-        for aid, row in completed_auctions.set_index("AuctionId").iterrows():
-            bids_for = bids_df.query("AuctionId==@aid")
-            if bids_for.empty:
-                continue
-
-            bids_sorted = bids_for.sort_values(["AmountETH","PlacedAtUtc"], ascending=[False, True])
-            winner_row = bids_sorted.iloc[0]
-            winner_id = int(winner_row["BidderId"])
-            winning_amount = float(winner_row["AmountETH"])
-
-            # crear reserva
-            rows_res.append((
-                res_id, int(aid), winner_id, round(winning_amount, 8), "APPLIED", row["EndAtUtc"]
-            ))
-            res_id += 1
-
-            # ledger entries
-            fee = round(winning_amount * 0.02, 8)
-            seller_amount = round(winning_amount - fee, 8)
-            nft_id = int(row["NFTId"])
-            seller_id = int(nft_idx.loc[nft_id]["ArtistId"])
-
-            # débito buyer
-            rows_ledger.append((ledger_id, int(aid), winner_id, round(winning_amount,8), "DEBIT", row["EndAtUtc"]))
-            ledger_id += 1
-            # crédito seller
-            rows_ledger.append((ledger_id, int(aid), seller_id, round(seller_amount,8), "CREDIT", row["EndAtUtc"]))
-            ledger_id += 1
-
-            # actualizar owner del NFT
-            self.df_nft.loc[self.df_nft.NFTId==nft_id, "CurrentOwnerId"] = winner_id
-
-        df_res = pd.DataFrame(rows_res, columns=["ReservationId","AuctionId","UserId","AmountETH","StateCode","CreatedAtUtc"])
-        df_ledger = pd.DataFrame(rows_ledger, columns=["EntryId","AuctionId","UserId","AmountETH","EntryType","CreatedAtUtc"])
+        leader_col = self.df_auction["CurrentLeaderId"]
+        leader = leader_col.to_numpy(dtype=np.int64, na_value=0, copy=True)
+        leader_na = leader_col.isna().to_numpy(copy=True)
+        price = self.df_auction["CurrentPriceETH"].to_numpy(dtype=np.float64, copy=True)
+        leader[auc_pos] = winners["BidderId"].to_numpy()
+        leader_na[auc_pos] = False
+        price[auc_pos] = winners["AmountETH"].to_numpy()
+        self.df_auction["CurrentLeaderId"] = pd.arrays.IntegerArray(leader, leader_na)
+        self.df_auction["CurrentPriceETH"] = price
+
+        # Procesar subastas completadas (vendedor = artista del NFT)
+        nft_ids = self.df_auction["NFTId"].to_numpy()[auc_pos]
+        nft_pos = pd.Index(self.df_nft["NFTId"]).get_indexer(nft_ids)
+        auction_status = self.df_auction["StatusCode"].to_numpy(dtype=object)[auc_pos]
+        df_res, df_ledger = settlement_frames(
+            winners,
+            auction_status,
+            self.df_auction["EndAtUtc"].to_numpy()[auc_pos],
+            self.df_nft["ArtistId"].to_numpy()[nft_pos],
+            reservation_state="APPLIED",
+        )
+
+        # actualizar owner del NFT
+        done = auction_status == "COMPLETED"
+        owner = self.df_nft["CurrentOwnerId"].to_numpy(copy=True)
+        owner[nft_pos[done]] = winners["BidderId"].to_numpy()[done]
+        self.df_nft["CurrentOwnerId"] = owner
 
         self.df_reservation = df_res
         self.df_ledger = df_ledger
@@ -774,45 +654,7 @@ class DataGenerator:
         """
         assert self.df_auction is not None, "Faltan auction"
 
-        rng = np.random.default_rng(self.cfg.seed + 440)
-        out_rows = []
-        eid = 1
-
-        # helper: obtener email primario
-        prim_emails = {}
-        if self.df_useremail is not None:
-            prim_emails = self.df_useremail.query("IsPrimary==1").set_index("UserId")["Email"].to_dict()
-
-        nft_idx = self.df_nft.set_index("NFTId") if self.df_nft is not None else None
-
-        # Emails de subastas
-        for _, auc in self.df_auction.iterrows():
-            nftid = int(auc["NFTId"])
-            if nft_idx is not None and nftid in nft_idx.index:
-                artist = int(nft_idx.loc[nftid]["ArtistId"])
-                to_email = prim_emails.get(artist, None)
-                if to_email:
-                    subj = f"Subasta creada para NFT #{nftid}"
-                    body = f"Tu NFT ha sido listado en subasta (Auction #{int(auc['AuctionId'])})."
-                    out_rows.append((eid, artist, to_email, subj, body, "PENDING"))
-                    eid += 1
-
-        # Emails de curación
-        if self.df_curation is not None:
-            for _, cur in self.df_curation.iterrows():
-                if cur["DecisionCode"] in ["APPROVED", "REJECTED"]:
-                    nftid = int(cur["NFTId"])
-                    if nft_idx is not None and nftid in nft_idx.index:
-                        artist = int(nft_idx.loc[nftid]["ArtistId"])
-                        to_email = prim_emails.get(artist, None)
-                        if to_email:
-                            decision = "aprobado" if cur["DecisionCode"] == "APPROVED" else "rechazado"
-                            subj = f"NFT #{nftid} {decision}"
-                            body = f"Tu NFT ha sido {decision} por el curador."
-                            out_rows.append((eid, artist, to_email, subj, body, "PENDING"))
-                            eid += 1
-
-        df = pd.DataFrame(out_rows, columns=["EmailId","RecipientUserId","RecipientEmail","Subject","Body","StatusCode"])
+        df = email_outbox_frame(self.df_auction, self.df_curation, self.df_nft, self.df_useremail)
         self.df_email_outbox = df
         if self.verbose:
             print(f"  - audit.EmailOutbox: {len(df)} filas")
@@ -822,87 +664,81 @@ class DataGenerator:
     # FASE 5: Exportación a SQL
     # ==========================
 
+    # Orden de inserción (respetando FKs): clave -> (atributo, tabla, esquema)
+    _SQL_TABLES = [
+        ("ops.Status", "df_status", "Status", "ops"),
+        ("core.Role", "df_role", "Role", "core"),
+        ("core.User", "df_user", "User", "core"),
+        ("nft.NFTSettings", "df_nft_settings", "NFTSettings", "nft"),
+        ("auction.AuctionSettings", "df_auction_settings", "AuctionSettings", "auction"),
+        ("core.UserRole", "df_userrole", "UserRole", "core"),
+        ("core.UserEmail", "df_useremail", "UserEmail", "core"),
+        ("core.Wallet", "df_wallet", "Wallet", "core"),
+        ("nft.NFT", "df_nft", "NFT", "nft"),
+        ("admin.CurationReview", "df_curation", "CurationReview", "admin"),
+        ("auction.Auction", "df_auction", "Auction", "auction"),
+        ("auction.Bid", "df_bid", "Bid", "auction"),
+        ("finance.FundsReservation", "df_reservation", "FundsReservation", "finance"),
+        ("finance.Ledger", "df_ledger", "Ledger", "finance"),
+        ("audit.EmailOutbox", "df_email_outbox", "EmailOutbox", "audit"),
+    ]
+
+    @staticmethod
+    def _df_to_value_rows(df: pd.DataFrame) -> List[str]:
+        """
+        Tupla VALUES '(v1, v2, ...)' de cada fila del DataFrame (o bloque de filas).
+        Formateo columna a columna: DECIMAL con 8 decimales, fechas '...' y texto N'...'.
+        """
+        return format_value_rows(df, float_format=".8f", datetime_prefix="")
+
+    def _df_to_inserts(self, df: pd.DataFrame, table_name: str, schema: str = "dbo") -> List[str]:
+        """INSERTs multi-fila de cfg.sql_rows_per_insert filas (máx. 1000)."""
+        if df is None or df.empty:
+            return []
+
+        full_table = f"[{schema}].[{table_name}]"
+        cols = "(" + ", ".join([f"[{c}]" for c in df.columns]) + ")"
+        rows = self._df_to_value_rows(df)
+        step = self.cfg.sql_rows_per_insert
+        return [insert_statement(full_table, cols, rows[i:i + step]) for i in range(0, len(rows), step)]
+
+    def _iter_table_batches(self, df: pd.DataFrame, table_name: str, schema: str,
+                            chunk_rows: Optional[int] = None,
+                            pool: Optional[ProcessPoolExecutor] = None) -> Iterator[str]:
+        """
+        Lotes GO de una tabla: las filas se formatean por bloques de `chunk_rows`
+        (nunca la tabla completa, redondeado a lotes GO completos) y se agrupan
+        según cfg.sql_rows_per_insert, cfg.sql_inserts_per_batch y
+        cfg.sql_batch_transaction. Con `pool` los bloques se formatean en paralelo
+        y se entregan en orden (mismo texto que en serie).
+        """
+        cfg = self.cfg
+        chunk_rows = aligned_chunk_rows(chunk_rows or cfg.sql_chunk_rows,
+                                        cfg.sql_rows_per_insert, cfg.sql_inserts_per_batch)
+        yield from iter_chunk_texts(
+            format_insert_batches, df, chunk_rows, pool, window=2 * cfg.export_workers,
+            target=f"[{schema}].[{table_name}]",
+            cols_str="(" + ", ".join([f"[{c}]" for c in df.columns]) + ")",
+            float_format=".8f", datetime_prefix="",
+            rows_per_insert=cfg.sql_rows_per_insert,
+            inserts_per_batch=cfg.sql_inserts_per_batch,
+            transaction=cfg.sql_batch_transaction,
+            identity=has_identity(f"{schema}.{table_name}", df.columns),
+        )
+
     def to_sql_inserts(self) -> Dict[str, List[str]]:
         """
         Convierte todos los DataFrames a sentencias INSERT de SQL
-        Retorna: Dict con nombre de tabla -> lista de INSERTs
+        Retorna: Dict con nombre de tabla -> lista de INSERTs (multi-fila)
+        Nota: materializa todo en memoria; write_sql_file escribe por bloques.
         """
         sql_statements = {}
 
-        def df_to_inserts(df: pd.DataFrame, table_name: str, schema: str = "dbo") -> List[str]:
-            if df is None or df.empty:
-                return []
-            
-            inserts = []
-            full_table = f"[{schema}].[{table_name}]"
-            cols = ", ".join([f"[{c}]" for c in df.columns])
-            
-            for _, row in df.iterrows():
-                values = []
-                for val in row:
-                    if pd.isna(val) or val is None:
-                        values.append("NULL")
-                    elif isinstance(val, (int, np.integer)):
-                        values.append(str(val))
-                    elif isinstance(val, (float, np.floating)):
-                        values.append(f"{val:.8f}")
-                    elif isinstance(val, datetime):
-                        values.append(f"'{val.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}'")
-                    else:
-                        # string - escapar comillas simples
-                        escaped = str(val).replace("'", "''")
-                        values.append(f"N'{escaped}'")
-                
-                insert = f"INSERT INTO {full_table} ({cols}) VALUES ({', '.join(values)});"
-                inserts.append(insert)
-            
-            return inserts
-
         # Generar INSERTs para cada tabla
-        if self.df_status is not None:
-            sql_statements["ops.Status"] = df_to_inserts(self.df_status, "Status", "ops")
-        
-        if self.df_role is not None:
-            sql_statements["core.Role"] = df_to_inserts(self.df_role, "Role", "core")
-        
-        if self.df_user is not None:
-            sql_statements["core.User"] = df_to_inserts(self.df_user, "User", "core")
-        
-        if self.df_nft_settings is not None:
-            sql_statements["dbo.NFTSettings"] = df_to_inserts(self.df_nft_settings, "NFTSettings", "dbo")
-        
-        if self.df_auction_settings is not None:
-            sql_statements["auction.AuctionSettings"] = df_to_inserts(self.df_auction_settings, "AuctionSettings", "auction")
-        
-        if self.df_userrole is not None:
-            sql_statements["core.UserRole"] = df_to_inserts(self.df_userrole, "UserRole", "core")
-        
-        if self.df_useremail is not None:
-            sql_statements["core.UserEmail"] = df_to_inserts(self.df_useremail, "UserEmail", "core")
-        
-        if self.df_wallet is not None:
-            sql_statements["core.Wallet"] = df_to_inserts(self.df_wallet, "Wallet", "core")
-        
-        if self.df_nft is not None:
-            sql_statements["nft.NFT"] = df_to_inserts(self.df_nft, "NFT", "nft")
-        
-        if self.df_curation is not None:
-            sql_statements["admin.CurationReview"] = df_to_inserts(self.df_curation, "CurationReview", "admin")
-        
-        if self.df_auction is not None:
-            sql_statements["auction.Auction"] = df_to_inserts(self.df_auction, "Auction", "auction")
-        
-        if self.df_bid is not None:
-            sql_statements["auction.Bid"] = df_to_inserts(self.df_bid, "Bid", "auction")
-        
-        if self.df_reservation is not None:
-            sql_statements["finance.FundsReservation"] = df_to_inserts(self.df_reservation, "FundsReservation", "finance")
-        
-        if self.df_ledger is not None:
-            sql_statements["finance.Ledger"] = df_to_inserts(self.df_ledger, "Ledger", "finance")
-        
-        if self.df_email_outbox is not None:
-            sql_statements["audit.EmailOutbox"] = df_to_inserts(self.df_email_outbox, "EmailOutbox", "audit")
+        for key, attr, table_name, schema in self._SQL_TABLES:
+            df = getattr(self, attr)
+            if df is not None:
+                sql_statements[key] = self._df_to_inserts(df, table_name, schema)
 
         if self.verbose:
             total = sum(len(stmts) for stmts in sql_statements.values())
@@ -910,13 +746,25 @@ class DataGenerator:
         
         return sql_statements
 
-    def write_sql_file(self, filepath: str) -> None:
+    def write_sql_file(self, filepath: str, chunk_rows: Optional[int] = None) -> str:
         """
-        Escribe todos los INSERTs a un archivo SQL
+        Escribe todos los INSERTs a un archivo SQL en modo streaming: cada tabla
+        se formatea por bloques de `chunk_rows` filas (cfg.sql_chunk_rows) y se
+        escribe directo al archivo en orden de FKs, con memoria acotada.
+        Los INSERTs son multi-fila y se agrupan en lotes GO (ver _iter_table_batches).
+        Con cfg.export_workers > 1 los bloques se formatean en un pool de procesos;
+        con cfg.output_compression ('gzip'/'zstd') se comprime al escribir
+        (el archivo final lleva sufijo .gz/.zst). La escritura a disco corre en un
+        hilo aparte (cola de cfg.writer_queue_depth bloques) mientras se formatea.
+        Retorna la ruta escrita (con el sufijo de compresión, si lo hay).
         """
-        sql_statements = self.to_sql_inserts()
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
+        step = self.cfg.sql_rows_per_insert
+        total = 0
+        n_tables = 0
+
+        f, filepath = open_async_output(filepath, self.cfg.output_compression, self.cfg.output_compression_level,
+                                        queue_depth=self.cfg.writer_queue_depth)
+        with f, export_pool(self.cfg.export_workers) as pool:
             f.write("-- =====================================================================================\n")
             f.write("-- SCRIPT DE INSERCIÓN DE DATOS - ArteCryptoAuctions\n")
             f.write(f"-- Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -926,40 +774,142 @@ class DataGenerator:
             f.write("SET NOCOUNT ON;\n")
             f.write("GO\n\n")
             
-            # Orden de inserción (respetando FKs)
-            table_order = [
-                "ops.Status",
-                "core.Role",
-                "core.User",
-                "dbo.NFTSettings",
-                "auction.AuctionSettings",
-                "core.UserRole",
-                "core.UserEmail",
-                "core.Wallet",
-                "nft.NFT",
-                "admin.CurationReview",
-                "auction.Auction",
-                "auction.Bid",
-                "finance.FundsReservation",
-                "finance.Ledger",
-                "audit.EmailOutbox"
-            ]
-            
-            for table in table_order:
-                if table in sql_statements:
-                    f.write(f"-- =====================================================================================\n")
-                    f.write(f"-- {table}\n")
-                    f.write(f"-- =====================================================================================\n")
-                    f.write(f"PRINT 'Insertando datos en {table}...';\n")
-                    f.write("GO\n\n")
-                    
-                    for stmt in sql_statements[table]:
-                        f.write(stmt + "\n")
-                    
-                    f.write("\nGO\n\n")
+            # Orden de inserción (respetando FKs): self._SQL_TABLES
+            for table, attr, table_name, schema in self._SQL_TABLES:
+                df = getattr(self, attr)
+                if df is None:
+                    continue
+                n_tables += 1
+                f.write(f"-- =====================================================================================\n")
+                f.write(f"-- {table}\n")
+                f.write(f"-- =====================================================================================\n")
+                f.write(f"PRINT 'Insertando datos en {table}...';\n")
+                f.write("GO\n\n")
+
+                for batch in self._iter_table_batches(df, table_name, schema, chunk_rows, pool):
+                    f.write(batch)
+                total += -(-len(df) // step)
+
+                f.write("\n")
             
             f.write("PRINT 'Inserción de datos completada exitosamente.';\n")
             f.write("GO\n")
         
         if self.verbose:
+            print(f"  - Generados {total} INSERT statements para {n_tables} tablas")
             print(f"  - Archivo SQL escrito: {filepath}")
+            print(f"  - Escritura: {f.bytes_written / 1e6:.1f} MB, E/S {f.io_seconds:.2f} s ({f.mb_per_s:.1f} MB/s), "
+                  f"total {f.wall_seconds:.2f} s ({f.end_to_end_mb_per_s:.1f} MB/s)")
+        return filepath
+
+    def write_bulk_load_files(self, directory: str, chunk_rows: Optional[int] = None) -> List[str]:
+        """
+        Exporta para carga masiva: por tabla un archivo delimitado (<tabla>.dat,
+        UTF-8, tab/CRLF) y su archivo de formato BCP (<tabla>.fmt), más el script
+        load_bulk.sql que ejecuta BULK INSERT ... WITH (TABLOCK, CHECK_CONSTRAINTS,
+        KEEPIDENTITY, BATCHSIZE=cfg.bulk_batch_size) en orden de FKs (self._SQL_TABLES):
+        FKs y CHECK se validan como en el script de INSERTs.
+        El script usa la variable sqlcmd $(DataDir) (`:setvar`, por defecto `directory`).
+        Los .dat no se comprimen aunque haya cfg.output_compression (BULK INSERT no los leería).
+        Con cfg.fast_load el script deshabilita índices no agrupados y triggers antes
+        de cargar y carga sin CHECK_CONSTRAINTS; al final reconstruye/rehabilita,
+        valida las FKs y CHECK de cada tabla (WITH CHECK CHECK CONSTRAINT ALL) y se escribe
+        post_load_checks.sql con la verificación posterior a la carga.
+        Retorna las rutas de los archivos escritos.
+        """
+        os.makedirs(directory, exist_ok=True)
+        chunk_rows = max(1, chunk_rows or self.cfg.sql_chunk_rows)
+        data_dir = os.path.abspath(directory)
+
+        script = [
+            "-- =====================================================================================\n",
+            "-- CARGA MASIVA (BULK INSERT) - ArteCryptoAuctions\n",
+            f"-- Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "-- Ejecutar con sqlcmd (o SSMS en modo SQLCMD); DataDir debe ser visible para el servidor.\n",
+            "-- =====================================================================================\n\n",
+            f':setvar DataDir "{data_dir}"\n\n',
+            "USE [ArteCryptoAuctions];\n",
+            "GO\n\n",
+            "SET NOCOUNT ON;\n",
+            "GO\n\n",
+        ]
+        n_tables = 0
+        written: List[str] = []
+        loaded = [(table, attr) for table, attr, _, _ in self._SQL_TABLES
+                  if getattr(self, attr) is not None and not getattr(self, attr).empty]
+        if self.cfg.fast_load:
+            script += [fast_load_prologue(t for t, _ in loaded), "\n"]
+
+        with export_pool(self.cfg.export_workers) as pool:
+            for table, attr, table_name, schema in self._SQL_TABLES:
+                df = getattr(self, attr)
+                if df is None or df.empty:
+                    continue
+                n_tables += 1
+
+                # Sin cfg.output_compression: BULK INSERT no lee archivos comprimidos
+                data_path = os.path.join(directory, f"{table}.dat")
+                with open(data_path, "w", encoding="utf-8", newline="") as f:
+                    for text in iter_chunk_texts(format_delimited_rows, df, chunk_rows, pool,
+                                                 window=2 * self.cfg.export_workers):
+                        f.write(text)
+                format_path = os.path.join(directory, f"{table}.fmt")
+                with open(format_path, "w", encoding="utf-8") as f:
+                    f.write(bcp_format_file(table, list(df.columns)))
+                written += [data_path, format_path]
+
+                # BULK INSERT no dispara triggers sin FIRE_TRIGGERS; aun así se deshabilita
+                # el INSTEAD OF INSERT de nft.NFT para conservar los estados simulados.
+                nft_trigger = table == "nft.NFT" and not self.cfg.fast_load
+                script.append(f"PRINT 'Cargando {table}...';\n")
+                if nft_trigger:
+                    script.append("DISABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;\n")
+                script.append(bulk_insert_statement(
+                    f"[{schema}].[{table_name}]",
+                    f"$(DataDir){os.sep}{table}.dat",
+                    f"$(DataDir){os.sep}{table}.fmt",
+                    batch_size=self.cfg.bulk_batch_size,
+                    keep_identity=has_identity(table, df.columns),
+                    # Carga rápida: sin validar fila a fila; se validan al final (epílogo)
+                    check_constraints=not self.cfg.fast_load,
+                ))
+                if nft_trigger:
+                    script.append("ENABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;\n")
+                script.append("GO\n\n")
+
+        if self.cfg.fast_load:
+            script += [fast_load_epilogue((t for t, _ in loaded), check_constraints=True), "\n"]
+            checks_path = os.path.join(directory, "post_load_checks.sql")
+            with open(checks_path, "w", encoding="utf-8") as f:
+                f.write("USE [ArteCryptoAuctions];\nGO\n\n")
+                f.write(post_load_check_script({t: len(getattr(self, attr)) for t, attr in loaded}))
+            written.append(checks_path)
+        script.append("PRINT 'Carga masiva completada exitosamente.';\n")
+        script.append("GO\n")
+        script_path = os.path.join(directory, "load_bulk.sql")
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write("".join(script))
+        written.append(script_path)
+
+        if self.verbose:
+            print(f"  - Archivos de carga masiva: {n_tables} tablas en {directory}")
+            print(f"  - Script BULK INSERT escrito: {script_path}")
+        return written
+
+    def write_parquet_snapshot(self, directory: str, row_group_rows: int = SNAPSHOT_ROW_GROUP_ROWS) -> Dict:
+        """
+        Snapshot columnar de todos los df_*: un <nombre>.parquet por DataFrame
+        (grupos de `row_group_rows` filas, tipos compactos) y manifest.json con
+        conteos y la configuración. Requiere pyarrow.
+        Lectura: datagen_snapshot.read_parquet_snapshot(directory).
+        """
+        frames = {k[len("df_"):]: v for k, v in vars(self).items() if k.startswith("df_")}
+        manifest = write_parquet_snapshot(
+            frames, directory, config=config_to_dict(self.cfg), row_group_rows=row_group_rows,
+            compression=self.cfg.output_compression or "zstd",
+            compression_level=self.cfg.output_compression_level,
+        )
+        if self.verbose:
+            total = sum(t["rows"] for t in manifest["tables"].values())
+            print(f"  - Snapshot Parquet: {len(manifest['tables'])} tablas, {total} filas en {directory}")
+        return manifest
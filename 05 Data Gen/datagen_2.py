@@ -1,13 +1,26 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from typing import Any, cast
-import random
+from typing import Any, Dict, Iterator, List, Tuple, Optional, Union
 import numpy as np
 import pandas as pd
-import re  # <--- Importado para generate_user_emails
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from datagen_engines import (
+    auctions_frame, bids_frame, curation_frame, email_outbox_frame, nfts_frame,
+    settlement_frames, table_rng, user_emails_frame, user_roles_frame, users_frame,
+    winning_bids,
+)
+from datagen_pipeline import PipelineDriver
+from datagen_snapshot import SNAPSHOT_ROW_GROUP_ROWS, config_to_dict, write_parquet_snapshot
+from datagen_sql import (
+    FAST_LOAD_HINT, FK_DEPENDENCIES, INSTEAD_OF_INSERT_TRIGGERS, aligned_chunk_rows, dependency_levels,
+    export_pool, fast_load_epilogue, fast_load_prologue, format_insert_batches, has_identity,
+    iter_chunk_texts, open_async_output, post_load_check_script, shard_key_column, shard_slices,
+    table_key,
+)
 
 
 # ===============================
@@ -48,6 +61,25 @@ class DataGenConfig:
     min_bid_increment_pct: int = 5
     bids_per_auction_lambda: float = 20.0  # media Poisson
 
+    # run_pipeline: hilos para pasos independientes (1 = en serie)
+    pipeline_workers: int = 1
+    pipeline_trace_memory: bool = False  # pico de tracemalloc por paso en el reporte (más lento)
+    cache_max_mb: int = 1024  # límite del caché de run_pipeline(cache_directory=...), expulsión LRU
+    cache_verify: bool = False  # en cada acierto recalcular el SHA-256 (si no, tamaño y mtime)
+
+    # Exportación SQL: filas formateadas por bloque (memoria acotada)
+    sql_chunk_rows: int = 50_000
+    sql_rows_per_insert: int = 1000     # filas por INSERT (máx. 1000 en SQL Server)
+    sql_inserts_per_batch: int = 10     # INSERTs por lote GO
+    sql_batch_transaction: bool = False  # BEGIN/COMMIT TRANSACTION por lote
+    export_workers: int = 1              # procesos que formatean bloques (1 = en serie)
+    output_compression: Optional[str] = None    # None, "gzip" o "zstd" (requiere zstandard)
+    output_compression_level: Optional[int] = None  # None = nivel por defecto del códec
+    writer_queue_depth: int = 8          # bloques (~1 MB) en cola hacia el hilo escritor
+    sql_shards: int = 1                  # archivos por tabla grande, por rango de ID (1 = sin shards)
+    sql_shard_min_rows: int = 100_000    # tablas con menos filas van en un solo archivo
+    fast_load: bool = False              # índices no agrupados y triggers fuera durante la carga, TABLOCK
+
     status_catalog: Dict[str, List[str]] = field(default_factory=lambda: {
         "NFT": ["PENDING", "APPROVED", "REJECTED"],
         "AUCTION": ["ACTIVE", "COMPLETED", "CANCELLED"],
@@ -62,14 +94,9 @@ class DataGenConfig:
 # Utilidades mínimas (Sin cambios)
 # ===============================
 
-def _rng(seed: int):
-    random.seed(seed)
-    np.random.seed(seed)
-
-
-def _dt_between(start: datetime, end: datetime) -> datetime:
+def _dt_between(start: datetime, end: datetime, rng: np.random.Generator) -> datetime:
     delta = end - start
-    seconds = random.randrange(int(delta.total_seconds()))
+    seconds = int(rng.integers(max(1, int(delta.total_seconds()))))
     return start + timedelta(seconds=seconds)
 
 
@@ -99,10 +126,6 @@ _LAST_NAMES = [
 ]
 
 
-def _full_name() -> str:
-    return f"{random.choice(_FIRST_NAMES)} {random.choice(_LAST_NAMES)}"
-
-
 def _status_desc(domain: str, code: str) -> str:
     mapping = {
         ("NFT", "PENDING"): "NFT en revisión",
@@ -126,15 +149,18 @@ def _status_desc(domain: str, code: str) -> str:
     return mapping.get((domain, code), f"{domain}:{code}")
 
 
+# Parte de un archivo SQL exportado: texto literal o (DataFrame, tabla)
+_SqlPart = Union[str, Tuple[Optional[pd.DataFrame], str]]
+
+
 # ===============================
 # Clase principal (Integrada)
 # ===============================
 
-class DataGenerator:
+class DataGenerator(PipelineDriver):
     def __init__(self, cfg: Optional[DataGenConfig] = None, *, verbose: bool = True):
         self.cfg = cfg or DataGenConfig()
         self.verbose = verbose
-        _rng(self.cfg.seed)
 
         # DataFrames de Fase 2 (Catálogos)
         self.df_status: Optional[pd.DataFrame] = None
@@ -162,6 +188,13 @@ class DataGenerator:
         self.sql_entity_actors: Optional[str] = None
         self.sql_process_simulation: Optional[str] = None
 
+        # Reporte, checkpoint y caché de run_pipeline (ver datagen_pipeline.PipelineDriver)
+        self._init_pipeline_state()
+
+    def _table_rng(self, table: str, shard: Optional[int] = None) -> np.random.Generator:
+        """Flujo aleatorio propio de la tabla (independiente del orden de generación)."""
+        return table_rng(self.cfg.seed, table, shard)
+
     # -------------------------------
     # Controlador del flujo/Pipeline
     # -------------------------------
@@ -190,52 +223,69 @@ class DataGenerator:
             "generate_email_outbox",
         ],
         5: [
-            # Métodos de exportación
-            "generate_sql_for_initial_data",
-            "generate_sql_for_entity_actors",
-            "generate_sql_for_process_simulation",
+            # Exportación en streaming (los generate_sql_for_* quedan para obtener
+            # el SQL como cadena en memoria)
             "write_separated_sql_files",
+            "write_parquet_snapshot",
         ],
     }
 
+    # df_* que lee y escribe cada paso: run_pipeline arma con esto el grafo de
+    # dependencias y, con cfg.pipeline_workers > 1, corre a la vez los pasos listos
+    _ALL_FRAMES = (
+        "df_status", "df_role", "df_user", "df_auction_settings", "df_nft_settings",
+        "df_userrole", "df_useremail", "df_wallet", "df_nft", "df_curation", "df_auction",
+        "df_bid", "df_reservation", "df_ledger", "df_email_outbox",
+    )
+    _STEP_IO = {
+        "generate_status_catalog": ((), ("df_status",)),
+        "generate_roles": ((), ("df_role",)),
+        "generate_users": ((), ("df_user",)),
+        "generate_auction_settings": ((), ("df_auction_settings",)),
+        "generate_nft_settings": ((), ("df_nft_settings",)),
+        "assign_user_roles": (("df_user", "df_role"), ("df_userrole",)),
+        "generate_user_emails": (("df_user", "df_status"), ("df_useremail",)),
+        "generate_wallets": (("df_user",), ("df_wallet",)),
+        "generate_nfts": (("df_user", "df_role", "df_userrole", "df_status"), ("df_nft",)),
+        "generate_curation_reviews": (("df_nft", "df_user", "df_role", "df_userrole"), ("df_curation",)),
+        "generate_auctions": (("df_nft", "df_auction_settings"), ("df_auction",)),
+        "generate_bids": (("df_auction", "df_nft", "df_user", "df_role", "df_userrole"), ("df_bid",)),
+        # actualiza líder/precio de df_auction y el dueño en df_nft
+        "settle_auctions_and_finance": (("df_auction", "df_bid", "df_nft"),
+                                        ("df_auction", "df_nft", "df_reservation", "df_ledger")),
+        "generate_email_outbox": (("df_auction", "df_curation", "df_nft", "df_useremail"), ("df_email_outbox",)),
+        "write_separated_sql_files": (_ALL_FRAMES, ()),
+        "write_parquet_snapshot": (_ALL_FRAMES, ()),
+    }
+
+    # Exportador -> argumento de run_pipeline con su destino
+    _EXPORT_TARGETS = {
+        "write_separated_sql_files": "export_sql_directory",
+        "write_parquet_snapshot": "export_parquet_directory",
+    }
+
     def run_pipeline(
             self,
             phases: Tuple[int, ...] = (2, 3, 4, 5),
             *,
             strict: bool = True,
-            export_sql_directory: Optional[str] = None
+            export_sql_directory: Optional[str] = None,
+            export_parquet_directory: Optional[str] = None,
+            export_report_path: Optional[str] = None,
+            checkpoint_directory: Optional[str] = None,
+            cache_directory: Optional[str] = None
     ) -> "DataGenerator":
-
-        for phase in phases:
-            methods = self._PHASE_METHODS.get(phase, [])
-            if self.verbose:
-                print(f"[Pipeline] Fase {phase} — métodos: {', '.join(methods) or '—'}")
-
-            for m in methods:
-                if m == "write_separated_sql_files":
-                    if not export_sql_directory:
-                        if self.verbose:
-                            print("  - skip write_separated_sql_files (sin export_sql_directory)")
-                        continue
-                    else:
-                        if self.verbose:
-                            print(f"  ✓ ejecutando {m}({export_sql_directory})")
-                        getattr(self, m)(export_sql_directory)
-                else:
-                    if not hasattr(self, m) or not callable(getattr(self, m)):
-                        if strict:
-                            raise NotImplementedError(
-                                f"El método requerido '{m}' para la fase {phase} aún no está implementado."
-                            )
-                        else:
-                            if self.verbose:
-                                print(f"  - omitiendo '{m}' (no implementado)")
-                            continue
-
-                    if self.verbose:
-                        print(f"  ✓ ejecutando {m}()")
-                    getattr(self, m)()
-
+        self._drive_pipeline(
+            phases,
+            strict=strict,
+            export_targets={
+                "write_separated_sql_files": export_sql_directory,
+                "write_parquet_snapshot": export_parquet_directory,
+            },
+            export_report_path=export_report_path,
+            checkpoint_directory=checkpoint_directory,
+            cache_directory=cache_directory,
+        )
         if self.verbose:
             print("[Pipeline] Ejecución completada.")
         return self
@@ -269,12 +319,15 @@ class DataGenerator:
         return df
 
     def generate_users(self) -> pd.DataFrame:
-        n = self.cfg.n_users
-        rows = []
-        for uid in range(1, n + 1):
-            rows.append((uid, _full_name(), _dt_between(self.cfg.start_date, self.cfg.end_date)))
-        df = pd.DataFrame(rows, columns=["UserId", "FullName", "CreatedAtUtc"])
-        df = df.astype({"UserId": int})
+        """
+        Genera usuarios en bloque (motor vectorizado): nombres y CreatedAtUtc
+        se muestrean como arreglos completos. CreatedAtUtc es datetime64[ms].
+        """
+        rng = self._table_rng("core.User")
+        df = users_frame(
+            rng, self.cfg.n_users, self.cfg.start_date, self.cfg.end_date,
+            _FIRST_NAMES, _LAST_NAMES
+        )
         self.df_user = df
         if self.verbose:
             print(f"  - core.[User]: {len(df)} usuarios")
@@ -318,44 +371,27 @@ class DataGenerator:
     def assign_user_roles(self) -> pd.DataFrame:
         """
         Asigna 1–3 roles por usuario respetando self.cfg.role_probs y evita duplicados (PK compuesta).
+        Todos los usuarios se muestrean en una sola operación matricial (Gumbel top-k).
         AsignacionUtc se distribuye entre CreatedAtUtc del usuario y end_date.
         Requiere: self.df_user, self.df_role.
         """
         assert self.df_user is not None and self.df_role is not None, "Faltan users/roles"
 
-        rng = np.random.default_rng(self.cfg.seed + 301)
-        role_names = list(self.cfg.role_probs.keys())
-        role_probs = np.array([self.cfg.role_probs[r] for r in role_names], dtype=float)
-        role_probs = role_probs / role_probs.sum()
-
+        rng = self._table_rng("core.UserRole")
+        # Mapa RoleName -> RoleId (columnas en orden alfabético de rol)
         role_id_by_name = dict(self.df_role[["Name", "RoleId"]].values)
-
-        rows = []
-        for uid, created_at in self.df_user[["UserId", "CreatedAtUtc"]].itertuples(index=False):
-            k_min, k_max = self.cfg.roles_per_user_range
-            k = rng.integers(k_min, k_max + 1)
-
-            chosen = []
-            available = role_names.copy()
-            probs = role_probs.copy()
-            for _ in range(k):
-                probs = probs / probs.sum()
-                pick_idx = rng.choice(len(available), p=probs)
-                chosen.append(available[pick_idx])
-                del available[pick_idx]
-                probs = np.delete(probs, pick_idx)
-                if len(available) == 0:
-                    break
-
-            if rng.random() > self.cfg.multi_role_prob:
-                chosen = chosen[:1]
-
-            for name in sorted(set(chosen)):
-                rid = role_id_by_name[name]
-                asign_at = _dt_between(created_at, self.cfg.end_date)
-                rows.append((uid, rid, asign_at))
-
-        df = pd.DataFrame(rows, columns=["UserId", "RoleId", "AsignacionUtc"]).drop_duplicates(["UserId", "RoleId"])
+        role_names = sorted(self.cfg.role_probs.keys())
+
+        df = user_roles_frame(
+            rng,
+            self.df_user["UserId"].to_numpy(),
+            self.df_user["CreatedAtUtc"],
+            self.cfg.end_date,
+            [role_id_by_name[r] for r in role_names],
+            [self.cfg.role_probs[r] for r in role_names],
+            self.cfg.roles_per_user_range,
+            self.cfg.multi_role_prob,
+        )
         self.df_userrole = df
         if self.verbose:
             by_user = df.groupby("UserId").size().mean()
@@ -364,58 +400,30 @@ class DataGenerator:
 
     def generate_user_emails(self) -> pd.DataFrame:
         """
-        Genera 1–2 emails por usuario (configurable), único globalmente.
+        Genera 1–2 emails por usuario (configurable), único globalmente por construcción
+        (contador por slug nombre.apellido, sin reintentos).
         Uno y solo uno IsPrimary=1 por usuario. VerifiedAtUtc ~85% si ACTIVE.
         Requiere: self.df_user, self.df_status (para dominios/estados).
         """
         assert self.df_user is not None and self.df_status is not None, "Faltan users/status"
 
-        rng = np.random.default_rng(self.cfg.seed + 302)
-        domains = self.cfg.email_domains
+        rng = self._table_rng("core.UserEmail")
         status_codes = [c for c in self.cfg.status_catalog["USER_EMAIL"]]
+        # Proporción razonable
         status_p = np.array([0.90 if c == "ACTIVE" else 0.10 for c in status_codes], dtype=float)
         status_p /= status_p.sum()
 
-        def make_email(fullname: str, tag: int) -> str:
-            parts = fullname.lower().replace("á", "a").replace("é", "e").replace("í", "i").replace("ó", "o").replace(
-                "ú", "u")
-            parts = re.sub(r"[^a-z\s]", "", parts)
-            first, *rest = parts.split()
-            last = rest[-1] if rest else "user"
-            return f"{first}.{last}{tag}@{rng.choice(domains)}"
-
-        rows = []
-        used = set()
-        email_id = 1
-        for uid, fullname, created_at in self.df_user[["UserId", "FullName", "CreatedAtUtc"]].itertuples(index=False):
-            nmin, nmax = self.cfg.emails_per_user_range
-            n = int(rng.integers(nmin, nmax + 1))
-            prim_index = int(rng.integers(0, n))
-
-            for i in range(n):
-                for attempt in range(100):
-                    email = make_email(fullname, tag=int(rng.integers(0, 10000)))
-                    if email not in used:
-                        used.add(email)
-                        break
-
-                added_at = _dt_between(created_at, self.cfg.end_date)
-                status = rng.choice(status_codes, p=status_p)
-                is_primary = 1 if i == prim_index else 0
-                verified_at = None
-                if status == "ACTIVE":
-                    p_verify = 0.85 + (0.08 if is_primary else 0.0)
-                    if rng.random() < min(p_verify, 0.98):
-                        verified_at = _dt_between(added_at, self.cfg.end_date)
-
-                rows.append((
-                    email_id, uid, email, is_primary, added_at, verified_at, status
-                ))
-                email_id += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "EmailId", "UserId", "Email", "IsPrimary", "AddedAtUtc", "VerifiedAtUtc", "StatusCode"
-        ])
+        df = user_emails_frame(
+            rng,
+            self.df_user["UserId"].to_numpy(),
+            self.df_user["FullName"],
+            self.df_user["CreatedAtUtc"],
+            self.cfg.end_date,
+            self.cfg.emails_per_user_range,
+            self.cfg.email_domains,
+            status_codes,
+            status_p,
+        )
         self.df_useremail = df
         if self.verbose:
             active_ratio = df["StatusCode"].eq("ACTIVE").mean()
@@ -429,7 +437,7 @@ class DataGenerator:
         """
         assert self.df_user is not None, "Faltan users"
 
-        rng = np.random.default_rng(self.cfg.seed + 303)
+        rng = self._table_rng("core.Wallet")
         rows = []
         wid = 1
         b_lo, b_hi = self.cfg.balance_eth_range
@@ -439,7 +447,7 @@ class DataGenerator:
             balance = float(rng.uniform(b_lo, b_hi))
             reserved_cap = min(balance, r_hi)
             reserved = float(rng.uniform(r_lo, reserved_cap))
-            updated_at = _dt_between(created_at, self.cfg.end_date)
+            updated_at = _dt_between(created_at, self.cfg.end_date, rng)
 
             rows.append((wid, uid, round(balance, 8), round(reserved, 8), updated_at))
             wid += 1
@@ -452,65 +460,44 @@ class DataGenerator:
 
     def generate_nfts(self) -> pd.DataFrame:
         """
-        Genera NFTs. ArtistId prioriza usuarios con rol ARTIST. CurrentOwnerId=ArtistId al crear.
+        Genera NFTs en bloque (motor columnar, shards sembrados de NFT_CHUNK_ROWS filas;
+        df_nft queda completo en memoria).
+        ArtistId prioriza usuarios con rol ARTIST. CurrentOwnerId=ArtistId al crear.
         StatusCode ~ {APPROVED,PENDING,REJECTED}. ApprovedAtUtc sólo si APPROVED.
+        HashCode: 64 hex desde un buffer aleatorio único; UNIQUE verificado sin set por fila.
         Requiere: self.df_user, self.df_userrole, self.df_role, self.df_status.
         """
         assert self.df_user is not None and self.df_status is not None, "Faltan users/status"
         assert self.df_userrole is not None and self.df_role is not None, "Faltan roles"
 
-        rng = np.random.default_rng(self.cfg.seed + 304)
+        # pool de artistas
+        role_artist_id = int(self.df_role.query("Name=='ARTIST'")["RoleId"].iloc[0]) if "ARTIST" in set(self.df_role["Name"]) else None
+        artist_users = self.df_userrole.loc[self.df_userrole["RoleId"] == role_artist_id, "UserId"].unique() if role_artist_id else np.array([], dtype=np.int64)
 
-        role_artist_id = int(self.df_role.query("Name=='ARTIST'")["RoleId"].iloc[0]) if "ARTIST" in set(
-            self.df_role["Name"]) else None
-        artist_users = set(
-            self.df_userrole.query("RoleId==@role_artist_id")["UserId"].tolist()) if role_artist_id else set()
+        if len(artist_users) == 0:
+            # fallback: todos los usuarios
+            artist_users = self.df_user["UserId"].to_numpy()
 
-        if not artist_users:
-            artist_users = set(self.df_user["UserId"].tolist())
-
-        users_df = self.df_user.set_index("UserId")
+        artist_users = np.sort(artist_users)
+        artist_created = self.df_user.set_index("UserId")["CreatedAtUtc"].reindex(artist_users)
 
+        # estados válidos para NFT
         nft_statuses = [c for c in self.cfg.status_catalog["NFT"] if c in {"PENDING", "APPROVED", "REJECTED"}]
         p_map = {"APPROVED": 0.75, "PENDING": 0.10, "REJECTED": 0.15}
         status_p = np.array([p_map[c] for c in nft_statuses], dtype=float)
         status_p /= status_p.sum()
 
-        def rand_hash64():
-            return "".join(rng.choice(list("0123456789abcdef"), size=64))
-
-        rows = []
-        nid = 1
-        for _ in range(self.cfg.n_nfts):
-            artist_id = int(rng.choice(list(artist_users)))
-            created_at = _dt_between(users_df.loc[artist_id, "CreatedAtUtc"], self.cfg.end_date)
-
-            name = f"Obra #{nid:04d}"
-            descr = f"Obra generada para dataset ArteCrypto (ID {nid})."
-            ctype = rng.choice(self.cfg.content_types)
-            hcode = rand_hash64()
-            fsize = int(rng.integers(60_000, 8_000_000))
-            w = int(rng.integers(512, 4096))
-            h = int(rng.integers(512, 4096))
-            sugg = float(rng.uniform(*self.cfg.suggested_price_eth_range))
-
-            status = rng.choice(nft_statuses, p=status_p)
-            approved_at = _dt_between(created_at, self.cfg.end_date) if status == "APPROVED" else None
-
-            row = (
-                int(nid), int(artist_id), 1, int(artist_id),
-                str(name), str(descr), str(ctype), str(hcode),
-                int(fsize), int(w), int(h), float(sugg),
-                str(status), created_at, approved_at
-            )
-            rows.append(cast(tuple[Any, ...], row))
-            nid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "NFTId", "ArtistId", "SettingsID", "CurrentOwnerId", "Name", "Description", "ContentType",
-            "HashCode", "FileSizeBytes", "WidthPx", "HeightPx", "SuggestedPriceETH",
-            "StatusCode", "CreatedAtUtc", "ApprovedAtUtc"
-        ])
+        df = nfts_frame(
+            lambda shard: self._table_rng("nft.NFT", shard),
+            self.cfg.n_nfts,
+            artist_users,
+            artist_created,
+            self.cfg.end_date,
+            self.cfg.content_types,
+            self.cfg.suggested_price_eth_range,
+            nft_statuses,
+            status_p,
+        )
         self.df_nft = df
         if self.verbose:
             dist = df["StatusCode"].value_counts(normalize=True).to_dict()
@@ -524,94 +511,59 @@ class DataGenerator:
     def generate_curation_reviews(self) -> pd.DataFrame:
         """
         Genera decisiones de curación para NFTs.
+        El curador se asigna round-robin como en nft.tr_NFT_InsertFlow
+        (curadores por UserId, NFTs por CreatedAtUtc), de forma vectorizada.
         Requiere: self.df_nft, self.df_role, self.df_user, self.df_userrole
         """
         assert self.df_nft is not None and self.df_role is not None and self.df_user is not None, "Faltan nft/role/user"
 
-        rng = np.random.default_rng(self.cfg.seed + 400)
-        role_curator_id = int(self.df_role.query("Name=='CURATOR'")["RoleId"].iloc[0]) if "CURATOR" in set(
-            self.df_role["Name"]) else None
-        curators = set()
+        rng = self._table_rng("admin.CurationReview")
+        # curadores disponibles
+        role_curator_id = int(self.df_role.query("Name=='CURATOR'")["RoleId"].iloc[0]) if "CURATOR" in set(self.df_role["Name"]) else None
+        curators = np.array([], dtype=np.int64)
         if role_curator_id is not None and self.df_userrole is not None:
-            curators = set(self.df_userrole.query("RoleId==@role_curator_id")["UserId"].tolist())
-        if not curators:
-            curators = set(self.df_user["UserId"].tolist())
-
-        curation_codes = ["PENDING", "APPROVED", "REJECTED"]
-        p = np.array([0.20, 0.60, 0.20])
-
-        rows = []
-        rid = 1
-        for nft_id, created_at, status in self.df_nft[["NFTId", "CreatedAtUtc", "StatusCode"]].itertuples(index=False):
-            curator = int(rng.choice(list(curators)))
-            started_at = _dt_between(created_at, self.cfg.end_date)
-
-            if status == "APPROVED":
-                decision = "APPROVED"
-                reviewed_at = _dt_between(started_at, self.cfg.end_date)
-            elif status == "REJECTED":
-                decision = "REJECTED"
-                reviewed_at = _dt_between(started_at, self.cfg.end_date)
-            else:
-                decision = str(rng.choice(curation_codes, p=p / p.sum()))
-                reviewed_at = _dt_between(started_at, self.cfg.end_date) if decision != "PENDING" else None
-
-            comment = f"Revisión automática - Decisión: {decision}"
-            rows.append((rid, int(nft_id), curator, decision, comment, started_at, reviewed_at))
-            rid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "ReviewId", "NFTId", "CuratorId", "DecisionCode", "Comment", "StartedAtUtc", "ReviewedAtUtc"
-        ])
+            curators = self.df_userrole.loc[self.df_userrole["RoleId"] == role_curator_id, "UserId"].unique()
+        if len(curators) == 0:
+            curators = self.df_user["UserId"].to_numpy()
+
+        # PENDING sortea decisión: PENDING (20%), APPROVED (60%), REJECTED (20%)
+        df = curation_frame(
+            rng,
+            self.df_nft["NFTId"].to_numpy(),
+            self.df_nft["CreatedAtUtc"],
+            self.df_nft["StatusCode"].to_numpy(dtype=object),
+            curators,
+            self.cfg.end_date,
+            pending_decision_p=(0.20, 0.60, 0.20),
+        )
         self.df_curation = df
         if self.verbose:
-            print(f"  - admin.CurationReview: {len(df)} filas")
+            load = df["CuratorId"].value_counts()
+            print(f"  - admin.CurationReview: {len(df)} filas ({len(load)} curadores, carga {load.min()}–{load.max()})")
         return df
 
     def generate_auctions(self) -> pd.DataFrame:
         """
-        Crea subastas para una fracción de NFTs aprobados.
+        Crea subastas para una fracción de NFTs aprobados (sin iterar por NFT).
         Requiere: self.df_nft, self.df_auction_settings
         """
         assert self.df_nft is not None and self.df_auction_settings is not None, "Faltan nft/auction_settings"
 
-        rng = np.random.default_rng(self.cfg.seed + 410)
-        nft_pool = self.df_nft.query("StatusCode=='APPROVED'").copy()
-        n_to_auction = int(round(len(nft_pool) * self.cfg.pct_nfts_in_auction))
-        chosen = rng.choice(nft_pool["NFTId"].to_numpy(), size=max(0, n_to_auction),
-                            replace=False) if n_to_auction > 0 else np.array([], dtype=int)
-
-        rows = []
-        aid = 1
+        rng = self._table_rng("auction.Auction")
         settings = self.df_auction_settings.iloc[0]
-        default_hours = int(settings["DefaultAuctionHours"])
-
-        nft_idx = self.df_nft.set_index("NFTId")
-
-        for nft_id in chosen:
-            nft_row = nft_idx.loc[int(nft_id)]
-            start_dt = nft_row["ApprovedAtUtc"] if pd.notna(nft_row["ApprovedAtUtc"]) else nft_row["CreatedAtUtc"]
-            start = _dt_between(start_dt, self.cfg.end_date)
-            end = start + timedelta(hours=default_hours)
-
-            if end > self.cfg.end_date:
-                status = "ACTIVE"
-            else:
-                status = rng.choice(["ACTIVE", "COMPLETED", "CANCELLED"], p=[0.10, 0.80, 0.10])
 
-            base_price = float(nft_row["SuggestedPriceETH"])
-            start_price = round(base_price * float(rng.uniform(0.8, 1.2)), 8)
-            current_price = start_price
-
-            rows.append((
-                aid, 1, int(nft_id), start, end, float(start_price), float(current_price), None, status
-            ))
-            aid += 1
-
-        df = pd.DataFrame(rows, columns=[
-            "AuctionId", "SettingsID", "NFTId", "StartAtUtc", "EndAtUtc", "StartingPriceETH", "CurrentPriceETH",
-            "CurrentLeaderId", "StatusCode"
-        ])
+        df = auctions_frame(
+            rng,
+            self.df_nft["NFTId"].to_numpy(),
+            self.df_nft["StatusCode"].to_numpy(dtype=object),
+            self.df_nft["CreatedAtUtc"],
+            self.df_nft["ApprovedAtUtc"],
+            self.df_nft["SuggestedPriceETH"].to_numpy(),
+            self.cfg.pct_nfts_in_auction,
+            self.cfg.end_date,
+            int(settings["DefaultAuctionHours"]),
+            settings_id=int(settings["SettingsID"]),
+        )
         self.df_auction = df
         if self.verbose:
             print(f"  - auction.Auction: {len(df)} filas")
@@ -619,65 +571,37 @@ class DataGenerator:
 
     def generate_bids(self) -> pd.DataFrame:
         """
-        Genera pujas para cada subasta basada en una Poisson(lambda).
+        Genera pujas para cada subasta basada en una Poisson(lambda), con un motor
+        de arreglos segmentados (sin bucles por subasta ni por puja).
         Requiere: self.df_auction, self.df_user, self.df_userrole
         """
         assert self.df_auction is not None and self.df_user is not None, "Faltan auction/user"
 
-        rng = np.random.default_rng(self.cfg.seed + 420)
-        bidders = None
-        if self.df_role is not None and self.df_userrole is not None:
-            try:
-                role_bidder_id = int(self.df_role.query("Name=='BIDDER'")["RoleId"].iloc[0])
-                bidders = list(self.df_userrole.query("RoleId==@role_bidder_id")["UserId"].unique())
-            except Exception:
-                bidders = None
-        if not bidders:
-            bidders = list(self.df_user["UserId"].tolist())
-
-        rows = []
-        bid_id = 1
-
-        nft_idx = self.df_nft.set_index("NFTId")
-
-        for auction_id, settings_id, nft_id, start_at, end_at, start_price, current_price, current_leader, status in self.df_auction.itertuples(
-                index=False):
-            if status == "CANCELLED":
-                continue
-
-            artist_id = int(nft_idx.loc[int(nft_id)]["ArtistId"])
-
-            lam = float(self.cfg.bids_per_auction_lambda)
-            n_bids = int(rng.poisson(lam))
-            if n_bids == 0 and status == "ACTIVE":
-                if rng.random() < 0.05:
-                    n_bids = 1
-
-            price = float(start_price)
-            if n_bids > 0:
-                times = sorted([start_at + timedelta(
-                    seconds=int(rng.integers(0, max(1, int((end_at - start_at).total_seconds()))))) for _ in
-                                range(n_bids)])
-                for t in times:
-                    candidate = int(rng.choice(bidders))
-                    attempts = 0
-                    while candidate == artist_id and attempts < 10:
-                        candidate = int(rng.choice(bidders))
-                        attempts += 1
-
-                    min_inc = max(0.00000001, price * 0.05)
-                    increment = float(rng.uniform(1.0, 3.0)) * min_inc
-                    bid_amount = round(price + increment, 8)
-
-                    rows.append((
-                        bid_id, int(auction_id), candidate, bid_amount, t
-                    ))
-                    bid_id += 1
-                    price = bid_amount
-
-        df = pd.DataFrame(rows, columns=[
-            "BidId", "AuctionId", "BidderId", "AmountETH", "PlacedAtUtc"
-        ])
+        # bidders preferidos
+        bidders = np.array([], dtype=np.int64)
+        if self.df_role is not None and self.df_userrole is not None and "BIDDER" in set(self.df_role["Name"]):
+            role_bidder_id = int(self.df_role.query("Name=='BIDDER'")["RoleId"].iloc[0])
+            bidders = self.df_userrole.loc[self.df_userrole["RoleId"] == role_bidder_id, "UserId"].unique()
+        if len(bidders) == 0:
+            bidders = self.df_user["UserId"].to_numpy()
+
+        # si estado CANCELLED -> 0 pujas
+        auctions = self.df_auction[self.df_auction["StatusCode"] != "CANCELLED"]
+        nft_pos = pd.Index(self.df_nft["NFTId"]).get_indexer(auctions["NFTId"])
+        artist_ids = self.df_nft["ArtistId"].to_numpy()[nft_pos]
+
+        df = bids_frame(
+            lambda shard: self._table_rng("auction.Bid", shard),
+            auctions["AuctionId"].to_numpy(),
+            artist_ids,
+            auctions["StartAtUtc"],
+            auctions["EndAtUtc"],
+            auctions["StartingPriceETH"].to_numpy(dtype=np.float64),
+            (auctions["StatusCode"] == "ACTIVE").to_numpy(),
+            np.sort(bidders),
+            float(self.cfg.bids_per_auction_lambda),
+            self.cfg.min_bid_increment_pct / 100.0,
+        )
         self.df_bid = df
         if self.verbose:
             print(f"  - auction.Bid: {len(df)} filas")
@@ -685,68 +609,44 @@ class DataGenerator:
 
     def settle_auctions_and_finance(self) -> pd.DataFrame:
         """
-        Resuelve subastas completadas: determina ganador, crea reservas y ledger
+        Resuelve subastas completadas: determina ganador, crea reservas y ledger.
+        El ganador de cada subasta se obtiene en una sola pasada sobre df_bid y las
+        actualizaciones (líder/precio, dueño del NFT) son una asignación indexada por tabla.
         Requiere: self.df_auction, self.df_bid, self.df_wallet, self.df_nft
         """
         assert self.df_auction is not None and self.df_nft is not None, "Faltan auction/nft"
 
-        bids_df = self.df_bid if self.df_bid is not None else pd.DataFrame(
-            columns=["BidId", "AuctionId", "BidderId", "AmountETH", "PlacedAtUtc"])
-
-        rng = np.random.default_rng(self.cfg.seed + 430)
-        rows_res = []
-        rows_ledger = []
-        res_id = 1
-        ledger_id = 1
-
-        nft_idx = self.df_nft.set_index("NFTId")
+        winners = winning_bids(self.df_bid)
+        auc_pos = pd.Index(self.df_auction["AuctionId"]).get_indexer(winners["AuctionId"])
 
         # Actualizar CurrentLeaderId y CurrentPriceETH en auctions
-        for aid in self.df_auction["AuctionId"]:
-            bids_for = bids_df.query("AuctionId==@aid")
-            if not bids_for.empty:
-                bids_sorted = bids_for.sort_values(["AmountETH", "PlacedAtUtc"], ascending=[False, True])
-                winner_row = bids_sorted.iloc[0]
-                self.df_auction.loc[self.df_auction.AuctionId == aid, "CurrentLeaderId"] = int(winner_row["BidderId"])
-                self.df_auction.loc[self.df_auction.AuctionId == aid, "CurrentPriceETH"] = float(
-                    winner_row["AmountETH"])
-
-        # Procesar subastas completadas
-        completed_auctions = self.df_auction.query("StatusCode=='COMPLETED'").copy()
-
-        for aid, row in completed_auctions.set_index("AuctionId").iterrows():
-            bids_for = bids_df.query("AuctionId==@aid")
-            if bids_for.empty:
-                continue
-
-            bids_sorted = bids_for.sort_values(["AmountETH", "PlacedAtUtc"], ascending=[False, True])
-            winner_row = bids_sorted.iloc[0]
-            winner_id = int(winner_row["BidderId"])
-            winning_amount = float(winner_row["AmountETH"])
-
-            # --- CORRECCIÓN APLICADA AQUÍ ---
-            rows_res.append((
-                res_id, int(aid), winner_id, round(winning_amount, 8), "CAPTURED", row["EndAtUtc"]
-            ))
-            res_id += 1
-            # --- FIN DE LA CORRECCIÓN ---
-
-            fee = round(winning_amount * 0.02, 8)
-            seller_amount = round(winning_amount - fee, 8)
-            nft_id = int(row["NFTId"])
-            seller_id = int(nft_idx.loc[nft_id]["ArtistId"])
-
-            rows_ledger.append((ledger_id, int(aid), winner_id, round(winning_amount, 8), "DEBIT", row["EndAtUtc"]))
-            ledger_id += 1
-            rows_ledger.append((ledger_id, int(aid), seller_id, round(seller_amount, 8), "CREDIT", row["EndAtUtc"]))
-            ledger_id += 1
-
-            self.df_nft.loc[self.df_nft.NFTId == nft_id, "CurrentOwnerId"] = winner_id
-
-        df_res = pd.DataFrame(rows_res, columns=["ReservationId", "AuctionId", "UserId", "AmountETH", "StateCode",
-                                                 "CreatedAtUtc"])
-        df_ledger = pd.DataFrame(rows_ledger,
-                                 columns=["EntryId", "AuctionId", "UserId", "AmountETH", "EntryType", "CreatedAtUtc"])
+        leader_col = self.df_auction["CurrentLeaderId"]
+        leader = leader_col.to_numpy(dtype=np.int64, na_value=0, copy=True)
+        leader_na = leader_col.isna().to_numpy(copy=True)
+        price = self.df_auction["CurrentPriceETH"].to_numpy(dtype=np.float64, copy=True)
+        leader[auc_pos] = winners["BidderId"].to_numpy()
+        leader_na[auc_pos] = False
+        price[auc_pos] = winners["AmountETH"].to_numpy()
+        self.df_auction["CurrentLeaderId"] = pd.arrays.IntegerArray(leader, leader_na)
+        self.df_auction["CurrentPriceETH"] = price
+
+        # Procesar subastas completadas (vendedor = artista del NFT)
+        nft_ids = self.df_auction["NFTId"].to_numpy()[auc_pos]
+        nft_pos = pd.Index(self.df_nft["NFTId"]).get_indexer(nft_ids)
+        auction_status = self.df_auction["StatusCode"].to_numpy(dtype=object)[auc_pos]
+        df_res, df_ledger = settlement_frames(
+            winners,
+            auction_status,
+            self.df_auction["EndAtUtc"].to_numpy()[auc_pos],
+            self.df_nft["ArtistId"].to_numpy()[nft_pos],
+            reservation_state="CAPTURED",
+        )
+
+        # actualizar owner del NFT
+        done = auction_status == "COMPLETED"
+        owner = self.df_nft["CurrentOwnerId"].to_numpy(copy=True)
+        owner[nft_pos[done]] = winners["BidderId"].to_numpy()[done]
+        self.df_nft["CurrentOwnerId"] = owner
 
         self.df_reservation = df_res
         self.df_ledger = df_ledger
@@ -762,43 +662,7 @@ class DataGenerator:
         """
         assert self.df_auction is not None, "Faltan auction"
 
-        rng = np.random.default_rng(self.cfg.seed + 440)
-        out_rows = []
-        eid = 1
-
-        prim_emails = {}
-        if self.df_useremail is not None:
-            prim_emails = self.df_useremail.query("IsPrimary==1").set_index("UserId")["Email"].to_dict()
-
-        nft_idx = self.df_nft.set_index("NFTId") if self.df_nft is not None else None
-
-        for _, auc in self.df_auction.iterrows():
-            nftid = int(auc["NFTId"])
-            if nft_idx is not None and nftid in nft_idx.index:
-                artist = int(nft_idx.loc[nftid]["ArtistId"])
-                to_email = prim_emails.get(artist, None)
-                if to_email:
-                    subj = f"Subasta creada para NFT #{nftid}"
-                    body = f"Tu NFT ha sido listado en subasta (Auction #{int(auc['AuctionId'])})."
-                    out_rows.append((eid, artist, to_email, subj, body, "PENDING"))
-                    eid += 1
-
-        if self.df_curation is not None:
-            for _, cur in self.df_curation.iterrows():
-                if cur["DecisionCode"] in ["APPROVED", "REJECTED"]:
-                    nftid = int(cur["NFTId"])
-                    if nft_idx is not None and nftid in nft_idx.index:
-                        artist = int(nft_idx.loc[nftid]["ArtistId"])
-                        to_email = prim_emails.get(artist, None)
-                        if to_email:
-                            decision = "aprobado" if cur["DecisionCode"] == "APPROVED" else "rechazado"
-                            subj = f"NFT #{nftid} {decision}"
-                            body = f"Tu NFT ha sido {decision} por el curador."
-                            out_rows.append((eid, artist, to_email, subj, body, "PENDING"))
-                            eid += 1
-
-        df = pd.DataFrame(out_rows,
-                          columns=["EmailId", "RecipientUserId", "RecipientEmail", "Subject", "Body", "StatusCode"])
+        df = email_outbox_frame(self.df_auction, self.df_curation, self.df_nft, self.df_useremail)
         self.df_email_outbox = df
         if self.verbose:
             print(f"  - audit.EmailOutbox: {len(df)} filas")
@@ -808,136 +672,176 @@ class DataGenerator:
     # FASE 5: Métodos de exportación (Implementación de la Fase 5)
     # ==========================
 
-    def _df_to_insert_sql(self, df: Optional[pd.DataFrame], schema_table: str) -> str:
-        """
-        Convierte un DataFrame en una cadena de INSERT T-SQL.
-        Maneja IDENTITY_INSERT, nulos, fechas y prefijos N''.
-        """
-        if df is None or df.empty:
-            return f"-- No data generated for {schema_table}\nGO\n"
-
+    @staticmethod
+    def _clean_schema_table(schema_table: str) -> str:
+        """'core.[User]' -> '[core].[User]', 'nft.NFT' -> '[nft].[NFT]'."""
         if '.' in schema_table:
             schema, table = schema_table.split('.')
             if table == '[User]':
                 clean_table = '[User]'
             else:
                 clean_table = f'[{table}]'
-            clean_schema_table = f'[{schema}].{clean_table}'
-        else:
-            clean_schema_table = f'[{schema_table}]'
+            return f'[{schema}].{clean_table}'
+        return f'[{schema_table}]'
+
+    def _iter_insert_sql(self, df: Optional[pd.DataFrame], schema_table: str,
+                         chunk_rows: Optional[int] = None,
+                         pool: Optional[ProcessPoolExecutor] = None,
+                         table_lock: Optional[bool] = None) -> Iterator[str]:
+        """
+        Igual que _df_to_insert_sql pero entrega el texto por lotes GO, formateando
+        `chunk_rows` filas a la vez (cfg.sql_chunk_rows, redondeado a lotes GO
+        completos), sin armar la tabla completa. Cada lote lleva
+        cfg.sql_inserts_per_batch INSERTs de cfg.sql_rows_per_insert filas (máx. 1000)
+        y su propio SET IDENTITY_INSERT ON/OFF. Con `pool` los bloques se formatean
+        en paralelo y se entregan en orden (mismo texto que en serie).
+        `table_lock` (por defecto cfg.fast_load) agrega WITH (TABLOCK) a los INSERT.
+        """
+        if df is None or df.empty:
+            yield f"-- No data generated for {schema_table}\nGO\n"
+            return
 
-        sql_lines = [f"-- Data for {clean_schema_table}"]
+        clean_schema_table = self._clean_schema_table(schema_table)
 
         cols = [f'[{c}]' for c in df.columns]
         cols_str = f"({', '.join(cols)})"
 
-        identity_cols = ['UserId', 'RoleId', 'EmailId', 'WalletId', 'NFTId',
-                         'ReviewId', 'AuctionId', 'BidId', 'ReservationId',
-                         'EntryId', 'StatusId', 'EmailId']
-
-        has_identity = any(c in df.columns for c in identity_cols if c in df.columns)
-
-        if has_identity:
-            sql_lines.append(f"SET IDENTITY_INSERT {clean_schema_table} ON;")
-
-        values = []
-        for _, row in df.iterrows():
-            row_vals = []
-            for col_name in df.columns:
-                val = row[col_name]
-                if pd.isna(val) or val is None:
-                    row_vals.append("NULL")
-                elif isinstance(val, (datetime, pd.Timestamp)):
-                    str_val = val.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                    row_vals.append(f"N'{str_val}'")
-                elif isinstance(val, str):
-                    str_val = str(val).replace("'", "''")
-                    row_vals.append(f"N'{str_val}'")
-                elif isinstance(val, bool):
-                    row_vals.append('1' if val else '0')
-                else:
-                    row_vals.append(str(val))
-            values.append(f"  ({', '.join(row_vals)})")
-
-        if not values:
-            if has_identity:
-                sql_lines.pop()
-            return f"-- No data generated for {clean_schema_table}\nGO\n"
-
-        sql_lines.append(f"INSERT INTO {clean_schema_table} {cols_str} VALUES")
-        sql_lines.append(',\n'.join(values) + ";")
-
-        if has_identity:
-            sql_lines.append(f"SET IDENTITY_INSERT {clean_schema_table} OFF;")
+        yield f"-- Data for {clean_schema_table}\n"
+
+        cfg = self.cfg
+        chunk_rows = aligned_chunk_rows(chunk_rows or cfg.sql_chunk_rows,
+                                        cfg.sql_rows_per_insert, cfg.sql_inserts_per_batch)
+        yield from iter_chunk_texts(
+            format_insert_batches, df, chunk_rows, pool, window=2 * cfg.export_workers,
+            target=clean_schema_table, cols_str=cols_str,
+            rows_per_insert=cfg.sql_rows_per_insert,
+            inserts_per_batch=cfg.sql_inserts_per_batch,
+            transaction=cfg.sql_batch_transaction,
+            identity=has_identity(schema_table, df.columns),
+            hint=FAST_LOAD_HINT if (cfg.fast_load if table_lock is None else table_lock) else None,
+        )
 
-        return '\n'.join(sql_lines) + '\nGO\n'
+    def _df_to_insert_sql(self, df: Optional[pd.DataFrame], schema_table: str) -> str:
+        """
+        Convierte un DataFrame en una cadena de INSERT T-SQL.
+        Maneja IDENTITY_INSERT, nulos, fechas y prefijos N''.
+        """
+        return "".join(self._iter_insert_sql(df, schema_table))
 
-    def generate_sql_for_initial_data(self):
-        """Genera SQL para catálogos y configuración."""
-        sql_parts = [
+    def _sql_initial_data_parts(self) -> List[_SqlPart]:
+        return [
             "/* FASE 1: DATOS INICIALES (Catálogos y Configuración) */",
-            "USE ArteCryptoAuctions;", "GO\n"
+            "USE ArteCryptoAuctions;", "GO\n",
+            (self.df_status, "ops.Status"),
+            (self.df_role, "core.Role"),
+            (self.df_nft_settings, "nft.NFTSettings"),
+            (self.df_auction_settings, "auction.AuctionSettings"),
         ]
-        sql_parts.append(self._df_to_insert_sql(self.df_status, "ops.Status"))
-        sql_parts.append(self._df_to_insert_sql(self.df_role, "core.Role"))
-        sql_parts.append(self._df_to_insert_sql(self.df_nft_settings, "nft.NFTSettings"))
-        sql_parts.append(self._df_to_insert_sql(self.df_auction_settings, "auction.AuctionSettings"))
-        self.sql_initial_data = "\n".join(sql_parts)
 
-    def generate_sql_for_entity_actors(self):
-        """Genera SQL para Usuarios, Wallets y sus roles/emails."""
-        sql_parts = [
+    def _sql_entity_actors_parts(self) -> List[_SqlPart]:
+        return [
             "/* FASE 2: ENTIDADES Y ACTORES (Usuarios, Wallets, Roles) */",
-            "USE ArteCryptoAuctions;", "GO\n"
+            "USE ArteCryptoAuctions;", "GO\n",
+            (self.df_user, "core.[User]"),
+            (self.df_userrole, "core.UserRole"),
+            (self.df_useremail, "core.UserEmail"),
+            (self.df_wallet, "core.Wallet"),
         ]
-        sql_parts.append(self._df_to_insert_sql(self.df_user, "core.[User]"))
-        sql_parts.append(self._df_to_insert_sql(self.df_userrole, "core.UserRole"))
-        sql_parts.append(self._df_to_insert_sql(self.df_useremail, "core.UserEmail"))
-        sql_parts.append(self._df_to_insert_sql(self.df_wallet, "core.Wallet"))
-        self.sql_entity_actors = "\n".join(sql_parts)
 
-    def generate_sql_for_process_simulation(self):
+    def _sql_process_simulation_parts(self) -> List[_SqlPart]:
         """
-        Genera SQL para la simulación (NFTs, Subastas, Finanzas).
-
         NOTA: Deshabilita el trigger 'tr_NFT_InsertFlow' durante la inserción de
         'nft.NFT' para permitir la inserción de estados simulados (APPROVED, REJECTED)
         sin que el trigger los fuerce a 'PENDING'.
         """
-        sql_parts = [
+        return [
             "/* FASE 3: SIMULACIÓN DE PROCESOS (NFTs, Subastas, Finanzas) */",
-            "USE ArteCryptoAuctions;", "GO\n"
+            "USE ArteCryptoAuctions;", "GO\n",
+            # --- Bloque de Inserción de NFT Modificado ---
+            "-- Deshabilitando triggers 'INSTEAD OF INSERT' para carga masiva de NFTs",
+            "DISABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;",
+            "GO",
+            # Inserta los datos de NFT (que ya tienen estados 'APPROVED', etc.)
+            (self.df_nft, "nft.NFT"),
+            "-- Rehabilitando triggers",
+            "ENABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;",
+            "GO\n",
+            # --- Fin del Bloque Modificado ---
+            # El resto de las inserciones no tienen triggers 'INSTEAD OF'
+            # por lo que pueden ejecutarse normalmente.
+            (self.df_curation, "admin.CurationReview"),
+            (self.df_auction, "auction.Auction"),
+            (self.df_bid, "auction.Bid"),
+            (self.df_reservation, "finance.FundsReservation"),
+            (self.df_ledger, "finance.Ledger"),
+            (self.df_email_outbox, "audit.EmailOutbox"),
         ]
 
-        # --- Bloque de Inserción de NFT Modificado ---
-        sql_parts.append("-- Deshabilitando triggers 'INSTEAD OF INSERT' para carga masiva de NFTs")
-        sql_parts.append("DISABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;")
-        sql_parts.append("GO")
+    def _sql_tables(self) -> List[Tuple[Optional[pd.DataFrame], str]]:
+        """(DataFrame, 'schema.Tabla') de los tres archivos, en orden de carga."""
+        parts = (self._sql_initial_data_parts() + self._sql_entity_actors_parts()
+                 + self._sql_process_simulation_parts())
+        return [p for p in parts if not isinstance(p, str)]
+
+    def _sql_fast_load_scripts(self) -> Dict[str, str]:
+        """
+        Scripts del perfil de carga rápida (cfg.fast_load): 'begin' antes de la
+        carga, 'end' después (reconstrucción de índices y triggers) y 'checks'.
+        """
+        tables = self._sql_tables()
+        keys = [table_key(schema_table) for _, schema_table in tables]
+        expected = {table_key(st): 0 if df is None else len(df) for df, st in tables}
+        return {
+            "begin": fast_load_prologue(keys),
+            "end": fast_load_epilogue(keys),
+            "checks": post_load_check_script(expected),
+        }
 
-        # Inserta los datos de NFT (que ya tienen estados 'APPROVED', etc.)
-        sql_parts.append(self._df_to_insert_sql(self.df_nft, "nft.NFT"))
+    def _iter_sql_parts(self, parts: List[_SqlPart],
+                        pool: Optional[ProcessPoolExecutor] = None) -> Iterator[str]:
+        """Texto de un archivo SQL por bloques; las partes se separan con salto de línea."""
+        for i, part in enumerate(parts):
+            if i:
+                yield "\n"
+            if isinstance(part, str):
+                yield part
+            else:
+                df, schema_table = part
+                yield from self._iter_insert_sql(df, schema_table, pool=pool)
 
-        sql_parts.append("-- Rehabilitando triggers")
-        sql_parts.append("ENABLE TRIGGER nft.tr_NFT_InsertFlow ON nft.NFT;")
-        sql_parts.append("GO\n")
-        # --- Fin del Bloque Modificado ---
+    def generate_sql_for_initial_data(self):
+        """Genera SQL para catálogos y configuración."""
+        self.sql_initial_data = "".join(self._iter_sql_parts(self._sql_initial_data_parts()))
 
-        # El resto de las inserciones no tienen triggers 'INSTEAD OF'
-        # por lo que pueden ejecutarse normalmente.
-        sql_parts.append(self._df_to_insert_sql(self.df_curation, "admin.CurationReview"))
-        sql_parts.append(self._df_to_insert_sql(self.df_auction, "auction.Auction"))
-        sql_parts.append(self._df_to_insert_sql(self.df_bid, "auction.Bid"))
-        sql_parts.append(self._df_to_insert_sql(self.df_reservation, "finance.FundsReservation"))
-        sql_parts.append(self._df_to_insert_sql(self.df_ledger, "finance.Ledger"))
-        sql_parts.append(self._df_to_insert_sql(self.df_email_outbox, "audit.EmailOutbox"))
+    def generate_sql_for_entity_actors(self):
+        """Genera SQL para Usuarios, Wallets y sus roles/emails."""
+        self.sql_entity_actors = "".join(self._iter_sql_parts(self._sql_entity_actors_parts()))
 
-        self.sql_process_simulation = "\n".join(sql_parts)
+    def generate_sql_for_process_simulation(self):
+        """
+        Genera SQL para la simulación (NFTs, Subastas, Finanzas).
+        Ver _sql_process_simulation_parts (deshabilita 'tr_NFT_InsertFlow' para nft.NFT).
+        """
+        self.sql_process_simulation = "".join(self._iter_sql_parts(self._sql_process_simulation_parts()))
 
-    def write_separated_sql_files(self, export_directory: str):
+    def write_separated_sql_files(self, export_directory: str) -> List[str]:
         """
-        Escribe las cadenas SQL generadas en archivos separados
-        en el directorio especificado.
+        Escribe los archivos SQL separados en el directorio especificado, en modo
+        streaming: cada tabla se formatea por bloques (cfg.sql_chunk_rows) y se
+        escribe directo al archivo, sin armar las cadenas completas en memoria.
+        Con cfg.export_workers > 1 los bloques se formatean en un pool de procesos;
+        con cfg.output_compression ('gzip'/'zstd') se comprime al escribir (.gz/.zst).
+        Con cfg.sql_shards > 1 escribe un archivo por shard (ver write_sharded_sql_files).
+        Con cfg.fast_load agrega 00_fast_load_begin.sql (deshabilita índices no
+        agrupados y triggers), 04_fast_load_end.sql (ALTER INDEX ... REBUILD y
+        ENABLE TRIGGER) y 05_post_load_checks.sql, y los INSERT usan WITH (TABLOCK).
+        La escritura a disco corre en un hilo aparte (cola de cfg.writer_queue_depth
+        bloques) mientras se formatea. Retorna las rutas de los archivos escritos.
         """
+        if self.cfg.sql_shards > 1:
+            manifest = self.write_sharded_sql_files(export_directory)
+            names = [name for stage in manifest["stages"] for name in stage["files"]] + ["shards_manifest.json"]
+            return [os.path.join(export_directory, name) for name in names]
 
         if not os.path.exists(export_directory):
             try:
@@ -947,30 +851,179 @@ class DataGenerator:
             except OSError as e:
                 if self.verbose:
                     print(f"  - ERROR: No se pudo crear el directorio {export_directory}: {e}")
-                return
+                return []
 
         files_to_write = {
-            "01_initial_data.sql": self.sql_initial_data,
-            "02_entity_actors.sql": self.sql_entity_actors,
-            "03_process_simulation.sql": self.sql_process_simulation
+            "01_initial_data.sql": self._sql_initial_data_parts(),
+            "02_entity_actors.sql": self._sql_entity_actors_parts(),
+            "03_process_simulation.sql": self._sql_process_simulation_parts()
         }
+        if self.cfg.fast_load:
+            fast = self._sql_fast_load_scripts()
+            use = ["USE ArteCryptoAuctions;", "GO\n"]
+            files_to_write = {
+                "00_fast_load_begin.sql": ["/* CARGA RÁPIDA: ANTES DE LA CARGA */", *use, fast["begin"]],
+                **files_to_write,
+                "04_fast_load_end.sql": ["/* CARGA RÁPIDA: DESPUÉS DE LA CARGA */", *use, fast["end"]],
+                "05_post_load_checks.sql": ["/* VERIFICACIÓN POSTERIOR A LA CARGA */", *use, fast["checks"]],
+            }
+
+        written: List[str] = []
+        with export_pool(self.cfg.export_workers) as pool:
+            for filename, parts in files_to_write.items():
+                full_path = os.path.join(export_directory, filename)
+
+                try:
+                    f, full_path = open_async_output(full_path, self.cfg.output_compression,
+                                                     self.cfg.output_compression_level,
+                                                     queue_depth=self.cfg.writer_queue_depth)
+                    with f:
+                        for text in self._iter_sql_parts(parts, pool):
+                            f.write(text)
+                    written.append(full_path)
+                    if self.verbose:
+                        print(f"  - Archivo SQL generado: {full_path} "
+                              f"({f.bytes_written / 1e6:.1f} MB, E/S {f.mb_per_s:.1f} MB/s)")
+                except IOError as e:
+                    if self.verbose:
+                        print(f"  - ERROR: No se pudo escribir el archivo {full_path}: {e}")
+        return written
 
-        for filename, content in files_to_write.items():
-            full_path = os.path.join(export_directory, filename)
-
-            if not content or content.strip() == "":
+    def write_sharded_sql_files(self, export_directory: str, shards: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Parte cada tabla con al menos cfg.sql_shard_min_rows filas en `shards`
+        archivos (cfg.sql_shards) por rangos contiguos de su ID, y escribe
+        shards_manifest.json con las etapas de carga: las etapas se ejecutan en
+        orden y los archivos de una misma etapa pueden correr en sesiones
+        paralelas. Las etapas salen de los niveles de FK (p.ej. todos los shards
+        de core.UserEmail y core.Wallet después de core.[User]); los triggers
+        INSTEAD OF INSERT se deshabilitan en una etapa previa y se rehabilitan
+        en una posterior. Con cfg.fast_load se agregan una etapa inicial y dos
+        finales (ver write_separated_sql_files); los shards no llevan TABLOCK
+        para no serializar las sesiones. Retorna el manifest.
+        """
+        cfg = self.cfg
+        shards = max(1, shards or cfg.sql_shards)
+        os.makedirs(export_directory, exist_ok=True)
+
+        tables = self._sql_tables()
+        levels = dependency_levels(schema_table for _, schema_table in tables)
+
+        written = [0, 0.0]  # bytes, segundos de E/S del hilo escritor
+
+        def write(filename: str, title: str, chunks) -> str:
+            f, full_path = open_async_output(os.path.join(export_directory, filename),
+                                             cfg.output_compression, cfg.output_compression_level,
+                                             queue_depth=cfg.writer_queue_depth)
+            with f:
+                f.write(f"/* {title} */\nUSE ArteCryptoAuctions;\nGO\n\n")
+                for text in chunks:
+                    f.write(text)
+            written[0] += f.bytes_written
+            written[1] += f.io_seconds
+            return os.path.basename(full_path)
+
+        table_meta: Dict[str, Any] = {}
+        stage_files: Dict[Tuple[int, int], List[str]] = {}  # (nivel, 0 pre / 1 carga / 2 post)
+        with export_pool(cfg.export_workers) as pool:
+            for df, schema_table in tables:
+                key = table_key(schema_table)
+                level = levels[key]
+                rows = 0 if df is None else len(df)
+                meta: Dict[str, Any] = {
+                    "level": level,
+                    "depends_on": [d for d in FK_DEPENDENCIES.get(key, []) if d in levels],
+                    "rows": rows,
+                    "files": [],
+                }
+                if df is None or rows < max(1, cfg.sql_shard_min_rows) or shards == 1:
+                    name = write(f"{key}.sql", f"{key} ({rows} filas)",
+                                 self._iter_insert_sql(df, schema_table, pool=pool))
+                    meta["files"].append({"file": name, "rows": rows})
+                else:
+                    id_col = shard_key_column(schema_table, df.columns)
+                    ids = df[id_col].to_numpy()
+                    if not (np.diff(ids) >= 0).all():
+                        df = df.sort_values(id_col, kind="stable")
+                        ids = df[id_col].to_numpy()
+                    meta["key"] = id_col
+                    slices = shard_slices(ids, shards)
+                    for k, (start, stop) in enumerate(slices, 1):
+                        lo, hi = int(ids[start]), int(ids[stop - 1])
+                        title = f"{key} — shard {k}/{len(slices)} ({id_col} {lo}..{hi})"
+                        # Sin TABLOCK: los shards de una tabla se cargan a la vez
+                        name = write(f"{key}.part{k:03d}.sql", title,
+                                     self._iter_insert_sql(df.iloc[start:stop], schema_table, pool=pool,
+                                                           table_lock=False))
+                        meta["files"].append({"file": name, "rows": stop - start,
+                                              "min_id": lo, "max_id": hi})
+                stage_files.setdefault((level, 1), []).extend(m["file"] for m in meta["files"])
+
+                trigger = INSTEAD_OF_INSERT_TRIGGERS.get(key)
+                if trigger and rows and not cfg.fast_load:
+                    off = write(f"{key}.disable_triggers.sql", f"{key}: antes de cargar sus archivos",
+                                [f"DISABLE TRIGGER {trigger} ON {key};\nGO\n"])
+                    on = write(f"{key}.enable_triggers.sql", f"{key}: después de cargar sus archivos",
+                               [f"ENABLE TRIGGER {trigger} ON {key};\nGO\n"])
+                    stage_files.setdefault((level, 0), []).append(off)
+                    stage_files.setdefault((level, 2), []).append(on)
+                    meta["triggers"] = {"disable": off, "enable": on}
+
+                table_meta[key] = meta
                 if self.verbose:
-                    print(f"  - skip {full_path} (no content generado)")
-                continue
+                    print(f"  - {key}: {len(meta['files'])} archivo(s), nivel {level}")
+
+        if cfg.fast_load:
+            # Antes del nivel 0 y después del último: índices/triggers y verificación
+            fast = self._sql_fast_load_scripts()
+            last = max(levels.values(), default=0) + 1
+            stage_files[(-1, 1)] = [write("fast_load_begin.sql", "Carga rápida: antes de la carga",
+                                          [fast["begin"]])]
+            stage_files[(last, 1)] = [write("fast_load_end.sql", "Carga rápida: después de la carga",
+                                            [fast["end"]])]
+            stage_files[(last, 2)] = [write("post_load_checks.sql", "Verificación posterior a la carga",
+                                            [fast["checks"]])]
+
+        stages = [{"stage": i, "level": level, "files": files}
+                  for i, ((level, _), files) in enumerate(sorted(stage_files.items()), 1)]
+        manifest = {
+            "format": "sql-shards",
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "shards": shards,
+            "shard_min_rows": cfg.sql_shard_min_rows,
+            "compression": cfg.output_compression,
+            "usage": ("Ejecutar las etapas en orden, cada una cuando terminó la anterior; "
+                      "los archivos de una misma etapa pueden cargarse en sesiones paralelas."),
+            "stages": stages,
+            "tables": table_meta,
+        }
+        manifest_path = os.path.join(export_directory, "shards_manifest.json")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        if self.verbose:
+            n_files = sum(len(s["files"]) for s in stages)
+            print(f"  - Manifest de shards: {manifest_path} ({len(stages)} etapas, {n_files} archivos)")
+            print(f"  - Escritura: {written[0] / 1e6:.1f} MB, E/S {written[1]:.2f} s "
+                  f"({written[0] / 1e6 / max(written[1], 1e-9):.1f} MB/s)")
+        return manifest
 
-            try:
-                with open(full_path, "w", encoding="utf-8") as f:
-                    f.write(content)
-                if self.verbose:
-                    print(f"  - Archivo SQL generado: {full_path}")
-            except IOError as e:
-                if self.verbose:
-                    print(f"  - ERROR: No se pudo escribir el archivo {full_path}: {e}")
+    def write_parquet_snapshot(self, directory: str, row_group_rows: int = SNAPSHOT_ROW_GROUP_ROWS) -> Dict:
+        """
+        Snapshot columnar de todos los df_*: un <nombre>.parquet por DataFrame
+        (grupos de `row_group_rows` filas, tipos compactos) y manifest.json con
+        conteos y la configuración. Requiere pyarrow.
+        Lectura: datagen_snapshot.read_parquet_snapshot(directory).
+        """
+        frames = {k[len("df_"):]: v for k, v in vars(self).items() if k.startswith("df_")}
+        manifest = write_parquet_snapshot(
+            frames, directory, config=config_to_dict(self.cfg), row_group_rows=row_group_rows,
+            compression=self.cfg.output_compression or "zstd",
+            compression_level=self.cfg.output_compression_level,
+        )
+        if self.verbose:
+            total = sum(t["rows"] for t in manifest["tables"].values())
+            print(f"  - Snapshot Parquet: {len(manifest['tables'])} tablas, {total} filas en {directory}")
+        return manifest
 
 
 # ===============================
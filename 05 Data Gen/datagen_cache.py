@@ -0,0 +1,298 @@
+"""
+Caché de datasets por contenido - ArteCryptoAuctions
+Guarda los df_* generados (Parquet sin pérdida) y los archivos exportados bajo
+una clave que es el hash de todo lo que los determina: la configuración
+completa de DataGenConfig (role_probs, status_catalog, rango de fechas, ...),
+los pasos ejecutados y la versión del código del generador. Una configuración
+ya generada (p.ej. seed=42, n_users=200 en CI) se carga en milisegundos en vez
+de regenerarse.
+
+Cada entrada lleva un entry.json con el SHA-256, el tamaño y el mtime de sus
+archivos. El SHA-256 se calcula al guardar. En cada acierto se comparan tamaño
+y mtime (sin releer los datos); con verify=True se recalcula además el SHA-256.
+Una entrada dañada se descarta y cuenta como fallo. El tamaño total se acota
+con expulsión LRU.
+
+Requiere pyarrow para las entradas de DataFrames (ver datagen_snapshot).
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from datagen_snapshot import (MANIFEST_FILE, config_to_dict, generation_config, read_parquet_tables, write_json,
+                              write_parquet_tables)
+
+ENTRY_FILE = "entry.json"
+DEFAULT_MAX_BYTES = 1 << 30
+CACHE_COMPRESSION = "zstd"
+CACHE_COMPRESSION_LEVEL = 1
+# Ajustes del propio caché: no cambian el dataset, no entran en la clave
+CACHE_FIELDS = frozenset({"cache_max_mb", "cache_verify"})
+
+
+# ===============================
+# Claves
+# ===============================
+
+@lru_cache(maxsize=None)
+def generator_version() -> str:
+    """Hash de las fuentes del generador (datagen*.py): cualquier cambio de código invalida el caché."""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "datagen*.py"))):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _digest(material: Dict[str, Any]) -> str:
+    # Sin sort_keys: el orden de role_probs/status_catalog puede cambiar los datos,
+    # así que dos órdenes distintos son claves distintas (fallo, nunca acierto falso)
+    text = json.dumps(material, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _key_material(generator: str, steps: Sequence[str]) -> Dict[str, Any]:
+    return {
+        "generator": generator,
+        "version": generator_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "steps": list(steps),
+    }
+
+
+def frames_key(cfg: Any, generator: str, steps: Sequence[str]) -> str:
+    """Clave de los df_* que producen `steps` (solo la configuración de generación)."""
+    return _digest({**_key_material(generator, steps), "config": generation_config(cfg)})
+
+
+def export_key(cfg: Any, generator: str, steps: Sequence[str], step: str, target: str) -> str:
+    """Clave de los archivos que escribe el exportador `step` (configuración completa y nombre de salida)."""
+    config = {k: v for k, v in config_to_dict(cfg).items() if k not in CACHE_FIELDS}
+    return _digest({**_key_material(generator, steps), "config": config,
+                    "export": step, "target": os.path.basename(os.path.normpath(target))})
+
+
+# ===============================
+# Archivos de una exportación
+# ===============================
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def written_files(result: Any, target: str) -> List[str]:
+    """
+    Archivos que reporta un exportador: la ruta (write_sql_file), la lista de
+    rutas (write_bulk_load_files, write_separated_sql_files) o el manifest de
+    write_parquet_snapshot (manifest.json y sus tablas dentro de `target`).
+    """
+    if isinstance(result, str):
+        return [result]
+    if isinstance(result, dict) and "tables" in result:
+        return [os.path.join(target, MANIFEST_FILE)] + [os.path.join(target, t["file"])
+                                                         for t in result["tables"].values()]
+    return list(result or ())
+
+
+# ===============================
+# Caché
+# ===============================
+
+class DatasetCache:
+    """
+    Directorio de entradas direccionadas por contenido (una carpeta por clave
+    con entry.json). Los aciertos comparan tamaño y mtime de cada archivo con
+    lo registrado (con `verify`, también el SHA-256) y renuevan la entrada para
+    la expulsión LRU; put_* escribe en una carpeta temporal que se renombra al
+    final, así que una entrada nunca queda a medias.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, verify: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.verify = verify
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _check_file(self, path: str, meta: Dict[str, Any]) -> bool:
+        """
+        Tamaño y mtime iguales a los registrados (con self.verify, también el
+        SHA-256). Si solo cambió el mtime (p.ej. el caché se copió), se decide
+        por el SHA-256 y, si coincide, se registra el mtime nuevo.
+        """
+        st = os.stat(path)
+        if st.st_size != meta["bytes"]:
+            return False
+        if st.st_mtime_ns == meta["mtime_ns"] and not self.verify:
+            return True
+        if _file_sha256(path) != meta["sha256"]:
+            return False
+        meta["mtime_ns"] = st.st_mtime_ns
+        return True
+
+    def _load_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """entry.json verificado (ver _check_file), o None; si está dañada la borra."""
+        entry_dir = self._entry_dir(key)
+        path = os.path.join(entry_dir, ENTRY_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            mtimes = {rel: meta["mtime_ns"] for rel, meta in entry["files"].items()}
+            ok = entry.get("key") == key and all(
+                self._check_file(os.path.join(entry_dir, rel), meta) for rel, meta in entry["files"].items()
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            ok = False
+        if not ok:
+            self.remove(key)
+            return None
+        if any(meta["mtime_ns"] != mtimes[rel] for rel, meta in entry["files"].items()):
+            write_json(path, entry)
+        else:
+            os.utime(path)  # uso reciente (LRU)
+        return entry
+
+    def _commit(self, key: str, tmp_dir: str, entry: Dict[str, Any]) -> bool:
+        """Completa entry.json de `tmp_dir`, lo publica como la entrada `key` y aplica el límite."""
+        files = {}
+        for root, _, names in os.walk(tmp_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                files[os.path.relpath(path, tmp_dir).replace(os.sep, "/")] = {
+                    "bytes": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": _file_sha256(path),
+                }
+        entry.update({
+            "key": key,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "bytes": sum(f["bytes"] for f in files.values()),
+            "files": files,
+        })
+        if entry["bytes"] > self.max_bytes:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        write_json(os.path.join(tmp_dir, ENTRY_FILE), entry)
+        self.remove(key)
+        try:
+            os.rename(tmp_dir, self._entry_dir(key))
+        except OSError:  # otro proceso publicó la misma clave a la vez
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict(keep=key)
+        return True
+
+    def _tmp_dir(self) -> str:
+        path = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(path)
+        return path
+
+    # ---- DataFrames ----
+
+    def get_frames(self, key: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """DataFrames de la entrada (nombre sin 'df_' -> DataFrame, dtypes originales), o None."""
+        entry = self._load_entry(key)
+        if entry is None or entry.get("kind") != "frames":
+            return None
+        return read_parquet_tables(self._entry_dir(key), entry["tables"], lossless=True)
+
+    def put_frames(self, key: str, frames: Dict[str, Optional[pd.DataFrame]], **meta: Any) -> bool:
+        """Guarda los DataFrames; False si la entrada sola supera max_bytes."""
+        tmp_dir = self._tmp_dir()
+        tables = write_parquet_tables(frames, tmp_dir, compression=CACHE_COMPRESSION,
+                                      compression_level=CACHE_COMPRESSION_LEVEL, lossless=True)
+        return self._commit(key, tmp_dir, {"kind": "frames", "tables": tables, **meta})
+
+    # ---- Archivos exportados ----
+
+    def restore_files(self, key: str, target: str) -> Optional[List[str]]:
+        """Copia los archivos de la entrada a `target` (archivo o directorio); rutas escritas, o None."""
+        entry = self._load_entry(key)
+        if entry is None or entry.get("kind") != "files":
+            return None
+        base = target if entry["target_is_dir"] else (os.path.dirname(target) or ".")
+        written = []
+        for rel in entry["files"]:
+            dest = os.path.join(base, *rel.split("/"))
+            os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+            shutil.copyfile(os.path.join(self._entry_dir(key), rel), dest)
+            written.append(dest)
+        return written
+
+    def put_files(self, key: str, target: str, files: Sequence[str], **meta: Any) -> bool:
+        """
+        Guarda `files` (los que reportó el exportador, ver written_files) con su
+        ruta relativa a `target` (o a su carpeta si es un archivo). False si
+        alguno queda fuera de esa carpeta o la entrada supera max_bytes.
+        """
+        is_dir = os.path.isdir(target)
+        base = os.path.abspath(target if is_dir else (os.path.dirname(target) or "."))
+        rels = [os.path.relpath(os.path.abspath(path), base) for path in files]
+        if not rels or any(rel.startswith(os.pardir) or os.path.isabs(rel) for rel in rels):
+            return False
+        tmp_dir = self._tmp_dir()
+        for path, rel in zip(files, rels):
+            dest = os.path.join(tmp_dir, rel)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(path, dest)
+        return self._commit(key, tmp_dir, {"kind": "files", "target_is_dir": is_dir, **meta})
+
+    # ---- Mantenimiento ----
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """(clave, bytes, último uso) de cada entrada, de la más antigua a la más reciente."""
+        out = []
+        for key in os.listdir(self.directory):
+            path = os.path.join(self.directory, key, ENTRY_FILE)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    size = json.load(f)["bytes"]
+                out.append((key, size, os.path.getmtime(path)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return sorted(out, key=lambda e: e[2])
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Borra las entradas usadas hace más tiempo hasta quedar en max_bytes; retorna las claves borradas."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            total -= size
+            removed.append(key)
+        return removed
+
+    def remove(self, key: str) -> None:
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        for key in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
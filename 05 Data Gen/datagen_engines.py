@@ -0,0 +1,756 @@
+"""
+Motores vectorizados (NumPy/pandas) compartidos por datagen.py y datagen_2.py.
+
+Cada motor recibe un Generator de NumPy y parámetros primitivos, y devuelve
+arreglos o DataFrames completos en lugar de construir una tupla por fila.
+"""
+
+from __future__ import annotations
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Flujos aleatorios por tabla
+# ===============================
+
+def table_rng(seed: int, table: str, shard: Optional[int] = None) -> np.random.Generator:
+    """
+    Flujo independiente para una tabla (y opcionalmente un shard dentro de ella).
+
+    La clave del SeedSequence se deriva del nombre de la tabla (crc32), no del
+    orden de creación, así que las tablas pueden generarse en cualquier orden o
+    en paralelo y producir exactamente los mismos datos.
+    """
+    key = (zlib.crc32(table.encode("utf-8")),)
+    if shard is not None:
+        key += (int(shard),)
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+# ===============================
+# Utilidades de fechas
+# ===============================
+
+DateLike = Union[datetime, pd.Timestamp, np.datetime64, np.ndarray, pd.Series]
+
+
+def _as_ms(value: DateLike) -> np.ndarray:
+    """Convierte un escalar/arreglo de fechas a datetime64[ms]."""
+    if isinstance(value, pd.Series):
+        return value.to_numpy(dtype="datetime64[ms]")
+    return np.asarray(value, dtype="datetime64[ms]")
+
+
+def sample_datetimes(
+    rng: np.random.Generator,
+    start: DateLike,
+    end: DateLike,
+    size: int,
+) -> np.ndarray:
+    """
+    Versión vectorizada de `_dt_between`: un instante uniforme (resolución de
+    segundos) en [start, end) por elemento. `start`/`end` pueden ser escalares
+    o arreglos de longitud `size`. Retorna datetime64[ms].
+    """
+    start_ms = _as_ms(start)
+    end_ms = _as_ms(end)
+    span_s = (end_ms - start_ms).astype("timedelta64[s]").astype(np.int64)
+    span_s = np.maximum(span_s, 1)
+    offsets_s = rng.integers(0, span_s, size=size, dtype=np.int64)
+    return start_ms + offsets_s.astype("timedelta64[s]")
+
+
+# ===============================
+# core.[User]
+# ===============================
+
+def users_frame(
+    rng: np.random.Generator,
+    n: int,
+    start: datetime,
+    end: datetime,
+    first_names: Sequence[str],
+    last_names: Sequence[str],
+) -> pd.DataFrame:
+    """
+    Genera `n` usuarios en bloque: índices de nombre y offsets de CreatedAtUtc
+    se muestrean con una llamada a NumPy cada uno.
+    Columnas: UserId, FullName, CreatedAtUtc (datetime64[ms]).
+    """
+    n_last = len(last_names)
+    # Las combinaciones nombre×apellido se formatean una sola vez
+    full_names = np.array([f"{f} {l}" for f in first_names for l in last_names], dtype=object)
+    first_idx = rng.integers(0, len(first_names), size=n)
+    last_idx = rng.integers(0, n_last, size=n)
+
+    return pd.DataFrame({
+        "UserId": np.arange(1, n + 1, dtype=np.int64),
+        "FullName": full_names[first_idx * n_last + last_idx],
+        "CreatedAtUtc": sample_datetimes(rng, start, end, n),
+    })
+
+
+# ===============================
+# core.UserRole
+# ===============================
+
+def user_roles_frame(
+    rng: np.random.Generator,
+    user_ids: np.ndarray,
+    created_at: DateLike,
+    end: datetime,
+    role_ids: Sequence[int],
+    role_probs: Sequence[float],
+    roles_per_user_range: Tuple[int, int],
+    multi_role_prob: float,
+) -> pd.DataFrame:
+    """
+    Muestreo ponderado sin reemplazo de roles para todos los usuarios a la vez
+    (Gumbel top-k sobre una matriz usuarios×roles).
+
+    Sumar ruido Gumbel a log(p) y quedarse con las k llaves mayores equivale a
+    escoger k roles uno por uno renormalizando las probabilidades. El rango
+    de roles por usuario y el truncado a 1 rol (prob. 1 - multi_role_prob) se
+    aplican como máscaras sobre el ranking. Cada celda (usuario, rol) produce
+    a lo sumo una fila, así que la PK compuesta se respeta por construcción.
+    Las filas salen ordenadas por usuario y luego por el orden de `role_ids`.
+    """
+    user_ids = np.asarray(user_ids)
+    n, n_roles = len(user_ids), len(role_ids)
+    probs = np.asarray(role_probs, dtype=np.float64)
+    probs = probs / probs.sum()
+
+    with np.errstate(divide="ignore"):
+        log_p = np.log(probs).astype(np.float32)
+    u = np.maximum(rng.random((n, n_roles), dtype=np.float32), np.finfo(np.float32).tiny)
+    keys = log_p - np.log(-np.log(u))
+    # rank[i, j] = posición del rol j en el orden de selección del usuario i
+    # (con pocos roles, R comparaciones vectorizadas son más baratas que argsort).
+    # Dos llaves float32 pueden empatar (mismo u con igual probabilidad): el empate
+    # se rompe por columna, así cada fila de rank es una permutación de 0..R-1
+    rank = np.zeros((n, n_roles), dtype=np.int16)
+    columns = np.arange(n_roles)
+    for j in range(n_roles):
+        rank += (keys[:, j:j + 1] > keys) | ((keys[:, j:j + 1] == keys) & (j < columns))
+
+    k_min, k_max = roles_per_user_range
+    k = rng.integers(k_min, k_max + 1, size=n)
+    single = rng.random(n) > multi_role_prob
+    k = np.where(single, np.minimum(k, 1), k)
+
+    mask = (rank < k[:, None]) & (probs > 0)[None, :]
+    user_idx, role_idx = np.nonzero(mask)
+
+    created_ms = _as_ms(created_at)
+    return pd.DataFrame({
+        "UserId": user_ids[user_idx],
+        "RoleId": np.asarray(role_ids, dtype=np.int64)[role_idx],
+        "AsignacionUtc": sample_datetimes(rng, created_ms[user_idx], end, len(user_idx)),
+    })
+
+
+# ===============================
+# core.UserEmail
+# ===============================
+
+def _email_slug(fullname: str) -> str:
+    """'José Pérez' -> 'jose.perez' (misma normalización que el generador escalar)."""
+    parts = fullname.lower().replace("á","a").replace("é","e").replace("í","i").replace("ó","o").replace("ú","u")
+    parts = re.sub(r"[^a-z\s]", "", parts)
+    first, *rest = parts.split()
+    last = rest[-1] if rest else "user"
+    return f"{first}.{last}"
+
+
+def user_emails_frame(
+    rng: np.random.Generator,
+    user_ids: np.ndarray,
+    full_names: Union[np.ndarray, pd.Series],
+    created_at: DateLike,
+    end: datetime,
+    emails_per_user_range: Tuple[int, int],
+    domains: Sequence[str],
+    status_codes: Sequence[str],
+    status_p: np.ndarray,
+    p_verify: float = 0.85,
+) -> pd.DataFrame:
+    """
+    Genera los emails de todos los usuarios como arreglos completos.
+
+    El slug 'nombre.apellido' se normaliza una sola vez por nombre distinto.
+    La unicidad (core.UserEmail.Email es UNIQUE) se garantiza por construcción:
+    dentro de cada slug, las filas se barajan y reciben etiquetas 0..m-1, así
+    que no hay reintentos ni conjunto de emails usados.
+    """
+    user_ids = np.asarray(user_ids)
+    n_users = len(user_ids)
+
+    nmin, nmax = emails_per_user_range
+    per_user = rng.integers(nmin, nmax + 1, size=n_users)
+    prim_index = rng.integers(0, np.maximum(per_user, 1))
+    total = int(per_user.sum())
+
+    user_idx = np.repeat(np.arange(n_users), per_user)
+    first_row = np.cumsum(per_user) - per_user
+    pos_in_user = np.arange(total) - first_row[user_idx]
+    is_primary = (pos_in_user == prim_index[user_idx]).astype(np.int64)
+
+    # Slugs: uno por nombre distinto; nombres distintos con el mismo slug comparten contador
+    name_codes, distinct_names = pd.factorize(np.asarray(full_names, dtype=object), sort=False)
+    slug_of_name, distinct_slugs = pd.factorize(
+        np.array([_email_slug(n) for n in distinct_names], dtype=object), sort=False
+    )
+    slug_codes = slug_of_name[name_codes][user_idx].astype(np.int64)
+
+    # Etiqueta = posición (aleatoria) de la fila dentro de su slug → biyectiva por slug
+    order = np.argsort((slug_codes << 32) | rng.integers(0, 2**32, size=total, dtype=np.int64))
+    sorted_slugs = slug_codes[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_slugs[1:] != sorted_slugs[:-1]])
+    group_len = np.diff(np.r_[group_start, total])
+    tags = np.empty(total, dtype=np.int64)
+    tags[order] = np.arange(total) - np.repeat(group_start, group_len)
+
+    domain_idx = rng.integers(0, len(domains), size=total)
+    local = np.asarray(distinct_slugs, dtype=object)[slug_codes]
+    domain = np.asarray(domains, dtype=object)[domain_idx]
+    email = np.array(
+        [f"{l}{t}@{d}" for l, t, d in zip(local.tolist(), tags.tolist(), domain.tolist())],
+        dtype=object,
+    )
+
+    added_at = sample_datetimes(rng, _as_ms(created_at)[user_idx], end, total)
+    status_idx = rng.choice(len(status_codes), size=total, p=status_p)
+    status = np.asarray(status_codes, dtype=object)[status_idx]
+    # 85% verificados si ACTIVE; si primario, ligeramente más probable
+    p_row = np.minimum(p_verify + 0.08 * is_primary, 0.98)
+    is_active = np.isin(status_idx, [i for i, c in enumerate(status_codes) if c == "ACTIVE"])
+    verified = is_active & (rng.random(total) < p_row)
+    verified_at = sample_datetimes(rng, added_at, end, total)
+    verified_at[~verified] = np.datetime64("NaT")
+
+    return pd.DataFrame({
+        "EmailId": np.arange(1, total + 1, dtype=np.int64),
+        "UserId": user_ids[user_idx],
+        "Email": email,
+        "IsPrimary": is_primary,
+        "AddedAtUtc": added_at,
+        "VerifiedAtUtc": verified_at,
+        "StatusCode": status,
+    })
+
+
+# ===============================
+# nft.NFT
+# ===============================
+
+NFT_CHUNK_ROWS = 1_000_000
+
+NFT_COLUMNS = [
+    "NFTId","ArtistId","SettingsID","CurrentOwnerId","Name","Description","ContentType",
+    "HashCode","FileSizeBytes","WidthPx","HeightPx","SuggestedPriceETH",
+    "StatusCode","CreatedAtUtc","ApprovedAtUtc"
+]
+
+
+def _hex_hashes(rng: np.random.Generator, n: int) -> Tuple[List[str], np.ndarray]:
+    """
+    `n` códigos hex de 64 caracteres a partir de un solo buffer aleatorio
+    (32 bytes por código) codificado en hex de una pasada.
+    Retorna (códigos, prefijo uint64 de cada código) para verificar unicidad.
+    """
+    raw = rng.bytes(32 * n)
+    hex_buf = raw.hex()
+    codes = [hex_buf[i:i + 64] for i in range(0, 64 * n, 64)]
+    prefixes = np.frombuffer(raw, dtype=">u8")[::4].astype(np.uint64)
+    return codes, prefixes
+
+
+def _duplicated_hashes(codes: np.ndarray, prefixes: np.ndarray) -> np.ndarray:
+    """
+    Posiciones con HashCode repetido (a partir de la 2da aparición), sin set por fila:
+    se ordenan los prefijos de 64 bits y sólo los prefijos repetidos se comparan completos
+    (`codes` se lee únicamente en esas posiciones).
+    """
+    order = np.argsort(prefixes, kind="stable")
+    sorted_p = prefixes[order]
+    same = sorted_p[1:] == sorted_p[:-1]
+    if not same.any():
+        return np.array([], dtype=np.int64)
+    cand = np.unique(np.r_[order[1:][same], order[:-1][same]])
+    cand_codes = pd.Series(codes[cand], index=cand)
+    return cand_codes.index[cand_codes.duplicated()].to_numpy(dtype=np.int64)
+
+
+def nft_chunks(
+    rng_for_shard: Callable[[int], np.random.Generator],
+    n: int,
+    artist_ids: np.ndarray,
+    artist_created_at: DateLike,
+    end: datetime,
+    content_types: Sequence[str],
+    price_range: Tuple[float, float],
+    status_codes: Sequence[str],
+    status_p: np.ndarray,
+    chunk_rows: int = NFT_CHUNK_ROWS,
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Genera NFTs por bloques de `chunk_rows` filas; el bloque i usa el flujo
+    `rng_for_shard(i)`, así el resultado sólo depende de la semilla (no del
+    tamaño de bloque de otra corrida) y los arreglos intermedios de cada bloque
+    (buffer aleatorio, hex) no crecen con n. Cada bloque se entrega como
+    (DataFrame, prefijos de HashCode).
+    """
+    artist_ids = np.asarray(artist_ids)
+    artist_created = _as_ms(artist_created_at)
+    ctypes = np.asarray(content_types, dtype=object)
+    statuses = np.asarray(status_codes, dtype=object)
+    approved_idx = [i for i, c in enumerate(status_codes) if c == "APPROVED"]
+
+    for shard, first_id in enumerate(range(1, n + 1, chunk_rows)):
+        rng = rng_for_shard(shard)
+        m = min(chunk_rows, n + 1 - first_id)
+        ids = np.arange(first_id, first_id + m, dtype=np.int64)
+
+        pick = rng.integers(0, len(artist_ids), size=m)
+        artist = artist_ids[pick]
+        created_at = sample_datetimes(rng, artist_created[pick], end, m)
+        hcodes, prefixes = _hex_hashes(rng, m)
+        status_idx = rng.choice(len(statuses), size=m, p=status_p)
+        approved_at = sample_datetimes(rng, created_at, end, m)
+        approved_at[~np.isin(status_idx, approved_idx)] = np.datetime64("NaT")
+
+        id_list = ids.tolist()
+        df = pd.DataFrame({
+            "NFTId": ids,
+            "ArtistId": artist,
+            "SettingsID": np.ones(m, dtype=np.int64),
+            "CurrentOwnerId": artist,
+            "Name": [f"Obra #{i:04d}" for i in id_list],
+            "Description": [f"Obra generada para dataset ArteCrypto (ID {i})." for i in id_list],
+            "ContentType": ctypes[rng.integers(0, len(ctypes), size=m)],
+            "HashCode": hcodes,
+            "FileSizeBytes": rng.integers(60_000, 8_000_000, size=m),  # 60KB–8MB
+            "WidthPx": rng.integers(512, 4096, size=m),
+            "HeightPx": rng.integers(512, 4096, size=m),
+            "SuggestedPriceETH": rng.uniform(*price_range, size=m),
+            "StatusCode": statuses[status_idx],
+            "CreatedAtUtc": created_at,
+            "ApprovedAtUtc": approved_at,
+        })
+        yield df, prefixes
+
+
+def nfts_frame(
+    rng_for_shard: Callable[[int], np.random.Generator],
+    n: int,
+    *args,
+    chunk_rows: int = NFT_CHUNK_ROWS,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Materializa todos los bloques de `nft_chunks` y garantiza HashCode UNIQUE:
+    las (improbables) colisiones se regeneran con un flujo extra. La unicidad se
+    verifica sobre los prefijos de 64 bits de los digests (8 B por fila) y sólo
+    se leen o reescriben las filas en colisión.
+    El resultado es la tabla completa en memoria, ~390 B por fila (HashCode,
+    Name y Description son str de Python; HashCode sola ~120 B): unos 20 GB
+    para 50M NFTs. Los bloques acotan los intermedios de la generación, no
+    df_nft, que el resto del pipeline necesita completo.
+    """
+    chunks, prefixes = [], []
+    for df, pref in nft_chunks(rng_for_shard, n, *args, chunk_rows=chunk_rows, **kwargs):
+        chunks.append(df)
+        prefixes.append(pref)
+    if not chunks:
+        return pd.DataFrame(columns=NFT_COLUMNS)
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    del chunks
+    all_prefixes = np.concatenate(prefixes)
+    retry_shard = -(-n // chunk_rows)
+    dups = _duplicated_hashes(df["HashCode"].to_numpy(), all_prefixes)
+    while len(dups):
+        new_codes, new_prefixes = _hex_hashes(rng_for_shard(retry_shard), len(dups))
+        df.loc[dups, "HashCode"] = new_codes
+        all_prefixes[dups] = new_prefixes
+        retry_shard += 1
+        dups = _duplicated_hashes(df["HashCode"].to_numpy(), all_prefixes)
+    return df
+
+
+# ===============================
+# admin.CurationReview
+# ===============================
+
+def round_robin_curators(
+    curator_ids: np.ndarray,
+    created_at: DateLike,
+    start_pos: int = 0,
+) -> np.ndarray:
+    """
+    Réplica vectorizada de la asignación de nft.tr_NFT_InsertFlow:
+    curadores ordenados por UserId y NFTs recorridos por CreatedAtUtc
+    (empates por orden de llegada); el NFT en la posición r recibe el curador
+    ((start_pos + r) % n_curadores), igual que CURATION_RR_POS en ops.Settings.
+    """
+    curators = np.sort(np.asarray(curator_ids))
+    created_ms = _as_ms(created_at)
+    rank = np.empty(len(created_ms), dtype=np.int64)
+    rank[np.argsort(created_ms, kind="stable")] = np.arange(len(created_ms))
+    return curators[(start_pos + rank) % len(curators)]
+
+
+def curation_frame(
+    rng: np.random.Generator,
+    nft_ids: np.ndarray,
+    created_at: DateLike,
+    nft_status: np.ndarray,
+    curator_ids: np.ndarray,
+    end: datetime,
+    pending_decision_p: Sequence[float] = (0.20, 0.60, 0.20),
+) -> pd.DataFrame:
+    """
+    Una revisión por NFT. Curador por round-robin (ver `round_robin_curators`);
+    APPROVED/REJECTED heredan la decisión del NFT y los PENDING sortean
+    PENDING/APPROVED/REJECTED con `pending_decision_p`.
+    ReviewedAtUtc sólo si la decisión no es PENDING.
+    """
+    nft_ids = np.asarray(nft_ids)
+    nft_status = np.asarray(nft_status, dtype=object)
+    n = len(nft_ids)
+    codes = np.array(["PENDING", "APPROVED", "REJECTED"], dtype=object)
+
+    decision_idx = rng.choice(len(codes), size=n, p=np.asarray(pending_decision_p) / np.sum(pending_decision_p))
+    decision_idx[nft_status == "APPROVED"] = 1
+    decision_idx[nft_status == "REJECTED"] = 2
+
+    started_at = sample_datetimes(rng, created_at, end, n)
+    reviewed_at = sample_datetimes(rng, started_at, end, n)
+    reviewed_at[decision_idx == 0] = np.datetime64("NaT")
+
+    comments = np.array([f"Revisión automática - Decisión: {c}" for c in codes], dtype=object)
+    return pd.DataFrame({
+        "ReviewId": np.arange(1, n + 1, dtype=np.int64),
+        "NFTId": nft_ids,
+        "CuratorId": round_robin_curators(curator_ids, created_at),
+        "DecisionCode": codes[decision_idx],
+        "Comment": comments[decision_idx],
+        "StartedAtUtc": started_at,
+        "ReviewedAtUtc": reviewed_at,
+    })
+
+
+# ===============================
+# auction.Auction
+# ===============================
+
+def auctions_frame(
+    rng: np.random.Generator,
+    nft_ids: np.ndarray,
+    nft_status: np.ndarray,
+    created_at: DateLike,
+    approved_at: DateLike,
+    suggested_price: np.ndarray,
+    pct_in_auction: float,
+    end: datetime,
+    auction_hours: int,
+    settings_id: int = 1,
+) -> pd.DataFrame:
+    """
+    Subastas para una fracción de NFTs APPROVED, construidas con arreglos
+    posicionales tomados una sola vez de df_nft.
+    StartAtUtc ~ U[ApprovedAtUtc (o CreatedAtUtc si es NaT), end); EndAtUtc = Start + horas.
+    Si EndAtUtc > end la subasta sigue ACTIVE; si no, ACTIVE/COMPLETED/CANCELLED (10/80/10%).
+    """
+    nft_ids = np.asarray(nft_ids)
+    pool = np.flatnonzero(np.asarray(nft_status, dtype=object) == "APPROVED")
+    n = int(round(len(pool) * pct_in_auction))
+    chosen = rng.choice(pool, size=n, replace=False) if n > 0 else np.array([], dtype=np.int64)
+
+    approved_ms = _as_ms(approved_at)[chosen]
+    base = np.where(np.isnat(approved_ms), _as_ms(created_at)[chosen], approved_ms)
+    start_at = sample_datetimes(rng, base, end, n)
+    end_at = start_at + np.timedelta64(int(auction_hours), "h")
+
+    codes = np.array(["ACTIVE", "COMPLETED", "CANCELLED"], dtype=object)
+    status_idx = rng.choice(len(codes), size=n, p=[0.10, 0.80, 0.10])
+    status_idx[end_at > _as_ms(end)] = 0
+
+    start_price = np.round(
+        np.asarray(suggested_price, dtype=np.float64)[chosen] * rng.uniform(0.8, 1.2, size=n), 8
+    )
+    return pd.DataFrame({
+        "AuctionId": np.arange(1, n + 1, dtype=np.int64),
+        "SettingsID": np.full(n, settings_id, dtype=np.int64),
+        "NFTId": nft_ids[chosen],
+        "StartAtUtc": start_at,
+        "EndAtUtc": end_at,
+        "StartingPriceETH": start_price,
+        "CurrentPriceETH": start_price.copy(),
+        "CurrentLeaderId": pd.arrays.IntegerArray(np.zeros(n, dtype=np.int64), np.ones(n, dtype=bool)),
+        "StatusCode": codes[status_idx],
+    })
+
+
+# ===============================
+# auction.Bid
+# ===============================
+
+BID_CHUNK_AUCTIONS = 500_000
+
+BID_COLUMNS = ["BidId", "AuctionId", "BidderId", "AmountETH", "PlacedAtUtc"]
+
+
+def _segment_starts(counts: np.ndarray) -> np.ndarray:
+    """Índice de la primera fila de cada segmento dentro del arreglo expandido."""
+    return np.cumsum(counts) - counts
+
+
+def bid_ladder_chunk(
+    rng: np.random.Generator,
+    auction_ids: np.ndarray,
+    artist_ids: np.ndarray,
+    start_at: DateLike,
+    end_at: DateLike,
+    start_price: np.ndarray,
+    is_active: np.ndarray,
+    bidders: np.ndarray,
+    lam: float,
+    min_increment_pct: float,
+    max_self_bid_retries: int = 10,
+) -> pd.DataFrame:
+    """
+    Pujas para un bloque de subastas como arreglos segmentados (un segmento por subasta):
+
+    - conteos Poisson(lam) de una vez (5% de las ACTIVE sin pujas reciben 1);
+    - atributos por subasta expandidos con np.repeat;
+    - tiempos ordenados dentro de cada segmento con un único sort sobre la llave
+      (segmento << 32 | offset_s);
+    - escalera de precios = start_price × producto acumulado segmentado de
+      (1 + pct × U(1, 3)), calculado como cumsum de logaritmos;
+    - auto-pujas del artista re-muestreadas con una máscara vectorizada.
+    BidId se numera desde 1 dentro del bloque.
+    """
+    n_auctions = len(auction_ids)
+    counts = rng.poisson(lam, size=n_auctions)
+    revive = (counts == 0) & np.asarray(is_active, dtype=bool) & (rng.random(n_auctions) < 0.05)
+    counts[revive] = 1
+    total = int(counts.sum())
+
+    seg = np.repeat(np.arange(n_auctions, dtype=np.int64), counts)
+    starts = _segment_starts(counts)
+
+    # Tiempos: offset uniforme en segundos, ordenado por segmento
+    start_ms = _as_ms(start_at)
+    span_s = (_as_ms(end_at) - start_ms).astype("timedelta64[s]").astype(np.int64)
+    offsets = rng.integers(0, np.maximum(span_s, 1)[seg], dtype=np.int64)
+    keys = np.sort((seg << 32) | offsets)
+    placed_at = start_ms[seg] + (keys & 0xFFFFFFFF).astype("timedelta64[s]")
+
+    # Escalera de precios: producto acumulado segmentado de los factores de incremento
+    log_f = np.log1p(min_increment_pct * rng.uniform(1.0, 3.0, size=total))
+    csum = np.cumsum(log_f)
+    seg_base = np.repeat(csum[starts[counts > 0]] - log_f[starts[counts > 0]], counts[counts > 0])
+    amount = np.round(np.asarray(start_price, dtype=np.float64)[seg] * np.exp(csum - seg_base), 8)
+
+    # Postores: re-muestreo vectorizado de las pujas donde postor == artista
+    bidders = np.asarray(bidders)
+    artist_rep = np.asarray(artist_ids)[seg]
+    bidder = bidders[rng.integers(0, len(bidders), size=total)]
+    for _ in range(max_self_bid_retries):
+        self_bid = np.flatnonzero(bidder == artist_rep)
+        if len(self_bid) == 0:
+            break
+        bidder[self_bid] = bidders[rng.integers(0, len(bidders), size=len(self_bid))]
+
+    return pd.DataFrame({
+        "BidId": np.arange(1, total + 1, dtype=np.int64),
+        "AuctionId": np.asarray(auction_ids)[seg],
+        "BidderId": bidder,
+        "AmountETH": amount,
+        "PlacedAtUtc": placed_at,
+    })
+
+
+def bids_frame(
+    rng_for_shard: Callable[[int], np.random.Generator],
+    auction_ids: np.ndarray,
+    artist_ids: np.ndarray,
+    start_at: DateLike,
+    end_at: DateLike,
+    start_price: np.ndarray,
+    is_active: np.ndarray,
+    bidders: np.ndarray,
+    lam: float,
+    min_increment_pct: float,
+    chunk_auctions: int = BID_CHUNK_AUCTIONS,
+) -> pd.DataFrame:
+    """
+    Aplica `bid_ladder_chunk` por bloques de `chunk_auctions` subastas (shard i →
+    flujo `rng_for_shard(i)`) y numera BidId de forma contigua entre bloques.
+    """
+    start_ms, end_ms = _as_ms(start_at), _as_ms(end_at)
+    chunks, offset = [], 0
+    for shard, lo in enumerate(range(0, len(auction_ids), chunk_auctions)):
+        hi = lo + chunk_auctions
+        df = bid_ladder_chunk(
+            rng_for_shard(shard),
+            auction_ids[lo:hi], artist_ids[lo:hi], start_ms[lo:hi], end_ms[lo:hi],
+            start_price[lo:hi], is_active[lo:hi], bidders, lam, min_increment_pct,
+        )
+        df["BidId"] += offset
+        offset += len(df)
+        chunks.append(df)
+    if not chunks:
+        return pd.DataFrame(columns=BID_COLUMNS)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+# ===============================
+# Liquidación: finance.FundsReservation / finance.Ledger
+# ===============================
+
+def winning_bids(bids: pd.DataFrame) -> pd.DataFrame:
+    """
+    Puja ganadora por subasta sin iterar subastas: mayor AmountETH y, en empate,
+    la PlacedAtUtc más temprana. Dos pasadas de groupby (máximo por subasta y
+    idxmin del tiempo entre las pujas que lo alcanzan), O(n) en el número de pujas.
+    Retorna columnas AuctionId, BidId, BidderId, AmountETH ordenadas por AuctionId.
+    """
+    if bids is None or bids.empty:
+        return pd.DataFrame({
+            "AuctionId": np.array([], dtype=np.int64), "BidId": np.array([], dtype=np.int64),
+            "BidderId": np.array([], dtype=np.int64), "AmountETH": np.array([], dtype=np.float64),
+        })
+    auction = bids["AuctionId"].to_numpy()
+    amount = bids["AmountETH"].to_numpy(dtype=np.float64)
+    best = pd.Series(amount).groupby(auction).transform("max").to_numpy()
+    cand = np.flatnonzero(amount == best)
+    placed = _as_ms(bids["PlacedAtUtc"])[cand].astype(np.int64)
+    first = pd.Series(placed, index=cand).groupby(auction[cand], sort=True).idxmin().to_numpy()
+    return pd.DataFrame({
+        "AuctionId": auction[first],
+        "BidId": bids["BidId"].to_numpy()[first],
+        "BidderId": bids["BidderId"].to_numpy()[first],
+        "AmountETH": amount[first],
+    })
+
+
+def settlement_frames(
+    winners: pd.DataFrame,
+    auction_status: np.ndarray,
+    auction_end_at: DateLike,
+    seller_ids: np.ndarray,
+    reservation_state: str,
+    fee_pct: float = 0.02,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Reservas y asientos contables de las subastas COMPLETED con ganador.
+    `auction_status`, `auction_end_at` y `seller_ids` vienen alineados con `winners`.
+    Ledger intercala por subasta DEBIT (comprador, monto) y CREDIT (vendedor, monto - fee).
+    """
+    done = np.flatnonzero(np.asarray(auction_status, dtype=object) == "COMPLETED")
+    m = len(done)
+    auction_id = winners["AuctionId"].to_numpy()[done]
+    buyer = winners["BidderId"].to_numpy()[done]
+    amount = np.round(winners["AmountETH"].to_numpy(dtype=np.float64)[done], 8)
+    end_at = _as_ms(auction_end_at)[done]
+    seller = np.asarray(seller_ids)[done]
+    seller_amount = np.round(amount - np.round(amount * fee_pct, 8), 8)
+
+    df_res = pd.DataFrame({
+        "ReservationId": np.arange(1, m + 1, dtype=np.int64),
+        "AuctionId": auction_id,
+        "UserId": buyer,
+        "AmountETH": amount,
+        "StateCode": np.full(m, reservation_state, dtype=object),
+        "CreatedAtUtc": end_at,
+    })
+
+    def interleave(debit, credit):
+        return np.column_stack([debit, credit]).ravel()
+
+    df_ledger = pd.DataFrame({
+        "EntryId": np.arange(1, 2 * m + 1, dtype=np.int64),
+        "AuctionId": interleave(auction_id, auction_id),
+        "UserId": interleave(buyer, seller),
+        "AmountETH": interleave(amount, seller_amount),
+        "EntryType": np.tile(np.array(["DEBIT", "CREDIT"], dtype=object), m),
+        "CreatedAtUtc": interleave(end_at, end_at),
+    })
+    return df_res, df_ledger
+
+
+# ===============================
+# Notificaciones: audit.EmailOutbox
+# ===============================
+
+OUTBOX_COLUMNS = ["EmailId", "RecipientUserId", "RecipientEmail", "Subject", "Body", "StatusCode"]
+
+
+def email_outbox_frame(
+    auctions: pd.DataFrame,
+    curation: Optional[pd.DataFrame],
+    nfts: Optional[pd.DataFrame],
+    useremail: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Emails de eventos (subasta creada, NFT aprobado/rechazado) para el artista.
+    Dos merges, evento -> NFT (ArtistId) -> email primario, en lugar de buscar fila
+    por fila; se conserva el orden: subastas primero y luego curaciones.
+    EmailId es un rango contiguo desde 1.
+    """
+    if nfts is None or useremail is None:
+        return pd.DataFrame(columns=OUTBOX_COLUMNS)
+
+    artist_of = nfts[["NFTId", "ArtistId"]]
+    # Un email primario por usuario (el último, como hacía el dict anterior)
+    primary = (useremail.loc[useremail["IsPrimary"].to_numpy() == 1, ["UserId", "Email"]]
+               .drop_duplicates("UserId", keep="last")
+               .rename(columns={"UserId": "ArtistId"}))
+    email = primary["Email"].to_numpy(dtype=object, na_value="")
+    primary = primary[email != ""]
+
+    def with_recipient(events: pd.DataFrame) -> pd.DataFrame:
+        return (events.merge(artist_of, on="NFTId", how="inner", validate="many_to_one")
+                      .merge(primary, on="ArtistId", how="inner", validate="many_to_one"))
+
+    def frame(ev: pd.DataFrame, subject: List[str], body: List[str]) -> pd.DataFrame:
+        return pd.DataFrame({
+            "RecipientUserId": ev["ArtistId"].to_numpy(),
+            "RecipientEmail": ev["Email"].to_numpy(dtype=object),
+            "Subject": np.array(subject, dtype=object),
+            "Body": np.array(body, dtype=object),
+        })
+
+    # Textos formateados columna a columna (sin crear filas intermedias)
+    auc = with_recipient(auctions[["AuctionId", "NFTId"]])
+    parts = [frame(
+        auc,
+        [f"Subasta creada para NFT #{n}" for n in auc["NFTId"].to_numpy(dtype=np.int64).tolist()],
+        [f"Tu NFT ha sido listado en subasta (Auction #{a})."
+         for a in auc["AuctionId"].to_numpy(dtype=np.int64).tolist()],
+    )]
+
+    if curation is not None:
+        code = curation["DecisionCode"].to_numpy(dtype=object)
+        decided = curation.loc[(code == "APPROVED") | (code == "REJECTED"), ["NFTId", "DecisionCode"]]
+        cur = with_recipient(decided)
+        decision = np.where(cur["DecisionCode"].to_numpy(dtype=object) == "APPROVED",
+                            "aprobado", "rechazado").tolist()
+        nft = cur["NFTId"].to_numpy(dtype=np.int64).tolist()
+        parts.append(frame(
+            cur,
+            [f"NFT #{n} {d}" for n, d in zip(nft, decision)],
+            [f"Tu NFT ha sido {d} por el curador." for d in decision],
+        ))
+
+    df = pd.concat(parts, ignore_index=True)
+    df.insert(0, "EmailId", np.arange(1, len(df) + 1, dtype=np.int64))
+    df["StatusCode"] = "PENDING"
+    return df
@@ -0,0 +1,382 @@
+"""
+Planificador de pasos de run_pipeline - ArteCryptoAuctions
+Cada método del generador declara los df_* que lee y escribe (_STEP_IO); con
+eso se arma un grafo de dependencias sobre el orden serial de _PHASE_METHODS y
+los pasos listos se ejecutan a la vez en un pool de hilos. Cada tabla usa su
+propio flujo aleatorio (table_rng), así que el resultado no depende del orden
+y es idéntico al de la ejecución en serie.
+
+También mide cada paso (tiempo, CPU, memoria, filas/s) para el reporte de
+run_pipeline (ver measure_step). PipelineDriver es el driver común de los dos
+generadores (datagen y datagen_2): cada uno declara solo sus tablas de pasos.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from datagen_cache import DatasetCache, export_key, frames_key, written_files
+from datagen_snapshot import PipelineCheckpoint, config_to_dict, generation_config
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+# paso -> (df_* que lee, df_* que escribe)
+StepIO = Mapping[str, Tuple[Sequence[str], Sequence[str]]]
+
+
+def step_dependencies(steps: Sequence[str], step_io: StepIO) -> Dict[str, Set[str]]:
+    """
+    Para cada paso, los pasos anteriores (en el orden de `steps`) que deben
+    terminar antes: los que escriben algo que el paso lee, y los que leen o
+    escriben algo que el paso escribe. Un paso sin declaración en `step_io`
+    depende de todos los anteriores y todos los siguientes dependen de él.
+    """
+    deps: Dict[str, Set[str]] = {}
+    for i, step in enumerate(steps):
+        before = steps[:i]
+        if step not in step_io:
+            deps[step] = set(before)
+            continue
+        reads, writes = map(set, step_io[step])
+        deps[step] = set()
+        for prev in before:
+            if prev not in step_io:
+                deps[step].add(prev)
+                continue
+            prev_reads, prev_writes = map(set, step_io[prev])
+            if prev_writes & (reads | writes) or prev_reads & writes:
+                deps[step].add(prev)
+    return deps
+
+
+def run_steps(
+    steps: Sequence[Tuple[str, Callable[[], Any]]],
+    step_io: StepIO,
+    workers: int = 1,
+) -> None:
+    """
+    Ejecuta `steps` ((nombre, función) en orden serial) respetando
+    step_dependencies. Con workers <= 1 corre en serie; si no, los pasos listos
+    se lanzan en un pool de `workers` hilos, en orden serial cuando hay más
+    listos que hilos libres. Un error detiene el lanzamiento de pasos nuevos y
+    se relanza cuando terminan los que estaban en curso.
+    """
+    if workers <= 1:
+        for _, func in steps:
+            func()
+        return
+
+    funcs = dict(steps)
+    deps = step_dependencies([name for name, _ in steps], step_io)
+    pending = [name for name, _ in steps]
+    done: Set[str] = set()
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            ready = [name for name in pending if deps[name] <= done]
+            for name in ready[:workers - len(running)]:
+                pending.remove(name)
+                running[pool.submit(funcs[name])] = name
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                future.result()
+                done.add(name)
+
+
+# ===============================
+# Métricas por paso
+# ===============================
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso (MB), o None si no se puede medir (Windows)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def measure_step(name: str, *, threaded: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Mide un paso del pipeline y deja las métricas en el dict entregado
+    (el llamador agrega 'rows' dentro del bloque): wall_s, cpu_s, rows_per_s,
+    peak_rss_mb y su aumento en el paso, y traced_peak_mb si tracemalloc está
+    activo. Con `threaded` el CPU es el del hilo del paso (thread_time); si no,
+    el de todo el proceso (process_time). Con pasos en paralelo, el pico de RSS
+    es del proceso y puede incluir otros pasos; traced_peak_mb se omite, porque
+    tracemalloc.reset_peak() es global y cada paso borraría el pico de los demás.
+    """
+    cpu_clock = time.thread_time if threaded else time.process_time
+    record: Dict[str, Any] = {"step": name, "rows": 0}
+    rss_before = peak_rss_mb()
+    tracing = tracemalloc.is_tracing() and not threaded
+    if tracing:
+        tracemalloc.reset_peak()
+        traced_start = tracemalloc.get_traced_memory()[0]
+    wall0, cpu0 = time.perf_counter(), cpu_clock()
+    try:
+        yield record
+    finally:
+        wall = time.perf_counter() - wall0
+        record["wall_s"] = round(wall, 4)
+        record["cpu_s"] = round(cpu_clock() - cpu0, 4)
+        record["rows_per_s"] = round(record["rows"] / wall, 1) if wall > 0 else None
+        rss_after = peak_rss_mb()
+        record["peak_rss_mb"] = None if rss_after is None else round(rss_after, 1)
+        record["peak_rss_delta_mb"] = None if rss_after is None else round(rss_after - rss_before, 1)
+        if tracing:
+            record["traced_peak_mb"] = round((tracemalloc.get_traced_memory()[1] - traced_start) / (1 << 20), 1)
+
+
+@contextmanager
+def traced_memory(enabled: bool) -> Iterator[None]:
+    """Activa tracemalloc durante el bloque (si `enabled` y no estaba activo)."""
+    start = enabled and not tracemalloc.is_tracing()
+    if start:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if start:
+            tracemalloc.stop()
+
+
+def format_step_report(steps: Sequence[Mapping[str, Any]]) -> str:
+    """Tabla de texto del reporte por paso (para la salida verbose)."""
+    lines = [f"  {'paso':<30} {'filas':>12} {'wall s':>9} {'cpu s':>9} {'filas/s':>13} {'RSS pico MB':>12}"]
+    for r in steps:
+        rss = "—" if r.get("peak_rss_mb") is None else f"{r['peak_rss_mb']:,.1f}"
+        rate = "—" if r.get("rows_per_s") is None else f"{r['rows_per_s']:,.0f}"
+        lines.append(f"  {r['step']:<30} {r['rows']:>12,} {r['wall_s']:>9.3f} {r['cpu_s']:>9.3f} "
+                     f"{rate:>13} {rss:>12}")
+    return "\n".join(lines)
+
+
+def write_step_report(report: Mapping[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+# ===============================
+# Driver de run_pipeline
+# ===============================
+
+class PipelineDriver:
+    """
+    Driver común de run_pipeline: fases, grafo de dependencias, métricas por
+    paso, checkpoint y caché. La subclase declara sus pasos:
+      _PHASE_METHODS: fase -> métodos en orden serial
+      _STEP_IO:       paso -> (df_* que lee, df_* que escribe)
+      _ALL_FRAMES:    todos los df_* del generador
+      _EXPORT_TARGETS: exportador -> argumento de run_pipeline con su destino
+    y su run_pipeline llama a _drive_pipeline con los destinos de exportación.
+    """
+
+    _PHASE_METHODS: Dict[int, List[str]] = {}
+    _STEP_IO: StepIO = {}
+    _ALL_FRAMES: Tuple[str, ...] = ()
+    _EXPORT_TARGETS: Dict[str, str] = {}
+
+    cfg: Any
+    verbose: bool
+
+    def _init_pipeline_state(self) -> None:
+        # Métricas de la última ejecución de run_pipeline (ver _run_step)
+        self.pipeline_report: Optional[Dict] = None
+        # Checkpoint de la ejecución en curso de run_pipeline (checkpoint_directory)
+        self._checkpoint: Optional[PipelineCheckpoint] = None
+        # Caché por contenido de run_pipeline (cache_directory): pasos de generación
+        # de la ejecución y claves de las exportaciones por guardar
+        self._cache: Optional[DatasetCache] = None
+        self._cache_steps: List[str] = []
+        self._cache_exports: Dict[str, str] = {}
+
+    def _run_step(self, phase: int, m: str, label: str, *args) -> None:
+        """Ejecuta un paso del pipeline y agrega sus métricas a self.pipeline_report."""
+        if self.verbose:
+            print(f"  ✓ ejecutando {m}({label})")
+        reads, writes = self._STEP_IO.get(m, ((), ()))
+        before = {a: getattr(self, a, None) for a in writes}
+        cache_key = self._cache_exports.get(m)
+        with measure_step(m, threaded=self.pipeline_report["pipeline_workers"] > 1) as record:
+            result = getattr(self, m)(*args)
+            # Filas producidas: los DataFrames nuevos del paso (exportadores: los que leen)
+            produced = [a for a in writes if getattr(self, a, None) is not before[a]] if writes else reads
+            record["rows"] = sum(len(df) for df in (getattr(self, a, None) for a in produced) if df is not None)
+        record["phase"] = phase
+        if self._checkpoint is not None and writes:
+            t0 = time.perf_counter()
+            self._checkpoint.save(m, {a[len("df_"):]: getattr(self, a, None) for a in writes})
+            record["checkpoint_s"] = round(time.perf_counter() - t0, 4)
+        if cache_key:
+            t0 = time.perf_counter()
+            self._cache.put_files(cache_key, args[0], written_files(result, args[0]), step=m)
+            record["cache_s"] = round(time.perf_counter() - t0, 4)
+        self.pipeline_report["steps"].append(record)
+
+    def _restore_cached_export(self, m: str, target: str) -> bool:
+        """
+        Con caché: copia a `target` la salida guardada de `m` si existe. Si no,
+        deja la clave para que _run_step guarde los archivos que reporte. Solo aplica si
+        la misma ejecución generó todas las tablas (los df_* salen de la configuración).
+        """
+        all_steps = [s for p in self._PHASE_METHODS.values() for s in p if self._STEP_IO.get(s, ((), ()))[1]]
+        if self._cache is None or self._cache_steps != all_steps:
+            return False
+        key = export_key(self.cfg, type(self).__module__, self._cache_steps, m, target)
+        restored = self._cache.restore_files(key, target)
+        if restored is None:
+            self._cache_exports[m] = key
+            return False
+        self.pipeline_report["cache"]["exports"][m] = "hit"
+        if self.verbose:
+            print(f"  - caché: {m} → {target} ({len(restored)} archivos)")
+        return True
+
+    def _open_checkpoint(self, checkpoint_directory: Optional[str]) -> None:
+        """Checkpoint: los pasos ya completados se restauran en vez de regenerarse."""
+        self._checkpoint = None
+        if not checkpoint_directory:
+            return
+        self._checkpoint = PipelineCheckpoint(checkpoint_directory, generator=type(self).__module__,
+                                              config=generation_config(self.cfg))
+        for name, df in self._checkpoint.restore().items():
+            setattr(self, f"df_{name}", df)
+        if self.verbose and self._checkpoint.discarded:
+            print(f"[Pipeline] Checkpoint en {checkpoint_directory} descartado (otra configuración)")
+        if self.verbose and self._checkpoint.completed:
+            print(f"[Pipeline] Reanudando desde {checkpoint_directory}: "
+                  f"{len(self._checkpoint.completed)} pasos completados")
+
+    def _open_cache(self, cache_directory: Optional[str], phases: Sequence[int]) -> List[str]:
+        """
+        Caché por contenido: si esta configuración ya se generó, carga los df_* y
+        retorna los pasos de generación que ya no hace falta ejecutar.
+        """
+        self._cache, self._cache_steps, self._cache_exports = None, [], {}
+        if not cache_directory:
+            return []
+        self._cache = DatasetCache(cache_directory, max_bytes=self.cfg.cache_max_mb << 20,
+                                   verify=self.cfg.cache_verify)
+        self._cache_steps = [m for p in phases for m in self._PHASE_METHODS.get(p, [])
+                             if self._STEP_IO.get(m, ((), ()))[1]]
+        t0 = time.perf_counter()
+        frames = None
+        if self._cache_steps:
+            frames = self._cache.get_frames(frames_key(self.cfg, type(self).__module__, self._cache_steps))
+        if frames is not None:
+            for name, df in frames.items():
+                setattr(self, f"df_{name}", df)
+        self.pipeline_report["cache"] = {
+            "directory": cache_directory,
+            "frames": "hit" if frames is not None else "miss",
+            "load_s": round(time.perf_counter() - t0, 4),
+            "exports": {},
+        }
+        if self.verbose and frames is not None:
+            print(f"[Pipeline] Caché: {len(frames)} tablas cargadas de {cache_directory} "
+                  f"en {self.pipeline_report['cache']['load_s']:.3f} s")
+        return self._cache_steps if frames is not None else []
+
+    def _drive_pipeline(
+        self,
+        phases: Tuple[int, ...],
+        *,
+        strict: bool,
+        export_targets: Mapping[str, Optional[str]],
+        export_report_path: Optional[str],
+        checkpoint_directory: Optional[str],
+        cache_directory: Optional[str],
+    ) -> None:
+        """
+        Cuerpo de run_pipeline. `export_targets` mapea cada exportador al destino
+        recibido (None: se omite el paso).
+        """
+        # Reporte por paso (ver _run_step); también queda en self.pipeline_report
+        # Con pipeline_trace_memory en serie: el pico de tracemalloc es global al proceso
+        workers = 1 if self.cfg.pipeline_trace_memory else self.cfg.pipeline_workers
+        self.pipeline_report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "phases": list(phases),
+            "pipeline_workers": workers,
+            "cpu_clock": "thread" if workers > 1 else "process",
+            "config": config_to_dict(self.cfg),
+            "steps": [],
+        }
+        self._open_checkpoint(checkpoint_directory)
+        cached_steps = self._open_cache(cache_directory, phases)
+        last_generation_phase = max((p for p in phases for m in self._PHASE_METHODS.get(p, [])
+                                     if m in self._cache_steps), default=None)
+        t0 = time.perf_counter()
+        with traced_memory(self.cfg.pipeline_trace_memory):
+            for phase in phases:
+                methods = self._PHASE_METHODS.get(phase, [])
+                if self.verbose:
+                    print(f"[Pipeline] Fase {phase} — métodos: {', '.join(methods) or '—'}")
+
+                steps = []
+                for m in methods:
+                    if m in self._EXPORT_TARGETS:
+                        target = export_targets.get(m)
+                        if not target:
+                            if self.verbose:
+                                print(f"  - skip {m} (sin {self._EXPORT_TARGETS[m]})")
+                            continue
+                        if self._restore_cached_export(m, target):
+                            continue
+                        steps.append((m, partial(self._run_step, phase, m, target, target)))
+                        continue
+
+                    if m in cached_steps:
+                        if self.verbose:
+                            print(f"  - caché: {m}")
+                        continue
+                    if self._checkpoint is not None and self._checkpoint.is_completed(m):
+                        if self.verbose:
+                            print(f"  - checkpoint: {m} ya completado")
+                        continue
+                    if not hasattr(self, m) or not callable(getattr(self, m)):
+                        if strict:
+                            raise NotImplementedError(
+                                f"El método requerido '{m}' para la fase {phase} aún no está implementado."
+                            )
+                        if self.verbose:
+                            print(f"  - omitiendo '{m}' (no implementado)")
+                        continue
+
+                    steps.append((m, partial(self._run_step, phase, m, "")))
+
+                # Pasos de la fase en orden de dependencias (ver _STEP_IO)
+                run_steps(steps, self._STEP_IO, workers=workers)
+
+                # Tablas completas: se guardan en el caché antes de exportar
+                if phase == last_generation_phase and not cached_steps:
+                    self._cache.put_frames(
+                        frames_key(self.cfg, type(self).__module__, self._cache_steps),
+                        {a[len("df_"):]: getattr(self, a, None) for a in self._ALL_FRAMES},
+                        generator=type(self).__module__, steps=self._cache_steps,
+                    )
+
+        self.pipeline_report["wall_s"] = round(time.perf_counter() - t0, 4)
+        rss = peak_rss_mb()
+        self.pipeline_report["peak_rss_mb"] = None if rss is None else round(rss, 1)
+        if self.verbose and self.pipeline_report["steps"]:
+            print("[Pipeline] Reporte por paso:")
+            print(format_step_report(self.pipeline_report["steps"]))
+        if export_report_path:
+            write_step_report(self.pipeline_report, export_report_path)
+            if self.verbose:
+                print(f"  - Reporte del pipeline escrito: {export_report_path}")
@@ -0,0 +1,357 @@
+"""
+Snapshot columnar (Parquet) de los DataFrames generados - ArteCryptoAuctions
+Escribe cada df_* de DataGenerator en su propio archivo Parquet, por grupos de
+filas (memoria acotada), con tipos compactos y un manifest.json con conteos y
+la configuración usada. También guarda los checkpoints por paso de
+run_pipeline (PipelineCheckpoint), en modo sin pérdida.
+
+Requiere pyarrow (opcional para el resto del generador):
+    pip install pyarrow
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_ROW_GROUP_ROWS = 500_000
+
+# Montos ETH como DECIMAL con la misma escala que la exportación SQL ('.8f')
+ETH_DECIMAL_PRECISION = 38
+ETH_DECIMAL_SCALE = 8
+# Columnas de texto con a lo sumo este número de valores distintos se guardan
+# como diccionario (códigos de estado, tipos de asiento, dominios...)
+DICTIONARY_MAX_CARDINALITY = 1024
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError(
+            "El snapshot Parquet requiere pyarrow (pip install pyarrow)"
+        ) from e
+    return pa, pq
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def config_to_dict(cfg: Any) -> Dict[str, Any]:
+    """DataGenConfig (dataclass) a dict serializable en JSON."""
+    return _jsonable(asdict(cfg) if is_dataclass(cfg) else dict(cfg))
+
+
+# ===============================
+# Tipos compactos por columna
+# ===============================
+
+def _column_plan(pa, col: pd.Series, lossless: bool = False) -> Tuple[Any, Optional[np.ndarray]]:
+    """
+    Tipo Arrow de la columna completa (se decide una vez, antes de partir en
+    grupos de filas, para que todos los grupos compartan esquema).
+    Retorna (tipo, categorías) — categorías solo para columnas diccionario.
+    Con `lossless` los enteros quedan en int64, los montos en float64, las fechas
+    en su unidad original y los textos como string (sin Categorical al leer).
+    """
+    dtype = col.dtype
+    name = str(col.name)
+    if pd.api.types.is_bool_dtype(dtype):
+        return pa.bool_(), None
+    if pd.api.types.is_integer_dtype(dtype):
+        if lossless:
+            return pa.int64(), None
+        values = col.dropna()
+        fits32 = values.empty or (values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max)
+        return (pa.int32() if fits32 else pa.int64()), None
+    if pd.api.types.is_float_dtype(dtype):
+        if name.endswith("ETH") and not lossless:
+            return pa.decimal128(ETH_DECIMAL_PRECISION, ETH_DECIMAL_SCALE), None
+        return pa.float64(), None
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return pa.timestamp(np.datetime_data(dtype)[0] if lossless else "ms"), None
+    if lossless:
+        return pa.string(), None
+    uniques = pd.unique(col.dropna().to_numpy(dtype=object))
+    if len(uniques) <= DICTIONARY_MAX_CARDINALITY:
+        return pa.dictionary(pa.int32(), pa.string()), np.sort(uniques.astype(str))
+    return pa.string(), None
+
+
+def _to_arrow(pa, col: pd.Series, arrow_type: Any, categories: Optional[np.ndarray]):
+    """Convierte un bloque de la columna al tipo decidido en _column_plan."""
+    mask = col.isna().to_numpy()
+    if pa.types.is_dictionary(arrow_type):
+        codes = pd.Categorical(col.to_numpy(dtype=object), categories=categories).codes.astype(np.int32)
+        indices = pa.array(codes, type=pa.int32(), mask=mask)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(categories, type=pa.string()))
+    if pa.types.is_decimal(arrow_type):
+        # Valor sin escala (monto * 10^scale) en 128 bits little-endian, con extensión de signo
+        units = np.round(col.to_numpy(dtype=np.float64, na_value=0.0) * 10 ** arrow_type.scale).astype(np.int64)
+        units[mask] = 0
+        words = np.column_stack([units, units >> 63]).astype(np.int64)
+        validity = pa.array(~mask, type=pa.bool_()).buffers()[1] if mask.any() else None
+        return pa.Array.from_buffers(arrow_type, len(units), [validity, pa.py_buffer(words.tobytes())],
+                                     null_count=int(mask.sum()))
+    if pa.types.is_timestamp(arrow_type):
+        values = col.to_numpy().astype(f"datetime64[{arrow_type.unit}]")
+        return pa.array(values, type=arrow_type, mask=mask if mask.any() else None)
+    if pa.types.is_integer(arrow_type):
+        values = col.to_numpy(dtype=np.int64, na_value=0)
+        return pa.array(values, type=pa.int64(), mask=mask if mask.any() else None).cast(arrow_type)
+    if pa.types.is_boolean(arrow_type):
+        return pa.array(col.to_numpy(dtype=bool, na_value=False), type=arrow_type,
+                        mask=mask if mask.any() else None)
+    if pa.types.is_floating(arrow_type):
+        return pa.array(col.to_numpy(dtype=np.float64, na_value=np.nan), type=arrow_type)
+    values = col.to_numpy(dtype=object)
+    return pa.array([None if m else str(v) for v, m in zip(values.tolist(), mask.tolist())], type=arrow_type)
+
+
+# ===============================
+# Escritura / lectura
+# ===============================
+
+def write_parquet_snapshot(
+    frames: Dict[str, Optional[pd.DataFrame]],
+    directory: str,
+    *,
+    config: Optional[Dict[str, Any]] = None,
+    row_group_rows: int = SNAPSHOT_ROW_GROUP_ROWS,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    lossless: bool = False,
+) -> Dict[str, Any]:
+    """
+    Escribe cada DataFrame como <nombre>.parquet (un grupo de filas por bloque
+    de `row_group_rows`) y manifest.json. `frames` mapea nombre (p.ej. 'bid')
+    a DataFrame; los None se omiten. Con `lossless` los DataFrames se leen de
+    vuelta con los mismos valores y dtypes (ver write_parquet_tables).
+    Retorna el manifest.
+    """
+    row_group_rows = max(1, row_group_rows)
+    tables = write_parquet_tables(frames, directory, row_group_rows=row_group_rows, compression=compression,
+                                  compression_level=compression_level, lossless=lossless)
+    manifest = {
+        "format": "parquet",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "row_group_rows": row_group_rows,
+        "compression": compression,
+        "compression_level": compression_level,
+        "lossless": lossless,
+        "config": config or {},
+        "tables": tables,
+    }
+    write_json(os.path.join(directory, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def write_parquet_tables(
+    frames: Dict[str, Optional[pd.DataFrame]],
+    directory: str,
+    *,
+    row_group_rows: int = SNAPSHOT_ROW_GROUP_ROWS,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    lossless: bool = False,
+) -> Dict[str, Any]:
+    """
+    Escribe los <nombre>.parquet sin manifest; retorna la entrada 'tables' del
+    manifest (archivo, filas, tipos Arrow y dtypes de pandas). Con `lossless`
+    los montos no pasan a DECIMAL y las fechas conservan su unidad. Cada archivo
+    se escribe con nombre temporal y se renombra al terminar (os.replace): un
+    corte a mitad de escritura nunca deja un .parquet truncado.
+    """
+    pa, pq = _require_pyarrow()
+    os.makedirs(directory, exist_ok=True)
+    row_group_rows = max(1, row_group_rows)
+
+    tables: Dict[str, Any] = {}
+    for name, df in frames.items():
+        if df is None:
+            continue
+        plans = [_column_plan(pa, df[c], lossless) for c in df.columns]
+        schema = pa.schema([pa.field(str(c), t) for c, (t, _) in zip(df.columns, plans)])
+        filename = f"{name}.parquet"
+        path = os.path.join(directory, filename)
+        with pq.ParquetWriter(f"{path}.tmp", schema, compression=compression,
+                              compression_level=compression_level) as writer:
+            for start in range(0, max(len(df), 1), row_group_rows):
+                block = df.iloc[start:start + row_group_rows]
+                arrays = [_to_arrow(pa, block[c], t, cats) for c, (t, cats) in zip(df.columns, plans)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        os.replace(f"{path}.tmp", path)
+        tables[name] = {
+            "file": filename,
+            "rows": int(len(df)),
+            "columns": {f.name: str(f.type) for f in schema},
+            "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+        }
+    return tables
+
+
+def write_json(path: str, data: Dict[str, Any]) -> None:
+    """Escribe JSON de forma atómica (archivo temporal + os.replace)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def read_parquet_snapshot(
+    directory: str,
+    names: Optional[List[str]] = None,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
+    """
+    Lee un snapshot escrito por write_parquet_snapshot. Los diccionarios vuelven
+    como category, los DECIMAL como float64, los timestamp como datetime64[ms] y
+    los enteros como int64 (Int64 si tienen nulos). Si el snapshot es sin
+    pérdida, cada columna vuelve con su dtype original.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    tables = {name: meta for name, meta in manifest["tables"].items() if names is None or name in names}
+    return read_parquet_tables(directory, tables, lossless=manifest.get("lossless", False)), manifest
+
+
+def read_parquet_tables(directory: str, tables: Dict[str, Any], lossless: bool = False) -> Dict[str, pd.DataFrame]:
+    """Lee las tablas descritas por `tables` (entrada 'tables' de un manifest)."""
+    pa, pq = _require_pyarrow()
+    frames: Dict[str, pd.DataFrame] = {}
+    for name, meta in tables.items():
+        table = pq.read_table(os.path.join(directory, meta["file"]))
+        # DECIMAL -> float64 antes de pasar a pandas (evita objetos Decimal por fila)
+        for i, field in enumerate(table.schema):
+            if pa.types.is_decimal(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+        df = table.to_pandas(coerce_temporal_nanoseconds=False)
+        # Enteros de vuelta a int64 (Int64 si la columna tiene nulos, p.ej. CurrentLeaderId)
+        for field in table.schema:
+            if pa.types.is_integer(field.type) and not lossless:
+                col = table.column(field.name)
+                df[field.name] = pd.array(col.to_numpy(zero_copy_only=False), dtype="Int64") \
+                    if col.null_count else df[field.name].astype(np.int64)
+        if lossless:
+            for col, dtype in meta.get("dtypes", {}).items():
+                if str(df[col].dtype) != dtype:
+                    df[col] = df[col].astype(dtype)
+        frames[name] = df
+    return frames
+
+
+# ===============================
+# Checkpoints por paso (run_pipeline)
+# ===============================
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_COMPRESSION = "zstd"
+CHECKPOINT_COMPRESSION_LEVEL = 1
+
+# Campos de DataGenConfig que no cambian los df_* generados (exportación y
+# ejecución): un checkpoint sigue siendo válido si solo cambian estos
+NON_GENERATION_FIELDS = frozenset({
+    "sql_chunk_rows", "sql_rows_per_insert", "sql_inserts_per_batch", "sql_batch_transaction",
+    "export_workers", "output_compression", "output_compression_level", "writer_queue_depth",
+    "sql_shards", "sql_shard_min_rows", "fast_load", "bulk_batch_size",
+    "pipeline_workers", "pipeline_trace_memory", "cache_max_mb", "cache_verify",
+})
+
+
+def generation_config(cfg: Any) -> Dict[str, Any]:
+    """config_to_dict sin los campos de exportación/ejecución (NON_GENERATION_FIELDS)."""
+    return {k: v for k, v in config_to_dict(cfg).items() if k not in NON_GENERATION_FIELDS}
+
+
+class PipelineCheckpoint:
+    """
+    Checkpoint de run_pipeline en un directorio columnar (Parquet sin pérdida):
+    save() escribe los df_* de un paso completado y lo registra en
+    checkpoint.json; restore() los lee de vuelta para reanudar. Solo se
+    reutiliza con el mismo generador y la misma configuración de generación;
+    si no, se empieza de cero. Los flujos aleatorios se derivan por tabla de
+    cfg.seed (table_rng), así que la semilla es todo el estado RNG que hay que
+    guardar para que un paso repetido produzca lo mismo.
+
+    Cada paso escribe en su propia carpeta (<paso>/<tabla>.parquet) y solo
+    después se actualiza checkpoint.json, de forma atómica. Un paso que reescribe
+    tablas ya guardadas (settle_auctions_and_finance: auction, nft) no toca las
+    versiones a las que apunta el checkpoint anterior hasta completarse. Si se
+    corta a mitad, se reanuda desde las tablas previas al paso.
+    """
+
+    def __init__(self, directory: str, *, generator: str, config: Dict[str, Any]):
+        self.directory = directory
+        self._path = os.path.join(directory, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        state = None
+        if os.path.exists(self._path):
+            with open(self._path, encoding="utf-8") as f:
+                state = json.load(f)
+        config = json.loads(json.dumps(config))  # tuplas -> listas, como al leer el JSON
+        self.resumed = bool(state) and state.get("generator") == generator and state.get("config") == config
+        # Había un checkpoint pero de otro generador o configuración: se reemplaza
+        self.discarded = bool(state) and not self.resumed
+        if not self.resumed:
+            state = {
+                "format": "checkpoint",
+                "generator": generator,
+                "config": config,
+                "rng": {"seed": config.get("seed"), "streams": "table_rng(seed, tabla, shard)"},
+                "steps": [],
+                "tables": {},
+            }
+        self.state = state
+
+    @property
+    def completed(self) -> List[str]:
+        """Pasos completados, en el orden en que terminaron."""
+        return list(self.state["steps"])
+
+    def is_completed(self, step: str) -> bool:
+        return step in self.state["steps"]
+
+    def restore(self) -> Dict[str, pd.DataFrame]:
+        """DataFrames guardados (nombre sin 'df_' -> DataFrame) con sus dtypes originales."""
+        if not self.state["tables"]:
+            return {}
+        return read_parquet_tables(self.directory, self.state["tables"], lossless=True)
+
+    def save(self, step: str, frames: Dict[str, Optional[pd.DataFrame]]) -> None:
+        """Escribe los DataFrames del paso y lo marca como completado (seguro entre hilos)."""
+        tables = write_parquet_tables(frames, os.path.join(self.directory, step),
+                                      compression=CHECKPOINT_COMPRESSION,
+                                      compression_level=CHECKPOINT_COMPRESSION_LEVEL, lossless=True)
+        for meta in tables.values():
+            meta["file"] = f"{step}/{meta['file']}"
+        with self._lock:
+            replaced = [self.state["tables"][name]["file"] for name in tables
+                        if name in self.state["tables"] and self.state["tables"][name]["file"] != tables[name]["file"]]
+            self.state["tables"].update(tables)
+            if step not in self.state["steps"]:
+                self.state["steps"].append(step)
+            self.state["updated"] = datetime.now().isoformat(timespec="seconds")
+            write_json(self._path, self.state)
+            # Versiones anteriores: ya nadie las referencia (y la carpeta del paso, si queda vacía)
+            for file in replaced:
+                path = os.path.join(self.directory, file)
+                try:
+                    os.remove(path)
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
@@ -0,0 +1,774 @@
+"""
+Utilidades de exportación SQL compartidas por datagen.py y datagen_2.py.
+Formatean los valores columna por columna y agrupan las filas en INSERTs
+multi-fila y lotes GO.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import IO, Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# SQL Server admite como máximo 1000 filas en un INSERT ... VALUES
+SQL_MAX_ROWS_PER_INSERT = 1000
+
+# Columna IDENTITY de cada tabla (según el DDL). Las tablas que no aparecen
+# (core.UserRole, nft.NFTSettings, auction.AuctionSettings) no usan IDENTITY_INSERT.
+IDENTITY_COLUMNS = {
+    "ops.Status": "StatusId",
+    "core.Role": "RoleId",
+    "core.User": "UserId",
+    "core.UserEmail": "EmailId",
+    "core.Wallet": "WalletId",
+    "nft.NFT": "NFTId",
+    "admin.CurationReview": "ReviewId",
+    "auction.Auction": "AuctionId",
+    "auction.Bid": "BidId",
+    "finance.FundsReservation": "ReservationId",
+    "finance.Ledger": "EntryId",
+    "audit.EmailOutbox": "EmailId",
+}
+
+
+def table_key(schema_table: str) -> str:
+    """'core.[User]' / '[core].[User]' -> 'core.User'."""
+    return schema_table.replace("[", "").replace("]", "")
+
+
+def has_identity(schema_table: str, columns: Sequence[str]) -> bool:
+    """True si la tabla tiene IDENTITY y el DataFrame trae esa columna explícita."""
+    col = IDENTITY_COLUMNS.get(table_key(schema_table))
+    return col is not None and col in columns
+
+
+def check_batching(rows_per_insert: int, inserts_per_batch: int) -> None:
+    if not 1 <= rows_per_insert <= SQL_MAX_ROWS_PER_INSERT:
+        raise ValueError(
+            f"rows_per_insert debe estar entre 1 y {SQL_MAX_ROWS_PER_INSERT} (recibido {rows_per_insert})"
+        )
+    if inserts_per_batch < 1:
+        raise ValueError(f"inserts_per_batch debe ser >= 1 (recibido {inserts_per_batch})")
+
+
+def insert_statement(target: str, cols_str: str, rows: Sequence[str], hint: Optional[str] = None) -> str:
+    """
+    Un INSERT multi-fila; `rows` son tuplas ya formateadas, p.ej. '(1, N'x')'.
+    `hint` agrega una sugerencia de tabla: INSERT INTO t WITH (TABLOCK) ...
+    """
+    target = f"{target} WITH ({hint})" if hint else target
+    return f"INSERT INTO {target} {cols_str} VALUES\n  " + ",\n  ".join(rows) + ";"
+
+
+def iter_insert_batches(
+    target: str,
+    cols_str: str,
+    row_chunks: Iterable[List[str]],
+    *,
+    rows_per_insert: int = SQL_MAX_ROWS_PER_INSERT,
+    inserts_per_batch: int = 10,
+    transaction: bool = False,
+    identity: bool = False,
+    hint: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Reparte las filas (recibidas por bloques) en INSERTs de `rows_per_insert`
+    filas y lotes de `inserts_per_batch` INSERTs terminados en GO.
+
+    Cada lote es autocontenido: abre y cierra su propio SET IDENTITY_INSERT
+    (y BEGIN/COMMIT TRANSACTION si `transaction`), de modo que un lote fallido
+    no deja IDENTITY_INSERT activo para la tabla siguiente.
+    """
+    check_batching(rows_per_insert, inserts_per_batch)
+    batch_rows = rows_per_insert * inserts_per_batch
+
+    head = []
+    if identity:
+        head.append(f"SET IDENTITY_INSERT {target} ON;\n")
+    if transaction:
+        head.append("SET XACT_ABORT ON;\nBEGIN TRANSACTION;\n")
+    tail = []
+    if transaction:
+        tail.append("COMMIT TRANSACTION;\n")
+    if identity:
+        tail.append(f"SET IDENTITY_INSERT {target} OFF;\n")
+    tail.append("GO\n")
+    head_str, tail_str = "".join(head), "".join(tail)
+
+    def batch(rows: List[str]) -> str:
+        stmts = [insert_statement(target, cols_str, rows[i:i + rows_per_insert], hint)
+                 for i in range(0, len(rows), rows_per_insert)]
+        return head_str + "\n".join(stmts) + "\n" + tail_str
+
+    pending: List[str] = []
+    for chunk in row_chunks:
+        pending.extend(chunk)
+        if len(pending) >= batch_rows:
+            full = len(pending) - len(pending) % batch_rows
+            for start in range(0, full, batch_rows):
+                yield batch(pending[start:start + batch_rows])
+            pending = pending[full:]
+    if pending:
+        yield batch(pending)
+
+
+# ===============================
+# Formateo de valores (columna a columna)
+# ===============================
+
+def _sql_cell(val, float_format: Optional[str], datetime_prefix: str) -> str:
+    """Literal SQL de un valor suelto (solo para columnas object de tipo mixto)."""
+    if val is None or (not isinstance(val, str) and pd.isna(val)):
+        return "NULL"
+    if isinstance(val, (bool, np.bool_)):
+        return "1" if val else "0"
+    if isinstance(val, (int, np.integer)):
+        return str(val)
+    if isinstance(val, (float, np.floating)):
+        return format(val, float_format) if float_format else str(val)
+    if isinstance(val, datetime):
+        return f"{datetime_prefix}'{val.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}'"
+    escaped = str(val).replace("'", "''")
+    return f"N'{escaped}'"
+
+
+def sql_literal_column(
+    col: pd.Series,
+    float_format: Optional[str] = None,
+    datetime_prefix: str = "N",
+) -> List[str]:
+    """
+    Literales SQL de una columna completa, resueltos una sola vez según su dtype:
+    NULL para nulos, enteros/BIT tal cual, DECIMAL con `float_format` (o repr si
+    es None), DATETIME2(3) como '{prefijo}'YYYY-MM-DD HH:MM:SS.mmm'' y texto N'..'
+    con las comillas simples escapadas.
+    """
+    dtype = col.dtype
+    mask = col.isna().to_numpy()
+
+    if pd.api.types.is_bool_dtype(dtype):
+        text = np.where(col.to_numpy(dtype=bool, na_value=False), "1", "0").tolist()
+    elif pd.api.types.is_integer_dtype(dtype):
+        text = list(map(str, col.to_numpy(dtype=np.int64, na_value=0).tolist()))
+    elif pd.api.types.is_float_dtype(dtype):
+        values = col.to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        if float_format:
+            text = [format(v, float_format) for v in values]
+        else:
+            text = list(map(str, values))
+    elif pd.api.types.is_datetime64_dtype(dtype):
+        iso = np.datetime_as_string(col.to_numpy().astype("datetime64[ms]"), unit="ms").tolist()
+        text = [f"{datetime_prefix}'{t[:10]} {t[11:]}'" for t in iso]
+    else:
+        values = col.to_numpy(dtype=object)
+        if not all(isinstance(v, str) for v in values[~mask]):
+            return [_sql_cell(v, float_format, datetime_prefix) for v in values]
+        text = ["N'" + v.replace("'", "''") + "'" if isinstance(v, str) else "NULL"
+                for v in values.tolist()]
+
+    if mask.any():
+        for i in np.flatnonzero(mask).tolist():
+            text[i] = "NULL"
+    return text
+
+
+def format_value_rows(
+    df: pd.DataFrame,
+    float_format: Optional[str] = None,
+    datetime_prefix: str = "N",
+) -> List[str]:
+    """Tuplas '(v1, v2, ...)' del DataFrame: un formateo por columna y un join por fila."""
+    if df.empty:
+        return []
+    columns = [sql_literal_column(df.iloc[:, j], float_format, datetime_prefix)
+               for j in range(df.shape[1])]
+    return ["(" + ", ".join(values) + ")" for values in zip(*columns)]
+
+
+# ===============================
+# Carga masiva: archivos delimitados + formato BCP + BULK INSERT
+# ===============================
+
+BULK_FIELD_TERMINATOR = "\t"
+BULK_ROW_TERMINATOR = "\r\n"
+# Versión de formato no-XML (SQL Server 2017+); CODEPAGE 65001 = UTF-8
+BULK_FORMAT_VERSION = "14.0"
+
+# Columnas de cada tabla en el orden del DDL V7, incluidas las calculadas
+# (StatusDomain) y las que el generador no llena: BULK INSERT ubica cada campo
+# del archivo por el ordinal de su columna, no por el nombre
+DDL_COLUMNS = {
+    "ops.Status": ("StatusId", "Domain", "Code", "Description"),
+    "core.Role": ("RoleId", "Name"),
+    "core.User": ("UserId", "FullName", "CreatedAtUtc"),
+    "nft.NFTSettings": ("SettingsID", "MaxWidthPx", "MinWidthPx", "MaxHeightPx", "MinHeigntPx",
+                        "MaxFileSizeBytes", "MinFileSizeBytes", "CreatedAtUtc"),
+    "auction.AuctionSettings": ("SettingsID", "CompanyName", "BasePriceETH", "DefaultAuctionHours",
+                                "MinBidIncrementPct"),
+    "core.UserRole": ("UserId", "RoleId", "AsignacionUtc"),
+    "core.UserEmail": ("EmailId", "UserId", "Email", "IsPrimary", "AddedAtUtc", "VerifiedAtUtc",
+                       "StatusCode", "StatusDomain"),
+    "core.Wallet": ("WalletId", "UserId", "BalanceETH", "ReservedETH", "UpdatedAtUtc"),
+    "nft.NFT": ("NFTId", "ArtistId", "SettingsID", "CurrentOwnerId", "Name", "Description", "ContentType",
+                "HashCode", "FileSizeBytes", "WidthPx", "HeightPx", "SuggestedPriceETH", "StatusCode",
+                "StatusDomain", "CreatedAtUtc", "ApprovedAtUtc"),
+    "admin.CurationReview": ("ReviewId", "NFTId", "CuratorId", "DecisionCode", "StatusDomain", "Comment",
+                             "StartedAtUtc", "ReviewedAtUtc"),
+    "auction.Auction": ("AuctionId", "SettingsID", "NFTId", "StartAtUtc", "EndAtUtc", "StartingPriceETH",
+                        "CurrentPriceETH", "CurrentLeaderId", "StatusCode", "StatusDomain"),
+    "auction.Bid": ("BidId", "AuctionId", "BidderId", "AmountETH", "PlacedAtUtc"),
+    "finance.FundsReservation": ("ReservationId", "UserId", "AuctionId", "BidId", "AmountETH", "StateCode",
+                                 "StatusDomain", "CreatedAtUtc", "UpdatedAtUtc"),
+    "finance.Ledger": ("EntryId", "UserId", "AuctionId", "EntryType", "AmountETH", "Description",
+                       "CreatedAtUtc"),
+    "audit.EmailOutbox": ("EmailId", "RecipientUserId", "RecipientEmail", "Subject", "Body", "StatusCode",
+                          "StatusDomain", "CreatedAtUtc", "SentAtUtc", "CorrelationKey"),
+}
+# Columnas del DataFrame con otro nombre en el DDL V7 (errata del DDL)
+DDL_COLUMN_RENAMES = {
+    "nft.NFTSettings": {"MinHeightPx": "MinHeigntPx"},
+}
+
+
+def delimited_text_column(col: pd.Series, float_format: str = ".8f") -> List[str]:
+    """
+    Texto de una columna para un archivo delimitado de BULK INSERT: sin comillas
+    ni prefijo N, DECIMAL en punto fijo y DATETIME2(3) 'YYYY-MM-DD HH:MM:SS.mmm'.
+    Los nulos quedan como campo vacío (cargados como NULL con KEEPNULLS).
+    """
+    dtype = col.dtype
+    mask = col.isna().to_numpy()
+
+    if pd.api.types.is_bool_dtype(dtype):
+        text = np.where(col.to_numpy(dtype=bool, na_value=False), "1", "0").tolist()
+    elif pd.api.types.is_integer_dtype(dtype):
+        text = list(map(str, col.to_numpy(dtype=np.int64, na_value=0).tolist()))
+    elif pd.api.types.is_float_dtype(dtype):
+        text = [format(v, float_format) for v in col.to_numpy(dtype=np.float64, na_value=np.nan).tolist()]
+    elif pd.api.types.is_datetime64_dtype(dtype):
+        iso = np.datetime_as_string(col.to_numpy().astype("datetime64[ms]"), unit="ms").tolist()
+        text = [f"{t[:10]} {t[11:]}" for t in iso]
+    else:
+        text = []
+        for v in col.to_numpy(dtype=object).tolist():
+            if v is None or (not isinstance(v, str) and pd.isna(v)):
+                text.append("")
+                continue
+            if isinstance(v, datetime):
+                v = v.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+            v = str(v)
+            if BULK_FIELD_TERMINATOR in v or "\n" in v or "\r" in v:
+                raise ValueError(f"La columna {col.name} contiene tabuladores o saltos de línea: {v!r}")
+            text.append(v)
+        return text
+
+    if mask.any():
+        for i in np.flatnonzero(mask).tolist():
+            text[i] = ""
+    return text
+
+
+def format_delimited_rows(df: pd.DataFrame, float_format: str = ".8f") -> str:
+    """Bloque de filas del archivo de datos (campos con tab, filas con CRLF)."""
+    if df.empty:
+        return ""
+    columns = [delimited_text_column(df.iloc[:, j], float_format) for j in range(df.shape[1])]
+    return "".join(BULK_FIELD_TERMINATOR.join(values) + BULK_ROW_TERMINATOR for values in zip(*columns))
+
+
+def ddl_ordinals(schema_table: str, columns: Sequence[str]) -> List[Tuple[int, str]]:
+    """(ordinal en el DDL, nombre en el DDL) de cada columna del DataFrame."""
+    key = table_key(schema_table)
+    if key not in DDL_COLUMNS:
+        raise ValueError(f"Tabla sin orden de columnas del DDL: {schema_table}")
+    ddl = DDL_COLUMNS[key]
+    renames = DDL_COLUMN_RENAMES.get(key, {})
+    out = []
+    for name in columns:
+        ddl_name = renames.get(name, name)
+        if ddl_name not in ddl:
+            raise ValueError(f"La columna {name} no existe en {key} según el DDL")
+        out.append((ddl.index(ddl_name) + 1, ddl_name))
+    return out
+
+
+def bcp_format_file(schema_table: str, columns: Sequence[str]) -> str:
+    """
+    Archivo de formato no-XML: todos los campos como SQLCHAR delimitados, en el
+    orden del DataFrame, cada uno con el ordinal de su columna en el DDL
+    (DDL_COLUMNS). BULK INSERT usa solo el ordinal; las columnas calculadas o
+    que no vienen en el archivo quedan sin campo.
+    """
+    lines = [BULK_FORMAT_VERSION, str(len(columns))]
+    for i, (ordinal, name) in enumerate(ddl_ordinals(schema_table, columns), start=1):
+        term = '"\\r\\n"' if i == len(columns) else '"\\t"'
+        lines.append(f'{i:<8}SQLCHAR{"":<8}0{"":<7}0{"":<7}{term:<10}{ordinal:<6}{name:<24}""')
+    return "\n".join(lines) + "\n"
+
+
+def bulk_insert_statement(target: str, data_path: str, format_path: str, *,
+                          batch_size: int, keep_identity: bool, check_constraints: bool = True) -> str:
+    """
+    BULK INSERT ... WITH (TABLOCK, CHECK_CONSTRAINTS, KEEPIDENTITY, BATCHSIZE=...)
+    de una tabla. Con `check_constraints` (por defecto) las FKs y CHECK se validan
+    al cargar, como con INSERT, y quedan confiables (is_not_trusted = 0); sin él,
+    BULK INSERT no las valida y las marca como no confiables.
+    """
+    options = [f"FORMATFILE = '{format_path}'", "CODEPAGE = '65001'", "TABLOCK"]
+    if check_constraints:
+        options.append("CHECK_CONSTRAINTS")
+    if keep_identity:
+        options.append("KEEPIDENTITY")
+    options += ["KEEPNULLS", f"BATCHSIZE = {batch_size}"]
+    return (f"BULK INSERT {target}\n"
+            f"FROM '{data_path}'\n"
+            f"WITH ({', '.join(options)});\n")
+
+
+# ===============================
+# Formateo por bloques (en serie o en un pool de procesos)
+# ===============================
+
+def aligned_chunk_rows(chunk_rows: int, rows_per_insert: int, inserts_per_batch: int) -> int:
+    """
+    Redondea `chunk_rows` hacia arriba a un múltiplo de filas por lote GO, para
+    que cada bloque produzca lotes completos y el texto de los bloques se pueda
+    concatenar sin reagrupar filas.
+    """
+    batch_rows = rows_per_insert * inserts_per_batch
+    return max(1, -(-max(1, chunk_rows) // batch_rows)) * batch_rows
+
+
+def format_insert_batches(
+    df: pd.DataFrame,
+    target: str,
+    cols_str: str,
+    *,
+    float_format: Optional[str] = None,
+    datetime_prefix: str = "N",
+    rows_per_insert: int = SQL_MAX_ROWS_PER_INSERT,
+    inserts_per_batch: int = 10,
+    transaction: bool = False,
+    identity: bool = False,
+    hint: Optional[str] = None,
+) -> str:
+    """Texto completo (lotes GO) de un bloque de filas; función de nivel módulo para el pool."""
+    rows = format_value_rows(df, float_format, datetime_prefix)
+    return "".join(iter_insert_batches(
+        target, cols_str, [rows],
+        rows_per_insert=rows_per_insert, inserts_per_batch=inserts_per_batch,
+        transaction=transaction, identity=identity, hint=hint,
+    ))
+
+
+def export_pool(workers: int) -> ContextManager[Optional[ProcessPoolExecutor]]:
+    """Pool de procesos para el formateo si workers > 1; si no, None (en serie)."""
+    if workers > 1:
+        return ProcessPoolExecutor(max_workers=workers)
+    return contextlib.nullcontext(None)
+
+
+def iter_chunk_texts(
+    func: Callable[..., str],
+    df: pd.DataFrame,
+    chunk_rows: int,
+    pool: Optional[ProcessPoolExecutor] = None,
+    window: int = 4,
+    **kwargs: Any,
+) -> Iterator[str]:
+    """
+    func(bloque, **kwargs) para cada bloque de `chunk_rows` filas, en orden.
+    Con `pool`, hasta `window` bloques se formatean a la vez en otros procesos;
+    los resultados se entregan en el orden original (salida idéntica a la serie)
+    y la memoria queda acotada por la ventana.
+    """
+    starts = range(0, len(df), max(1, chunk_rows))
+    if pool is None:
+        for start in starts:
+            yield func(df.iloc[start:start + chunk_rows], **kwargs)
+        return
+
+    in_flight: deque = deque()
+    for start in starts:
+        in_flight.append(pool.submit(func, df.iloc[start:start + chunk_rows], **kwargs))
+        if len(in_flight) >= max(1, window):
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+# ===============================
+# Salida comprimida (gzip / zstd)
+# ===============================
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+# Niveles por defecto: gzip 6 (igual que la herramienta gzip), zstd 3 (el de la librería)
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def compressed_path(path: str, compression: Optional[str]) -> str:
+    """Ruta final del archivo: agrega .gz / .zst según la compresión."""
+    if compression is None:
+        return path
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Compresión no soportada: {compression!r} (use None, 'gzip' o 'zstd')")
+    return path + COMPRESSION_SUFFIXES[compression]
+
+
+def open_binary_output(
+    path: str,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+) -> Tuple[IO[bytes], str]:
+    """
+    Abre un archivo binario para escritura, comprimiendo mientras se escribe si
+    `compression` es 'gzip' o 'zstd' (zstd requiere el paquete zstandard).
+    Retorna (archivo, ruta final con sufijo).
+    """
+    final_path = compressed_path(path, compression)
+    if compression is None:
+        return open(final_path, "wb"), final_path
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.open(final_path, "wb", compresslevel=level), final_path
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError("La compresión zstd requiere zstandard (pip install zstandard)") from e
+    raw = open(final_path, "wb")
+    return zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=True), final_path
+
+
+def open_text_output(
+    path: str,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    newline: Optional[str] = None,
+) -> Tuple[IO[str], str]:
+    """
+    Abre un archivo de texto UTF-8 para escritura, comprimiendo mientras se
+    escribe si `compression` es 'gzip' o 'zstd' (ver open_binary_output).
+    Retorna (archivo, ruta final con sufijo).
+    """
+    if compression is None:
+        final_path = compressed_path(path, compression)
+        return open(final_path, "w", encoding="utf-8", newline=newline), final_path
+    raw, final_path = open_binary_output(path, compression, level)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline=newline, write_through=False), final_path
+
+
+# ===============================
+# Escritura asíncrona (hilo escritor con cola acotada)
+# ===============================
+
+WRITER_QUEUE_DEPTH = 8
+WRITER_BUFFER_BYTES = 1 << 20
+
+
+class AsyncWriter:
+    """
+    Archivo de texto cuya escritura a disco (y compresión) corre en un hilo
+    aparte, para solapar el formateo con la E/S. write() codifica a UTF-8 y
+    junta el texto en bloques de `buffer_bytes`; los bloques pasan al hilo por
+    una cola de `queue_depth` posiciones, así que la memoria en vuelo queda
+    acotada (~queue_depth * buffer_bytes). Un error del hilo se relanza en el
+    siguiente write() o en close().
+    Métricas tras close(): io_seconds (tiempo del hilo en write() del archivo más
+    el cierre, que vacía el compresor) y mb_per_s sobre ese tiempo; wall_seconds
+    y end_to_end_mb_per_s van desde la apertura e incluyen el formateo.
+    """
+
+    def __init__(self, raw: IO[bytes], *, newline: Optional[str] = None,
+                 queue_depth: int = WRITER_QUEUE_DEPTH, buffer_bytes: int = WRITER_BUFFER_BYTES):
+        self._raw = raw
+        # Misma traducción de '\n' que un archivo de texto con ese `newline`
+        line_end = os.linesep if newline is None else (newline or "\n")
+        self._line_end = line_end if line_end != "\n" else None
+        self._buffer_bytes = max(1, buffer_bytes)
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max(1, queue_depth))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self.bytes_written = 0
+        self.io_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="export-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            if self._error is None:  # tras un error se sigue vaciando la cola
+                try:
+                    t0 = time.perf_counter()
+                    self._raw.write(data)
+                    self.io_seconds += time.perf_counter() - t0
+                except BaseException as e:
+                    self._error = e
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _flush_pending(self) -> None:
+        self._check()
+        if self._pending:
+            data = b"".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+            self._queue.put(data)
+            self.bytes_written += len(data)
+
+    def write(self, text: str) -> int:
+        data = (text.replace("\n", self._line_end) if self._line_end else text).encode("utf-8")
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self._buffer_bytes:
+            self._flush_pending()
+        return len(text)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._flush_pending()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            t0 = time.perf_counter()
+            self._raw.close()
+            self.io_seconds += time.perf_counter() - t0
+            self.wall_seconds = time.perf_counter() - self._started
+        self._check()
+
+    @property
+    def mb_per_s(self) -> float:
+        """Rendimiento de E/S del hilo escritor: MB (10^6 bytes, sin comprimir) por segundo de io_seconds."""
+        return self.bytes_written / 1e6 / max(self.io_seconds, 1e-9)
+
+    @property
+    def end_to_end_mb_per_s(self) -> float:
+        """MB por segundo desde la apertura hasta el cierre (incluye el formateo del productor)."""
+        return self.bytes_written / 1e6 / max(self.wall_seconds, 1e-9)
+
+    def __enter__(self) -> "AsyncWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_async_output(
+    path: str,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    newline: Optional[str] = None,
+    queue_depth: int = WRITER_QUEUE_DEPTH,
+) -> Tuple[AsyncWriter, str]:
+    """Como open_text_output, pero la escritura corre en un hilo (ver AsyncWriter)."""
+    raw, final_path = open_binary_output(path, compression, level)
+    return AsyncWriter(raw, newline=newline, queue_depth=queue_depth), final_path
+
+
+# ===============================
+# Archivos por shard (rangos de ID) y niveles de dependencia
+# ===============================
+
+# Tablas referenciadas por clave foránea (según el DDL, incluidos los FK a
+# ops.Status agregados con ALTER TABLE)
+FK_DEPENDENCIES = {
+    "ops.Status": [],
+    "core.Role": [],
+    "core.User": [],
+    "nft.NFTSettings": [],
+    "auction.AuctionSettings": [],
+    "core.UserRole": ["core.User", "core.Role"],
+    "core.UserEmail": ["core.User", "ops.Status"],
+    "core.Wallet": ["core.User"],
+    "nft.NFT": ["core.User", "nft.NFTSettings", "ops.Status"],
+    "admin.CurationReview": ["nft.NFT", "core.User", "ops.Status"],
+    "auction.Auction": ["nft.NFT", "core.User", "auction.AuctionSettings", "ops.Status"],
+    "auction.Bid": ["auction.Auction", "core.User"],
+    "finance.FundsReservation": ["core.User", "auction.Auction", "auction.Bid", "ops.Status"],
+    "finance.Ledger": ["core.User", "auction.Auction"],
+    "audit.EmailOutbox": ["core.User", "ops.Status"],
+}
+
+# Triggers INSTEAD OF INSERT que la carga deshabilita (fuerzan StatusCode='PENDING')
+INSTEAD_OF_INSERT_TRIGGERS = {
+    "nft.NFT": "nft.tr_NFT_InsertFlow",
+}
+
+
+def dependency_levels(tables: Iterable[str]) -> Dict[str, int]:
+    """
+    Nivel de cada tabla en el grafo de FKs: 0 si no referencia a ninguna de
+    `tables`, si no 1 + el máximo nivel de sus referenciadas. Las tablas del
+    mismo nivel no dependen entre sí y se pueden cargar a la vez.
+    """
+    keys = [table_key(t) for t in tables]
+    present = set(keys)
+    levels: Dict[str, int] = {}
+
+    def level(key: str, path: Tuple[str, ...] = ()) -> int:
+        if key in path:
+            raise ValueError(f"Dependencia circular entre tablas: {' -> '.join(path + (key,))}")
+        if key not in levels:
+            deps = [d for d in FK_DEPENDENCIES.get(key, []) if d in present and d != key]
+            levels[key] = 1 + max((level(d, path + (key,)) for d in deps), default=-1)
+        return levels[key]
+
+    for key in keys:
+        level(key)
+    return {key: levels[key] for key in keys}
+
+
+def shard_key_column(schema_table: str, columns: Sequence[str]) -> str:
+    """Columna por la que se parte la tabla: su IDENTITY si viene, si no la primera."""
+    col = IDENTITY_COLUMNS.get(table_key(schema_table))
+    return col if col is not None and col in columns else str(columns[0])
+
+
+def shard_slices(keys: np.ndarray, shards: int) -> List[Tuple[int, int]]:
+    """
+    Cortes [inicio, fin) de `keys` (ordenadas ascendentemente) en hasta `shards`
+    rangos contiguos de tamaño similar. Un mismo valor de clave nunca queda
+    repartido entre dos rangos (p.ej. los roles de un UserId).
+    """
+    n = len(keys)
+    cuts = [0]
+    for k in range(1, max(1, shards)):
+        pos = int(np.searchsorted(keys, keys[n * k // shards], side="left")) if n else 0
+        if cuts[-1] < pos < n:
+            cuts.append(pos)
+    cuts.append(n)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+# ===============================
+# Perfil de carga rápida (índices y triggers fuera durante la carga)
+# ===============================
+
+# Índices no agrupados del DDL V7 por tabla. Los índices de PK y UNIQUE no se
+# tocan: deshabilitar el agrupado bloquea la tabla y los UNIQUE validan datos.
+NONCLUSTERED_INDEXES = {
+    "nft.NFT": ["IX_NFT_ArtistId", "IX_NFT_StatusCode"],
+    "admin.CurationReview": ["IX_CurationReview_NFTId", "IX_CurationReview_CuratorId"],
+    "auction.Auction": ["IX_Auction_NFTId", "IX_Auction_StatusCode"],
+    "auction.Bid": ["IX_Bid_AuctionId", "IX_Bid_BidderId"],
+}
+
+# Triggers del DDL V7 por tabla
+TABLE_TRIGGERS = {
+    "nft.NFT": ["nft.tr_NFT_InsertFlow", "nft.tr_NFT_CreateAuction"],
+    "admin.CurationReview": ["admin.tr_CurationReview_Decision"],
+    "auction.Auction": ["auction.tr_Auction_ProcesarCompletada"],
+    "audit.EmailOutbox": ["audit.tr_EmailOutbox_Failed_Aggregator"],
+}
+
+FAST_LOAD_HINT = "TABLOCK"
+
+
+def fast_load_prologue(tables: Iterable[str]) -> str:
+    """Deshabilita los índices no agrupados y los triggers de `tables` antes de la carga."""
+    lines = ["-- Carga rápida: índices no agrupados y triggers deshabilitados durante la carga\n"]
+    for key in dict.fromkeys(table_key(t) for t in tables):
+        lines += [f"ALTER INDEX {ix} ON {key} DISABLE;\n" for ix in NONCLUSTERED_INDEXES.get(key, [])]
+        lines += [f"DISABLE TRIGGER {tr} ON {key};\n" for tr in TABLE_TRIGGERS.get(key, [])]
+    lines.append("GO\n")
+    return "".join(lines)
+
+
+def fast_load_epilogue(tables: Iterable[str], check_constraints: bool = False) -> str:
+    """
+    Reconstruye los índices deshabilitados y rehabilita los triggers después de
+    la carga. Con `check_constraints` valida además las FKs y CHECK de cada tabla
+    (WITH CHECK CHECK CONSTRAINT ALL), necesario si se cargó con BULK INSERT sin
+    CHECK_CONSTRAINTS: si no, quedan no confiables (is_not_trusted = 1).
+    """
+    lines = ["-- Carga rápida: reconstrucción de índices y triggers rehabilitados\n"]
+    keys = list(dict.fromkeys(table_key(t) for t in tables))
+    for key in keys:
+        for ix in NONCLUSTERED_INDEXES.get(key, []):
+            lines.append(f"PRINT 'Reconstruyendo {ix}...';\nALTER INDEX {ix} ON {key} REBUILD;\nGO\n")
+        lines += [f"ENABLE TRIGGER {tr} ON {key};\n" for tr in TABLE_TRIGGERS.get(key, [])]
+    lines.append("GO\n")
+    if check_constraints:
+        # En orden de carga: las FKs de cada tabla apuntan a tablas ya validadas
+        lines.append("-- Carga rápida: validación de FKs y CHECK (quedan confiables)\n")
+        for key in keys:
+            schema, table = key.split(".", 1)
+            lines.append(f"PRINT 'Validando restricciones de {key}...';\n"
+                         f"ALTER TABLE [{schema}].[{table}] WITH CHECK CHECK CONSTRAINT ALL;\nGO\n")
+    return "".join(lines)
+
+
+def post_load_check_script(expected_rows: Dict[str, int]) -> str:
+    """
+    Script de verificación posterior a la carga: conteo de filas por tabla
+    (`expected_rows`, clave 'schema.Tabla'), valor IDENTITY actual >= ID máximo,
+    y que no queden índices ni triggers deshabilitados ni FKs/CHECK sin
+    validar en esas tablas. Termina con RAISERROR si algo falla.
+    """
+    loaded = ", ".join("(OBJECT_ID(N'[{}].[{}]'))".format(*key.split(".", 1)) for key in expected_rows)
+    objects = "SELECT object_id FROM @loaded"
+    lines = [
+        "-- Verificación posterior a la carga\n",
+        "SET NOCOUNT ON;\n",
+        "DECLARE @errors INT = 0, @n BIGINT;\n",
+        # Índices, triggers y restricciones se revisan solo en las tablas cargadas
+        "DECLARE @loaded TABLE (object_id INT);\n",
+    ]
+    if loaded:
+        lines.append(f"INSERT INTO @loaded (object_id) VALUES {loaded};\n")
+    lines.append("\n")
+    for key, rows in expected_rows.items():
+        schema, table = key.split(".", 1)
+        target = f"[{schema}].[{table}]"
+        lines.append(
+            f"SELECT @n = COUNT_BIG(*) FROM {target};\n"
+            f"IF @n <> {int(rows)} BEGIN SET @errors += 1; "
+            f"PRINT CONCAT(N'ERROR {key}: ', @n, N' filas (esperadas {int(rows)})'); END\n"
+        )
+        id_col = IDENTITY_COLUMNS.get(key)
+        if id_col is not None and rows:
+            lines.append(
+                f"IF IDENT_CURRENT('{target}') < (SELECT MAX([{id_col}]) FROM {target}) "
+                f"BEGIN SET @errors += 1; PRINT N'ERROR {key}: IDENTITY por debajo del {id_col} máximo'; END\n"
+            )
+    lines += [
+        "\n",
+        f"SELECT @n = COUNT(*) FROM sys.indexes WHERE is_disabled = 1 AND object_id IN ({objects});\n",
+        "IF @n > 0 BEGIN SET @errors += 1; PRINT CONCAT(N'ERROR: ', @n, N' índice(s) deshabilitado(s)'); END\n",
+        f"SELECT @n = COUNT(*) FROM sys.triggers WHERE is_disabled = 1 AND parent_id IN ({objects});\n",
+        "IF @n > 0 BEGIN SET @errors += 1; PRINT CONCAT(N'ERROR: ', @n, N' trigger(s) deshabilitado(s)'); END\n",
+        "SELECT @n = (SELECT COUNT(*) FROM sys.foreign_keys\n",
+        f"             WHERE (is_disabled = 1 OR is_not_trusted = 1) AND parent_object_id IN ({objects}))\n",
+        "         + (SELECT COUNT(*) FROM sys.check_constraints\n",
+        f"             WHERE (is_disabled = 1 OR is_not_trusted = 1) AND parent_object_id IN ({objects}));\n",
+        "IF @n > 0 BEGIN SET @errors += 1; PRINT CONCAT(N'ERROR: ', @n, N' restricción(es) sin validar'); END\n",
+        "\n",
+        "IF @errors > 0\n",
+        "    RAISERROR(N'Verificación posterior a la carga: %d error(es).', 16, 1, @errors);\n",
+        "ELSE\n",
+        "    PRINT N'Verificación posterior a la carga: OK';\n",
+        "GO\n",
+    ]
+    return "".join(lines)
@@ -0,0 +1,80 @@
+"""
+Verificación de los archivos de formato de la carga masiva: cada campo de los
+.fmt debe llevar el ordinal de su columna en el DDL V7 (BULK INSERT ubica los
+campos por ordinal, no por nombre). Los ordinales se leen del propio DDL.
+
+Uso: python test_bulk_format.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+import traceback
+
+from datagen import DataGenConfig, DataGenerator
+
+DDL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Fases - Entregables", "Fase 3",
+                        "DDL v7.sql")
+# Columnas de finance.Ledger según el DDL V7 (el caso que motivó la verificación)
+LEDGER_ORDINALS = {"EntryId": 1, "UserId": 2, "AuctionId": 3, "EntryType": 4, "AmountETH": 5, "CreatedAtUtc": 7}
+
+
+def ddl_tables(path):
+    """'esquema.Tabla' -> {columna: ordinal} a partir de los CREATE TABLE del DDL."""
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+    tables = {}
+    for m in re.finditer(r"CREATE TABLE\s+([\w.\[\]]+)\s*\((.*?)\n\);", text, re.S | re.I):
+        columns = []
+        for line in m.group(2).splitlines():
+            line = line.strip()
+            if not line or line.startswith("--") or re.match(r"(CONSTRAINT|PRIMARY|FOREIGN|UNIQUE|CHECK|INDEX)\b",
+                                                             line, re.I):
+                continue
+            columns.append(line.split()[0].strip("[]"))
+        key = m.group(1).replace("[", "").replace("]", "")
+        tables[key] = {name: i for i, name in enumerate(columns, start=1)}
+    return tables
+
+
+def fmt_fields(path):
+    """(ordinal en el servidor, columna) de cada campo de un .fmt, en el orden del archivo."""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()[2:]
+    return [(int(parts[5]), parts[6]) for parts in (line.split() for line in lines)]
+
+
+if __name__ == "__main__":
+    try:
+        if not os.path.exists(DDL_PATH):
+            print(f"- No se encontró el DDL ({DDL_PATH}): se omite la verificación")
+            sys.exit(0)
+        ddl = ddl_tables(DDL_PATH)
+        with tempfile.TemporaryDirectory() as tmp:
+            gen = DataGenerator(DataGenConfig(seed=42, n_users=10, n_nfts=20), verbose=False)
+            gen.run_pipeline(export_bulk_directory=tmp)
+            checked = 0
+            for name in sorted(os.listdir(tmp)):
+                if not name.endswith(".fmt"):
+                    continue
+                table = name[:-len(".fmt")]
+                with open(os.path.join(tmp, f"{table}.dat"), encoding="utf-8") as f:
+                    n_fields = f.readline().count("\t") + 1
+                fields = fmt_fields(os.path.join(tmp, name))
+                if len(fields) != n_fields:
+                    raise AssertionError(f"{table}: {len(fields)} campos en el .fmt, {n_fields} en el .dat")
+                for ordinal, column in fields:
+                    if ddl[table].get(column) != ordinal:
+                        raise AssertionError(f"{table}.{column}: ordinal {ordinal}, en el DDL "
+                                             f"{ddl[table].get(column)}")
+                if table == "finance.Ledger":
+                    got = {column: ordinal for ordinal, column in fields}
+                    if got != LEDGER_ORDINALS:
+                        raise AssertionError(f"finance.Ledger: {got}")
+                checked += 1
+            print(f"✓ Ordinales de {checked} archivos .fmt iguales al DDL V7 (incluye finance.Ledger)")
+    except Exception as e:
+        print(f"\n✗ ERROR: {str(e)}")
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,149 @@
+"""
+Verificación rápida de las garantías del pipeline (tamaños mínimos):
+  1. Salida idéntica byte a byte para cualquier pipeline_workers / export_workers
+     (datagen y datagen_2).
+  2. Reanudar desde checkpoint tras un paso interrumpido da la misma salida.
+  3. Un acierto del caché da lo mismo que generar de cero.
+2 y 3 requieren pyarrow; sin él se omiten.
+
+Uso: python test_determinism.py
+"""
+
+import os
+import sys
+import tempfile
+import traceback
+
+import datagen
+import datagen_2
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# (pipeline_workers, export_workers)
+WORKER_COMBOS = [(1, 1), (4, 1), (1, 3)]
+# Líneas que cambian entre ejecuciones sin cambiar los datos
+VOLATILE_MARKERS = ("-- Generado:", ":setvar DataDir", '"created":')
+
+
+class Interrupted(Exception):
+    pass
+
+
+def small_config(module, **overrides):
+    if module is datagen_2:
+        overrides = {"sql_shards": 2, "sql_shard_min_rows": 5, **overrides}
+    return module.DataGenConfig(seed=42, n_users=10, n_nfts=20, pct_nfts_in_auction=0.60, **overrides)
+
+
+def export_kwargs(module, directory):
+    if module is datagen:
+        return {"export_sql_path": os.path.join(directory, "datos.sql"),
+                "export_bulk_directory": os.path.join(directory, "bulk")}
+    return {"export_sql_directory": os.path.join(directory, "sql")}
+
+
+def read_outputs(directory):
+    """Archivos exportados (ruta relativa -> texto sin las líneas volátiles)."""
+    outputs = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8", newline="") as f:
+                lines = [ln for ln in f.read().splitlines(keepends=True)
+                         if not any(m in ln for m in VOLATILE_MARKERS)]
+            outputs[os.path.relpath(path, directory)] = "".join(lines)
+    return outputs
+
+
+def run(module, directory, config=None, **pipeline_kwargs):
+    os.makedirs(directory, exist_ok=True)
+    gen = module.DataGenerator(config or small_config(module), verbose=False)
+    gen.run_pipeline(**export_kwargs(module, directory), **pipeline_kwargs)
+    return gen
+
+
+def assert_same(expected, actual, label):
+    if expected != actual:
+        differing = sorted(k for k in set(expected) | set(actual) if expected.get(k) != actual.get(k))
+        raise AssertionError(f"{label}: difieren {differing[:5]}")
+    print(f"✓ {label} ({len(actual)} archivos)")
+
+
+# ===============================
+# Verificaciones
+# ===============================
+
+def check_workers(module, base):
+    """Misma salida con cualquier combinación de workers."""
+    reference = None
+    for pipeline_workers, export_workers in WORKER_COMBOS:
+        directory = os.path.join(base, f"w{pipeline_workers}_{export_workers}")
+        run(module, directory, small_config(module, pipeline_workers=pipeline_workers,
+                                            export_workers=export_workers))
+        outputs = read_outputs(directory)
+        if reference is None:
+            reference = outputs
+        else:
+            assert_same(reference, outputs,
+                        f"{module.__name__}: workers ({pipeline_workers}, {export_workers}) = (1, 1)")
+    return reference
+
+
+def check_resume(module, base, reference):
+    """Un paso interrumpido se retoma desde el checkpoint con la misma salida."""
+    checkpoint = os.path.join(base, "checkpoint")
+    original = module.DataGenerator.settle_auctions_and_finance
+
+    def interrupted_settle(self):
+        original(self)
+        raise Interrupted("corte simulado")
+
+    module.DataGenerator.settle_auctions_and_finance = interrupted_settle
+    try:
+        run(module, os.path.join(base, "interrupted"), checkpoint_directory=checkpoint)
+        raise AssertionError(f"{module.__name__}: el corte simulado no ocurrió")
+    except Interrupted:
+        pass
+    finally:
+        module.DataGenerator.settle_auctions_and_finance = original
+
+    directory = os.path.join(base, "resumed")
+    gen = run(module, directory, checkpoint_directory=checkpoint)
+    executed = [s["step"] for s in gen.pipeline_report["steps"]]
+    first_step = module.DataGenerator._PHASE_METHODS[2][0]
+    if first_step in executed or "settle_auctions_and_finance" not in executed:
+        raise AssertionError(f"{module.__name__}: pasos ejecutados al reanudar inesperados {executed}")
+    assert_same(reference, read_outputs(directory), f"{module.__name__}: reanudación tras un corte")
+
+
+def check_cache(module, base, reference):
+    """El segundo run (acierto) exporta lo mismo que la generación de cero."""
+    cache = os.path.join(base, "cache")
+    run(module, os.path.join(base, "miss"), cache_directory=cache)
+    directory = os.path.join(base, "hit")
+    gen = run(module, directory, cache_directory=cache)
+    if gen.pipeline_report["cache"]["frames"] != "hit":
+        raise AssertionError(f"{module.__name__}: se esperaba acierto del caché")
+    assert_same(reference, read_outputs(directory), f"{module.__name__}: acierto del caché")
+
+
+if __name__ == "__main__":
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for module in (datagen, datagen_2):
+                base = os.path.join(tmp, module.__name__)
+                reference = check_workers(module, base)
+                if HAS_PYARROW:
+                    check_resume(module, base, reference)
+                    check_cache(module, base, reference)
+            if not HAS_PYARROW:
+                print("- pyarrow no instalado: se omiten checkpoint y caché")
+        print("\n✓ Verificaciones completadas")
+    except Exception as e:
+        print(f"\n✗ ERROR: {str(e)}")
+        traceback.print_exc()
+        sys.exit(1)
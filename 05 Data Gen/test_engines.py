@@ -0,0 +1,58 @@
+"""
+Verificación de casos límite de los motores vectorizados (datagen_engines).
+
+Uso: python test_engines.py
+"""
+
+import sys
+import traceback
+from datetime import datetime
+
+import numpy as np
+
+from datagen_engines import user_roles_frame
+
+
+class TiedRandom:
+    """
+    Generador que entrega el mismo u en toda la matriz usuarios×roles
+    (random float32), para forzar llaves Gumbel iguales; el resto se delega.
+    """
+
+    def __init__(self, seed):
+        self._rng = np.random.default_rng(seed)
+
+    def random(self, size=None, dtype=np.float64):
+        if dtype == np.float32 and isinstance(size, tuple):
+            return np.full(size, 0.5, dtype=np.float32)
+        return self._rng.random(size, dtype=dtype)
+
+    def __getattr__(self, name):
+        return getattr(self._rng, name)
+
+
+def check_user_roles_ties():
+    """Con llaves empatadas cada usuario recibe exactamente k roles (k=1 si es de un solo rol)."""
+    n_users, role_ids = 1000, [1, 2, 3, 4]
+    user_ids = np.arange(1, n_users + 1, dtype=np.int64)
+    created = np.full(n_users, np.datetime64("2025-01-01T00:00:00", "ms"))
+    for multi_role_prob, roles_range in ((0.0, (1, 3)), (1.0, (2, 3))):
+        df = user_roles_frame(TiedRandom(42), user_ids, created, datetime(2025, 10, 1), role_ids,
+                              [0.25, 0.25, 0.25, 0.25], roles_range, multi_role_prob)
+        per_user = df.groupby("UserId").size().reindex(user_ids, fill_value=0)
+        low, high = (1, 1) if multi_role_prob == 0.0 else roles_range
+        if per_user.min() < low or per_user.max() > high:
+            raise AssertionError(f"roles por usuario fuera de [{low}, {high}]: "
+                                 f"{per_user.min()}..{per_user.max()}")
+        if df.duplicated(["UserId", "RoleId"]).any():
+            raise AssertionError("filas (UserId, RoleId) repetidas")
+    print("✓ user_roles_frame: llaves empatadas respetan el número de roles por usuario")
+
+
+if __name__ == "__main__":
+    try:
+        check_user_roles_ties()
+    except Exception as e:
+        print(f"\n✗ ERROR: {str(e)}")
+        traceback.print_exc()
+        sys.exit(1)